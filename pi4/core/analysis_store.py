@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pi4.core.config import (
+    ANALYSIS_INDEX_INTERVAL_BYTES,
+    ANALYSIS_SEGMENT_MAX_BYTES,
+    ANALYZE_DIR,
+)
+from pi4.core.logger import get_logger
+
+LOGGER = get_logger("analysis_store")
+
+SEGMENT_PREFIX = "analysis-"
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+# Record header: payload length, CRC32 of the payload, wall-clock ns.
+_HEADER = struct.Struct("<IIQ")
+# Sparse index entry: record ts_ns, byte offset of the record in the segment.
+_INDEX_DTYPE = np.dtype([("ts_ns", "<u8"), ("offset", "<u8")])
+_INDEX_ENTRY = struct.Struct("<QQ")
+
+TimeBound = Union[None, float, datetime]
+
+
+@dataclass
+class AnalysisRecord:
+    ts_ns: int
+    payload: dict
+
+    @property
+    def ts(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ns / 1e9, tz=timezone.utc)
+
+
+def encode_payload(payload: dict) -> bytes:
+    return json.dumps(
+        payload, ensure_ascii=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def _to_ns(bound: TimeBound) -> Optional[int]:
+    if bound is None:
+        return None
+    if isinstance(bound, datetime):
+        bound = bound.timestamp()
+    return int(bound * 1e9)
+
+
+def _segment_start_ns(path: Path) -> int:
+    return int(path.name[len(SEGMENT_PREFIX): -len(SEGMENT_SUFFIX)])
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_suffix(INDEX_SUFFIX)
+
+
+def _load_index(segment: Path) -> np.ndarray:
+    path = _index_path(segment)
+    if not path.exists():
+        return np.zeros(0, dtype=_INDEX_DTYPE)
+    raw = path.read_bytes()
+    usable = len(raw) - len(raw) % _INDEX_DTYPE.itemsize
+    return np.frombuffer(raw[:usable], dtype=_INDEX_DTYPE)
+
+
+def _scan_segment(
+    handle: BinaryIO, start_offset: int = 0
+) -> Iterator[Tuple[int, int, bytes]]:
+    """Yield (offset, ts_ns, payload bytes) until EOF or the first torn record."""
+    handle.seek(start_offset)
+    offset = start_offset
+    while True:
+        header = handle.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        length, crc, ts_ns = _HEADER.unpack(header)
+        data = handle.read(length)
+        if len(data) < length or zlib.crc32(data) != crc:
+            LOGGER.warning("Torn analysis record at %s:%d", handle.name, offset)
+            return
+        yield offset, ts_ns, data
+        offset += _HEADER.size + length
+
+
+class AnalysisStore:
+    """Append-only analysis log split into size-rotated segment files.
+
+    Each record is a small binary header followed by compact JSON.  Segments
+    are named after the timestamp of their first record and carry a sparse
+    ``.idx`` of (ts, offset) pairs, so range reads seek close to the start
+    instead of decoding whole segments.  Record timestamps never go
+    backwards, which keeps both the segments and the index sorted.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ANALYZE_DIR,
+        segment_max_bytes: int = ANALYSIS_SEGMENT_MAX_BYTES,
+        index_interval_bytes: int = ANALYSIS_INDEX_INTERVAL_BYTES,
+    ) -> None:
+        self.root = Path(root)
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval_bytes = index_interval_bytes
+        self._lock = threading.Lock()
+        self._segment: Optional[Path] = None
+        self._handle: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._size = 0
+        self._last_indexed = -1
+        self._last_ts_ns = 0
+        self._opened = False
+
+    # -- writes -----------------------------------------------------------
+
+    def append(self, payload: dict, ts_ns: int | None = None, flush: bool = True) -> Path:
+        """Append one record and return the segment it landed in."""
+        data = encode_payload(payload)
+        with self._lock:
+            return self._append_locked(data, ts_ns, flush)
+
+    def append_many(self, records: Iterable[Tuple[Optional[int], dict]]) -> int:
+        """Append (ts_ns, payload) pairs with a single flush at the end."""
+        encoded = [(ts_ns, encode_payload(payload)) for ts_ns, payload in records]
+        with self._lock:
+            for ts_ns, data in encoded:
+                self._append_locked(data, ts_ns, flush=False)
+            self._flush_locked()
+        return len(encoded)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+            self._opened = False
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # -- reads ------------------------------------------------------------
+
+    def segments(self) -> List[Path]:
+        return sorted(self.root.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+    def read(self, start: TimeBound = None, end: TimeBound = None) -> Iterator[AnalysisRecord]:
+        """Records with ``start <= ts <= end`` (epoch seconds or datetimes)."""
+        start_ns = _to_ns(start)
+        end_ns = _to_ns(end)
+        self.flush()
+        segments = self.segments()
+        for position, segment in enumerate(segments):
+            if end_ns is not None and _segment_start_ns(segment) > end_ns:
+                return
+            if start_ns is not None and position + 1 < len(segments):
+                if _segment_start_ns(segments[position + 1]) < start_ns:
+                    continue
+            offset = self._seek_offset(segment, start_ns)
+            with open(segment, "rb") as handle:
+                for _, ts_ns, data in _scan_segment(handle, offset):
+                    if start_ns is not None and ts_ns < start_ns:
+                        continue
+                    if end_ns is not None and ts_ns > end_ns:
+                        return
+                    yield AnalysisRecord(ts_ns, json.loads(data.decode("utf-8")))
+
+    def __iter__(self) -> Iterator[AnalysisRecord]:
+        return self.read()
+
+    # -- internals --------------------------------------------------------
+
+    @staticmethod
+    def _seek_offset(segment: Path, start_ns: Optional[int]) -> int:
+        if start_ns is None:
+            return 0
+        index = _load_index(segment)
+        # Last indexed record strictly before start; equal stamps may precede it.
+        position = int(np.searchsorted(index["ts_ns"], start_ns, side="left")) - 1
+        return int(index["offset"][position]) if position >= 0 else 0
+
+    def _append_locked(self, data: bytes, ts_ns: Optional[int], flush: bool) -> Path:
+        if not self._opened:
+            self._open_tail()
+        ts_ns = max(time.time_ns() if ts_ns is None else ts_ns, self._last_ts_ns)
+        record_size = _HEADER.size + len(data)
+        if self._handle is None or (
+            self._size > 0 and self._size + record_size > self.segment_max_bytes
+        ):
+            self._start_segment(ts_ns)
+        assert self._handle is not None and self._index is not None
+        if self._last_indexed < 0 or self._size - self._last_indexed >= self.index_interval_bytes:
+            self._index.write(_INDEX_ENTRY.pack(ts_ns, self._size))
+            self._last_indexed = self._size
+        self._handle.write(_HEADER.pack(len(data), zlib.crc32(data), ts_ns) + data)
+        self._size += record_size
+        self._last_ts_ns = ts_ns
+        if flush:
+            self._flush_locked()
+        assert self._segment is not None
+        return self._segment
+
+    def _flush_locked(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+        if self._index is not None:
+            self._index.flush()
+
+    def _open_tail(self) -> None:
+        """Resume the newest segment, dropping a torn tail left by a crash."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._opened = True
+        segments = self.segments()
+        if not segments:
+            return
+        segment = segments[-1]
+        end = 0
+        with open(segment, "rb") as handle:
+            for offset, ts_ns, data in _scan_segment(handle):
+                end = offset + _HEADER.size + len(data)
+                self._last_ts_ns = ts_ns
+        if end >= self.segment_max_bytes:
+            return
+        if segment.stat().st_size != end:
+            with open(segment, "r+b") as handle:
+                handle.truncate(end)
+        index = _load_index(segment)
+        index = index[index["offset"] < end]
+        _index_path(segment).write_bytes(index.tobytes())
+        self._segment = segment
+        self._handle = open(segment, "ab")
+        self._index = open(_index_path(segment), "ab")
+        self._size = end
+        self._last_indexed = int(index["offset"][-1]) if len(index) else -1
+
+    def _start_segment(self, ts_ns: int) -> None:
+        self._close_segment()
+        self.root.mkdir(parents=True, exist_ok=True)
+        segment = self.root / f"{SEGMENT_PREFIX}{ts_ns:020d}{SEGMENT_SUFFIX}"
+        self._segment = segment
+        self._handle = open(segment, "ab")
+        self._index = open(_index_path(segment), "ab")
+        self._size = segment.stat().st_size
+        self._last_indexed = -1
+
+    def _close_segment(self) -> None:
+        for handle in (self._handle, self._index):
+            if handle is not None:
+                handle.close()
+        self._handle = None
+        self._index = None
+        self._segment = None
+
+
+def read_legacy_txt(directory: str | Path) -> List[Tuple[int, dict, Path]]:
+    """Parse the old one-JSON-file-per-record ``.txt`` logs, oldest first."""
+    records: List[Tuple[int, dict, Path]] = []
+    for path in Path(directory).glob("*.txt"):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Skipping unreadable analysis file %s: %s", path, exc)
+            continue
+        try:
+            ts_ns = int(datetime.fromisoformat(payload["ts"]).timestamp() * 1e9)
+        except (KeyError, TypeError, ValueError):
+            ts_ns = path.stat().st_mtime_ns
+        records.append((ts_ns, payload, path))
+    records.sort(key=lambda record: record[0])
+    return records
+
+
+def import_legacy_txt(
+    store: AnalysisStore, directory: str | Path, remove: bool = False
+) -> int:
+    """Copy legacy ``.txt`` records into ``store``; optionally delete them after.
+
+    Appends clamp timestamps to the newest record, so if the store already
+    holds records they are merged with the legacy ones into a fresh store,
+    which then replaces the old segments.  Do not run it while the service
+    is writing to the same store.
+    """
+    records = read_legacy_txt(directory)
+    legacy = [(ts_ns, payload) for ts_ns, payload, _ in records]
+    existing = [(record.ts_ns, record.payload) for record in store]
+    if existing:
+        _replace_records(store, sorted(existing + legacy, key=lambda record: record[0]))
+    else:
+        store.append_many(legacy)
+    if remove:
+        for _, _, path in records:
+            path.unlink()
+    return len(records)
+
+
+def _replace_records(store: AnalysisStore, records: List[Tuple[int, dict]]) -> None:
+    """Rewrite ``store`` to hold exactly ``records`` (already in time order)."""
+    staging = Path(tempfile.mkdtemp(prefix=".rebuild-", dir=store.root))
+    fresh_dir = staging / "new"
+    old_dir = staging / "old"
+    old_dir.mkdir()
+    with AnalysisStore(fresh_dir, store.segment_max_bytes, store.index_interval_bytes) as fresh:
+        fresh.append_many(records)
+    store.close()
+    # Park the old files first so a failure never leaves the store half-empty.
+    for directory, target in ((store.root, old_dir), (fresh_dir, store.root)):
+        for segment in sorted(directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            for path in (segment, _index_path(segment)):
+                if path.exists():
+                    os.replace(path, target / path.name)
+    shutil.rmtree(staging)
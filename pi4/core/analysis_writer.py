@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from pi4.core.analysis_store import AnalysisStore
+from pi4.core.bounded_queue import BoundedQueue
+from pi4.core.config import (
+    ANALYSIS_BATCH_SIZE,
+    ANALYSIS_FLUSH_INTERVAL_SEC,
+    ANALYSIS_QUEUE_SIZE,
+)
+from pi4.core.logger import get_logger
+
+LOGGER = get_logger("analysis_writer")
+
+
+class AnalysisWriter:
+    """Moves analysis records off the caller's thread into an ``AnalysisStore``.
+
+    ``submit`` only enqueues.  A writer thread group-commits whatever is
+    queued once ``batch_size`` records are pending or ``flush_interval_sec``
+    has passed since the oldest pending one.  When the queue is full new
+    records are dropped and counted rather than blocking the alert path.
+    """
+
+    def __init__(
+        self,
+        store: AnalysisStore,
+        maxsize: int = ANALYSIS_QUEUE_SIZE,
+        batch_size: int = ANALYSIS_BATCH_SIZE,
+        flush_interval_sec: float = ANALYSIS_FLUSH_INTERVAL_SEC,
+    ) -> None:
+        self.store = store
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval_sec = flush_interval_sec
+        self.written = 0
+        self.failed = 0
+        self._queue = BoundedQueue(maxsize, "drop_newest")
+        self._unfinished = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        return self._queue.dropped
+
+    @property
+    def pending(self) -> int:
+        with self._idle:
+            return self._unfinished
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="AnalysisWriter", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, payload: dict, ts_ns: int | None = None) -> bool:
+        """Queue one record; return False if it was dropped."""
+        if self._thread is None:
+            self.start()
+        with self._idle:
+            self._unfinished += 1
+        if self._queue.put((time.time_ns() if ts_ns is None else ts_ns, payload)):
+            return True
+        self._finish(1)
+        return False
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued record is on disk; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Write out what is queued, then stop the writer thread."""
+        self._queue.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.store.close()
+        if self.dropped:
+            LOGGER.warning("Analysis writer dropped %d records (queue full)", self.dropped)
+
+    def _finish(self, count: int) -> None:
+        with self._idle:
+            self._unfinished -= count
+            self._idle.notify_all()
+
+    def _run(self) -> None:
+        pending: List[Tuple[int, dict]] = []
+        deadline = 0.0
+        while True:
+            if pending:
+                timeout = max(deadline - time.monotonic(), 0.0)
+            else:
+                timeout = self.flush_interval_sec
+            try:
+                items = self._queue.get_batch(self.batch_size - len(pending), timeout)
+            except queue.Empty:
+                items = []
+            if items and not pending:
+                deadline = time.monotonic() + self.flush_interval_sec
+            pending.extend(items)
+            closed = self._queue.closed
+            if pending and (
+                len(pending) >= self.batch_size or time.monotonic() >= deadline or closed
+            ):
+                self._commit(pending)
+                pending = []
+            elif closed and not pending and not len(self._queue):
+                return
+
+    def _commit(self, records: List[Tuple[int, dict]]) -> None:
+        try:
+            self.store.append_many(records)
+            self.written += len(records)
+        except Exception:
+            self.failed += len(records)
+            LOGGER.exception("Failed to write %d analysis records", len(records))
+        finally:
+            self._finish(len(records))
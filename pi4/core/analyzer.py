@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import json
+import atexit
 import re
+import threading
 from datetime import datetime
-from pathlib import Path
 from typing import Any, Iterable, Optional
 
+from pi4.core.analysis_store import AnalysisStore
+from pi4.core.analysis_writer import AnalysisWriter
 from pi4.core.config import ANALYZE_DIR
 
 ANALYZE_DIR.mkdir(parents=True, exist_ok=True)
 
+_WRITER: Optional[AnalysisWriter] = None
+_WRITER_LOCK = threading.Lock()
+
 
 def _sanitize_component(value: str, default: str) -> str:
     cleaned = re.sub(r"[^0-9A-Za-z_.-]+", "_", value)
@@ -17,27 +22,45 @@ def _sanitize_component(value: str, default: str) -> str:
     return cleaned or default
 
 
+def get_store() -> AnalysisStore:
+    """Process-wide analysis store, opened on first use."""
+    return get_writer().store
+
+
+def get_writer() -> AnalysisWriter:
+    """Process-wide background writer; flushed and closed at interpreter exit."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = AnalysisWriter(AnalysisStore(ANALYZE_DIR))
+            atexit.register(_WRITER.close)
+        return _WRITER
+
+
+def flush_analysis(timeout: float | None = None) -> bool:
+    """Block until queued analysis records are written (e.g. before shutdown)."""
+    if _WRITER is None:
+        return True
+    return _WRITER.flush(timeout)
+
+
 def log_analysis(
     photo_name: Optional[str],
     response_payload: Any,
     description: str,
     tags: Iterable[str] | None = None,
-) -> Path:
-    """Persist the latest analysis result as a structured JSON text file."""
-    base = photo_name or "img_unknown"
-    descr_component = _sanitize_component(description, "analysis")[:64]
+) -> bool:
+    """Queue the latest analysis result for the segmented analysis store.
+
+    Returns immediately; False means the record was dropped because the
+    writer queue is full.
+    """
     sanitized_tags: list[str] = []
     if tags:
         for tag in tags:
             cleaned_tag = _sanitize_component(tag, "")
             if cleaned_tag:
                 sanitized_tags.append(cleaned_tag)
-    tag_component = ""
-    if sanitized_tags:
-        tag_component = "_" + "_".join(sanitized_tags)
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"{base}_{descr_component}{tag_component}_{timestamp}.txt"
-    target = ANALYZE_DIR / filename
     payload = {
         "photo": photo_name,
         "description": description,
@@ -45,5 +68,4 @@ def log_analysis(
         "ts": datetime.now().isoformat(),
         "tags": sanitized_tags,
     }
-    target.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return target
+    return get_writer().submit(payload)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from pi4.core.config import (
+    ASYNC_ALERT_QUEUE_SIZE,
+    ASYNC_IO_WORKERS,
+    MAIN_LOOP_DURATION_SEC,
+    MAIN_LOOP_INTERVAL_SEC,
+    USE_CONVERSATION_LAYER,
+)
+from pi4.core.logger import get_logger
+from pi4.core.orchestrator import Orchestrator, VoiceAlert
+from pi4.core.tracing import TRACER
+from pi4.safety.cane_client import tof_receiver
+
+LOGGER = get_logger("async_runtime")
+
+_SEVERITY_RANK = {"critical": 0, "high": 1, "mid": 2, "low": 3}
+
+
+class _SpeechQueue:
+    """Small priority queue for the audio task; evicts the stalest low-priority item."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = max(maxsize, 1)
+        self._heap: list[tuple[int, int, Any]] = []
+        self._seq = 0
+        self._ready = asyncio.Condition()
+        self.dropped = 0
+
+    async def put(self, rank: int, item: Any) -> None:
+        async with self._ready:
+            self._seq += 1
+            heapq.heappush(self._heap, (rank, self._seq, item))
+            if len(self._heap) > self._maxsize:
+                victim = max(self._heap, key=lambda entry: (entry[0], -entry[1]))
+                self._heap.remove(victim)
+                heapq.heapify(self._heap)
+                self.dropped += 1
+            self._ready.notify()
+
+    async def get(self) -> Any:
+        async with self._ready:
+            while not self._heap:
+                await self._ready.wait()
+            return heapq.heappop(self._heap)[2]
+
+
+class AsyncOrchestratorRuntime:
+    """asyncio alternative to `Orchestrator.main_loop`.
+
+    The ToF serial port is awaited for readability instead of being polled,
+    inference runs on a dedicated single-worker executor, Ollama / LINE /
+    analysis I/O runs on a small shared executor (``requests`` has no async
+    client) and speech is played through awaitable TTS subprocesses.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator | None = None,
+        io_workers: int = ASYNC_IO_WORKERS,
+        alert_queue_size: int = ASYNC_ALERT_QUEUE_SIZE,
+        poll_interval: float = MAIN_LOOP_INTERVAL_SEC,
+    ) -> None:
+        self.orchestrator = orchestrator or Orchestrator()
+        self._io_workers = max(io_workers, 1)
+        self._alert_queue_size = alert_queue_size
+        self._poll_interval = poll_interval
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_event: asyncio.Event | None = None
+        self._speech: _SpeechQueue | None = None
+        self._inference_executor: ThreadPoolExecutor | None = None
+        self._io_executor: ThreadPoolExecutor | None = None
+        self._pending: set[asyncio.Future] = set()
+        self._stop_requested = False
+
+    # -- lifecycle --------------------------------------------------------
+
+    def run_blocking(self, duration_sec: float | None = None) -> None:
+        """Run the runtime on a fresh event loop until stopped or timed out."""
+        asyncio.run(self.run(duration_sec))
+
+    def stop(self) -> None:
+        """Request shutdown; safe to call from any thread."""
+        self._stop_requested = True
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(stop_event.set)
+
+    async def run(self, duration_sec: float | None = None) -> None:
+        duration = duration_sec if duration_sec is not None else MAIN_LOOP_DURATION_SEC
+        self._loop = asyncio.get_event_loop()
+        self._stop_event = asyncio.Event()
+        if self._stop_requested:
+            self._stop_event.set()
+        self._speech = _SpeechQueue(self._alert_queue_size)
+        self._inference_executor = ThreadPoolExecutor(1, thread_name_prefix="inference")
+        self._io_executor = ThreadPoolExecutor(self._io_workers, thread_name_prefix="async-io")
+        LOGGER.info("Async orchestrator runtime start")
+        tasks = [
+            self._loop.create_task(self._sensing_loop()),
+            self._loop.create_task(self._audio_loop()),
+        ]
+        try:
+            if math.isinf(duration):
+                await self._stop_event.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in list(tasks) + list(self._pending):
+                task.cancel()
+            await asyncio.gather(*tasks, *self._pending, return_exceptions=True)
+            self._pending.clear()
+            self._inference_executor.shutdown(wait=False)
+            self._io_executor.shutdown(wait=False)
+            LOGGER.info("Async orchestrator runtime end")
+
+    # -- helpers ----------------------------------------------------------
+
+    async def _in_executor(
+        self, executor: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any
+    ) -> Any:
+        # run_in_executor does not propagate contextvars; keep the trace id.
+        ctx = contextvars.copy_context()
+        return await self._loop.run_in_executor(executor, functools.partial(ctx.run, fn, *args))
+
+    def _spawn(self, coro) -> None:
+        task = self._loop.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _wait_readable(self, fd: int) -> bool:
+        ready = self._loop.create_future()
+
+        def _on_ready() -> None:
+            if not ready.done():
+                ready.set_result(True)
+
+        try:
+            self._loop.add_reader(fd, _on_ready)
+        except (NotImplementedError, ValueError, OSError):
+            # e.g. the Windows proactor loop cannot watch serial handles
+            return False
+        try:
+            await ready
+        finally:
+            self._loop.remove_reader(fd)
+        return True
+
+    async def _next_trigger(self) -> float:
+        """Wait until the ToF receiver yields a trigger distance."""
+        while True:
+            distance = self.orchestrator._read_trigger()
+            if distance is not None:
+                return distance
+            fd = tof_receiver.serial_fileno()
+            if fd is None or not await self._wait_readable(fd):
+                await asyncio.sleep(self._poll_interval)
+
+    # -- tasks ------------------------------------------------------------
+
+    async def _sensing_loop(self) -> None:
+        orch = self.orchestrator
+        while True:
+            try:
+                distance = await self._next_trigger()
+                captured = await self._in_executor(
+                    self._inference_executor, orch._capture_frame, distance
+                )
+                if captured is None:
+                    continue
+                events = await self._in_executor(
+                    self._inference_executor, orch._detect_events, distance, captured
+                )
+                for event in events:
+                    if event.severity in ("mid", "high", "critical"):
+                        self._spawn(self._compose_alert(event))
+                self._spawn(self._in_executor(self._io_executor, orch._summarize_danger_events))
+                if USE_CONVERSATION_LAYER:
+                    self._spawn(self._converse())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                LOGGER.exception("Async sensing cycle failed")
+                await asyncio.sleep(self._poll_interval)
+
+    async def _compose_alert(self, event) -> None:
+        alert = await self._in_executor(
+            self._io_executor, self.orchestrator._compose_alert, event
+        )
+        if alert is not None:
+            await self._speech.put(_SEVERITY_RANK.get(event.severity, 3), alert)
+
+    async def _converse(self) -> None:
+        reply = await self._in_executor(self._io_executor, self.orchestrator._conversation_reply)
+        await self._speech.put(_SEVERITY_RANK["low"], reply)
+
+    async def _audio_loop(self) -> None:
+        orch = self.orchestrator
+        while True:
+            item = await self._speech.get()
+            try:
+                if not isinstance(item, VoiceAlert):
+                    await orch.voice.speak_async(item, priority="mid")
+                    continue
+                with TRACER.activate(item.trace_id):
+                    await orch.voice.speak_async(
+                        item.rewritten, priority="high", source=item.source_tag
+                    )
+                self._spawn(self._in_executor(self._io_executor, orch._log_alert, item))
+                if orch._should_notify_caregiver(item.event):
+                    self._spawn(
+                        self._in_executor(
+                            self._io_executor,
+                            orch._send_caregiver_alert,
+                            item.event,
+                            item.voice_text,
+                        )
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                LOGGER.exception("Async audio output failed")
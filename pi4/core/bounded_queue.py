@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest", "drop_lowest"]
+
+VALID_POLICIES = {"block", "drop_oldest", "drop_newest", "drop_lowest"}
+
+
+class BoundedQueue:
+    """Thread-safe FIFO with a fixed capacity and an overflow policy.
+
+    ``drop_oldest`` evicts the head to make room (latest data wins),
+    ``drop_newest`` rejects the incoming item and ``block`` waits for space.
+    ``drop_lowest`` discards the item with the lowest ``priority(item)``,
+    the oldest one among equals; an incoming item that ranks below
+    everything queued is the one dropped.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: OverflowPolicy = "drop_oldest",
+        priority: Optional[Callable[[Any], int]] = None,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if policy not in VALID_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {policy}")
+        if policy == "drop_lowest" and priority is None:
+            raise ValueError("drop_lowest needs a priority function")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._priority = priority
+        self._items: Deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any, timeout: float | None = None) -> bool:
+        """Enqueue item; return False if it (or nothing) was dropped instead."""
+        with self._lock:
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == "drop_newest":
+                    self.dropped += 1
+                    return False
+                if self.policy == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == "drop_lowest":
+                    ranks = [self._priority(queued) for queued in self._items]
+                    lowest = min(range(len(ranks)), key=ranks.__getitem__)
+                    self.dropped += 1
+                    if self._priority(item) < ranks[lowest]:
+                        return False
+                    del self._items[lowest]
+                else:
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            self.dropped += 1
+                            return False
+                        self._not_full.wait(remaining)
+                    if self._closed:
+                        return False
+            self._items.append(item)
+            self._not_empty.notify()
+            return True
+
+    def get(self, timeout: float | None = None) -> Any:
+        """Dequeue the oldest item; raise ``queue.Empty`` on timeout or close."""
+        with self._lock:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items:
+                if self._closed:
+                    raise queue.Empty
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def get_batch(self, max_items: int, timeout: float | None = None) -> List[Any]:
+        """Wait like ``get`` for one item, then take up to ``max_items`` without waiting."""
+        first = self.get(timeout)
+        with self._lock:
+            items = [first]
+            while self._items and len(items) < max_items:
+                items.append(self._items.popleft())
+            self._not_full.notify_all()
+            return items
+
+    def close(self) -> None:
+        """Wake up all waiters; further puts are rejected."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._not_full.notify_all()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
@@ -27,7 +27,15 @@ USE_SIMULATED_SENSORS: bool = False
 # Pi usually uses 0, Windows uses 1 (if 0 is webcam)
 CAMERA_DEVICE_INDEX: int = 0 if PLATFORM == "pi4" else 1
 SIM_VIDEO_PATH: str = os.getenv("SMART_CANE_SIM_VIDEO", "./data/demo_video.mp4")
+# "realtime" behaves like a live camera (newest frame at video FPS); "fast" yields every frame ASAP
+SIM_VIDEO_PACING: str = os.getenv("SMART_CANE_SIM_PACING", "realtime")
+SIM_VIDEO_LOOP: bool = os.getenv("SMART_CANE_SIM_LOOP", "true").lower() in ("1", "true", "yes")
+SIM_PREFETCH_FRAMES: int = int(os.getenv("SMART_CANE_SIM_PREFETCH", "8"))
 FRAME_BLACK_THRESHOLD: float = float(os.getenv("SMART_CANE_FRAME_BLACK_THRESHOLD", "5.0"))
+# background grabber keeps the newest frame ready instead of reading on trigger
+CAMERA_GRABBER_ENABLED: bool = os.getenv("SMART_CANE_CAMERA_GRABBER", "true").lower() in ("1", "true", "yes")
+CAMERA_RING_SLOTS: int = int(os.getenv("SMART_CANE_CAMERA_RING_SLOTS", "6"))
+CAMERA_MAX_FRAME_AGE_SEC: float = float(os.getenv("SMART_CANE_CAMERA_MAX_FRAME_AGE", "0.5"))
 
 # ToF / UART
 # Auto-switch port based on platform
@@ -39,6 +47,12 @@ else:
     TOF_SERIAL_PORT: str = "COM3"
 
 TOF_BAUDRATE: int = 115200
+# background serial reader: records kept in memory and reconnect backoff bounds
+TOF_RING_SIZE: int = int(os.getenv("SMART_CANE_TOF_RING_SIZE", "2048"))
+TOF_RECONNECT_MIN_SEC: float = float(os.getenv("SMART_CANE_TOF_RECONNECT_MIN", "0.5"))
+TOF_RECONNECT_MAX_SEC: float = float(os.getenv("SMART_CANE_TOF_RECONNECT_MAX", "10.0"))
+# wire format requested from the Pico at connect: "binary" (falls back to JSON on old firmware) or "json"
+TOF_PROTOCOL: str = os.getenv("SMART_CANE_TOF_PROTOCOL", "binary")
 
 SIM_TOF_DATA_PATH: str = os.getenv("SMART_CANE_SIM_TOF", "./data/tof_simulated.json")
 SIM_TOF_INTERVAL_SEC: float = float(os.getenv("SMART_CANE_SIM_TOF_INTERVAL", "0.1"))
@@ -51,13 +65,33 @@ PERSON_ACTUAL_HEIGHT_M: float = float(os.getenv("SMART_CANE_PERSON_HEIGHT", "1.6
 CAR_ACTUAL_HEIGHT_M: float = float(os.getenv("SMART_CANE_CAR_HEIGHT", "1.5"))
 DISTANCE_VOICE_BIAS_M: float = float(os.getenv("SMART_CANE_DISTANCE_VOICE_BIAS", "0.0"))
 CAR_APPROACHING_SPEED_THRESHOLD: float = float(os.getenv("SMART_CANE_CAR_SPEED", "1.0"))
+# cross-frame tracking (IoU association + constant-velocity Kalman filter)
+TRACKER_IOU_THRESHOLD: float = float(os.getenv("SMART_CANE_TRACKER_IOU", "0.3"))
+TRACKER_MAX_AGE_SEC: float = float(os.getenv("SMART_CANE_TRACKER_MAX_AGE", "1.0"))
+TRACKER_MIN_HITS: int = int(os.getenv("SMART_CANE_TRACKER_MIN_HITS", "3"))
+# skip the detector while the downsampled grayscale scene is unchanged (threshold 0 turns it off)
+MOTION_GATE_ENABLED: bool = os.getenv("SMART_CANE_MOTION_GATE", "true").lower() in ("1", "true", "yes")
+MOTION_GATE_THRESHOLD: float = float(os.getenv("SMART_CANE_MOTION_GATE_THRESHOLD", "6.0"))
+MOTION_GATE_TTL_SEC: float = float(os.getenv("SMART_CANE_MOTION_GATE_TTL", "1.0"))
 DROP_MIN_DISTANCE_M: float = float(os.getenv("SMART_CANE_DROP_MIN", "0.05"))
 DROP_MAX_DISTANCE_M: float = float(os.getenv("SMART_CANE_DROP_MAX", "0.40"))
 STEP_MIN_HEIGHT_M: float = float(os.getenv("SMART_CANE_STEP_MIN", "0.10"))
 STEP_DOWN_MIN_HEIGHT_M: float = float(os.getenv("SMART_CANE_STEP_DOWN", "0.20"))
 MAIN_LOOP_DURATION_SEC: float = float(os.getenv("SMART_CANE_MAIN_LOOP_DURATION", "60"))
+# danger events summarised together: those within this window of the newest one
 DANGER_EVENT_WINDOW_SEC: float = float(os.getenv("SMART_CANE_DANGER_WINDOW", "2.0"))
+# Bounded camera / cane event history kept by the orchestrator
+EVENT_HISTORY_CAPACITY: int = int(os.getenv("SMART_CANE_EVENT_HISTORY_CAPACITY", "256"))
+EVENT_HISTORY_MAX_AGE_SEC: float = float(os.getenv("SMART_CANE_EVENT_HISTORY_MAX_AGE", "300"))
 MAIN_LOOP_INTERVAL_SEC: float = float(os.getenv("SMART_CANE_MAIN_LOOP_INTERVAL", "0.02"))
+# Pipelined safety loop: sensing / capture / inference / compose / audio run as
+# separate stages so a new trigger is handled while the previous alert plays.
+SAFETY_PIPELINE_ENABLED: bool = os.getenv("SMART_CANE_PIPELINE", "false").lower() in ("1", "true", "yes")
+SAFETY_PIPELINE_QUEUE_SIZE: int = int(os.getenv("SMART_CANE_PIPELINE_QUEUE_SIZE", "2"))
+# asyncio runtime: serial readiness, HTTP, TTS and inference awaited on one loop
+ASYNC_RUNTIME_ENABLED: bool = os.getenv("SMART_CANE_ASYNC_RUNTIME", "false").lower() in ("1", "true", "yes")
+ASYNC_IO_WORKERS: int = int(os.getenv("SMART_CANE_ASYNC_IO_WORKERS", "2"))
+ASYNC_ALERT_QUEUE_SIZE: int = int(os.getenv("SMART_CANE_ASYNC_ALERT_QUEUE", "4"))
 
 # Trigger Logic
 TRIGGER_DISTANCE_MM: int = int(os.getenv("SMART_CANE_TRIGGER_DISTANCE", "2500"))
@@ -85,6 +119,16 @@ OPENVINO_MODEL_BIN: str | None = "models/person-detection-retail-0013.bin"
 OPENVINO_DEVICE: str = "CPU"
 OPENVINO_CONFIDENCE: float = 0.5
 OPENVINO_LABELS: dict[int, str] = {0: "background", 1: "person", 2: "car", 3: "bike"}
+# per-class overrides of OPENVINO_CONFIDENCE, e.g. {2: 0.4} to report cars earlier
+OPENVINO_CLASS_CONFIDENCE: dict[int, float] = {}
+# IoU above which overlapping same-class boxes are merged (unset = no NMS)
+OPENVINO_NMS_IOU: float | None = (
+    float(os.environ["SMART_CANE_OPENVINO_NMS_IOU"]) if os.getenv("SMART_CANE_OPENVINO_NMS_IOU") else None
+)
+# "graph": resize + NHWC u8 -> NCHW layout compiled into the model; "python": cv2 + NumPy
+OPENVINO_PREPROCESS: str = os.getenv("SMART_CANE_OPENVINO_PREPROCESS", "python")
+# in-flight requests for detect_objects_async (AsyncInferQueue jobs)
+OPENVINO_ASYNC_JOBS: int = int(os.getenv("SMART_CANE_OPENVINO_ASYNC_JOBS", "2"))
 PYTTXS3_RATE: int = int(os.getenv("SMART_CANE_TTS_RATE", "150"))
 PYTTXS3_VOLUME: float = float(os.getenv("SMART_CANE_TTS_VOLUME", "1.0"))
 
@@ -111,6 +155,25 @@ LINE_MESSAGING_API_URL: str = os.getenv("SMART_CANE_LINE_MESSAGING_API_URL", "ht
 LOG_LEVEL: str = os.getenv("SMART_CANE_LOG_LEVEL", "INFO")
 LOG_DIR: Path = Path(os.getenv("SMART_CANE_LOG_DIR", "./logs"))
 LOG_FILE_NAME: str = os.getenv("SMART_CANE_LOG_FILE", "smart_cane.log")
+# size rotation by default; set SMART_CANE_LOG_ROTATE_WHEN (e.g. "midnight") for time rotation
+LOG_MAX_BYTES: int = int(os.getenv("SMART_CANE_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT: int = int(os.getenv("SMART_CANE_LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN: str | None = os.getenv("SMART_CANE_LOG_ROTATE_WHEN") or None
+# records waiting for the listener thread; beyond this they are dropped, not blocked on
+LOG_QUEUE_SIZE: int = int(os.getenv("SMART_CANE_LOG_QUEUE_SIZE", "2000"))
+# per call site: at most LOG_RATE_LIMIT_BURST INFO/DEBUG records every LOG_RATE_LIMIT_INTERVAL_SEC (0 = off);
+# WARNING and above always pass, suppressed counts are logged once per interval
+LOG_RATE_LIMIT_INTERVAL_SEC: float = float(os.getenv("SMART_CANE_LOG_RATE_INTERVAL", "10"))
+LOG_RATE_LIMIT_BURST: int = int(os.getenv("SMART_CANE_LOG_RATE_BURST", "5"))
+
+# EventBus delivery: "sync" (publisher thread), "thread" or "async" queues
+EVENT_BUS_DEFAULT_MODE: str = os.getenv("SMART_CANE_EVENT_BUS_MODE", "sync")
+EVENT_BUS_QUEUE_SIZE: int = int(os.getenv("SMART_CANE_EVENT_BUS_QUEUE_SIZE", "64"))
+
+# latency tracing (one trace per ToF trigger)
+TRACE_ENABLED: bool = os.getenv("SMART_CANE_TRACE", "true").lower() in ("1", "true", "yes")
+TRACE_BUFFER_SIZE: int = int(os.getenv("SMART_CANE_TRACE_BUFFER", "4096"))
+TRACE_JSONL_PATH: str | None = os.getenv("SMART_CANE_TRACE_JSONL") or None
 
 # bundle
 BUNDLE_DEFAULT_OUTPUT: str = os.getenv("SMART_CANE_BUNDLE_OUTPUT", "smart_cane_bundle.txt")
@@ -119,3 +182,47 @@ BUNDLE_IGNORE_DIRS: list[str] = [".git", "__pycache__", ".venv", "logs", "tmp"]
 DATA_DIR: Path = Path(os.getenv("SMART_CANE_DATA_DIR", "./data"))
 IMG_DIR: Path = DATA_DIR / "img"
 ANALYZE_DIR: Path = DATA_DIR / "analyze"
+# compiled detector blobs, one subdirectory per model hash / device / OpenVINO version ("" = off)
+_ov_cache_dir = os.getenv("SMART_CANE_OPENVINO_CACHE_DIR", str(DATA_DIR / "ov_cache"))
+OPENVINO_CACHE_DIR: Path | None = Path(_ov_cache_dir) if _ov_cache_dir else None
+OPENVINO_WARMUP_RUNS: int = int(os.getenv("SMART_CANE_OPENVINO_WARMUP_RUNS", "2"))
+
+# analysis log: append-only segments in ANALYZE_DIR instead of one file per record
+ANALYSIS_SEGMENT_MAX_BYTES: int = int(
+    os.getenv("SMART_CANE_ANALYSIS_SEGMENT_BYTES", str(4 * 1024 * 1024))
+)
+ANALYSIS_INDEX_INTERVAL_BYTES: int = int(
+    os.getenv("SMART_CANE_ANALYSIS_INDEX_BYTES", str(64 * 1024))
+)
+# background analysis writer: queue bound and group-commit size / interval
+ANALYSIS_QUEUE_SIZE: int = int(os.getenv("SMART_CANE_ANALYSIS_QUEUE_SIZE", "256"))
+ANALYSIS_BATCH_SIZE: int = int(os.getenv("SMART_CANE_ANALYSIS_BATCH_SIZE", "32"))
+ANALYSIS_FLUSH_INTERVAL_SEC: float = float(
+    os.getenv("SMART_CANE_ANALYSIS_FLUSH_SEC", "1.0")
+)
+
+# frame persistence: "always", "every_n", "severity" (frames behind events >= min severity) or "never"
+FRAME_SAVE_POLICY: str = os.getenv("SMART_CANE_FRAME_SAVE_POLICY", "always")
+FRAME_SAVE_EVERY_N: int = int(os.getenv("SMART_CANE_FRAME_SAVE_EVERY_N", "10"))
+FRAME_SAVE_MIN_SEVERITY: str = os.getenv("SMART_CANE_FRAME_SAVE_MIN_SEVERITY", "mid")
+FRAME_SAVE_QUEUE_SIZE: int = int(os.getenv("SMART_CANE_FRAME_SAVE_QUEUE_SIZE", "8"))
+FRAME_JPEG_QUALITY: int = int(os.getenv("SMART_CANE_FRAME_JPEG_QUALITY", "90"))
+# retention for IMG_DIR: oldest frames are pruned past either cap (0 disables a cap)
+FRAME_RETENTION_MAX_BYTES: int = int(
+    os.getenv("SMART_CANE_FRAME_RETENTION_BYTES", str(512 * 1024 * 1024))
+)
+FRAME_RETENTION_MAX_AGE_SEC: float = float(
+    os.getenv("SMART_CANE_FRAME_RETENTION_AGE_SEC", str(7 * 24 * 3600))
+)
+
+# pre-trigger ring: recent downscaled frames kept in memory, written as a clip on a severe event
+INCIDENT_RING_ENABLED: bool = os.getenv("SMART_CANE_INCIDENT_RING", "true").lower() in ("1", "true", "yes")
+INCIDENT_RING_FRAMES: int = int(os.getenv("SMART_CANE_INCIDENT_RING_FRAMES", "50"))
+INCIDENT_WINDOW_SEC: float = float(os.getenv("SMART_CANE_INCIDENT_WINDOW_SEC", "5.0"))
+INCIDENT_THUMB_WIDTH: int = int(os.getenv("SMART_CANE_INCIDENT_THUMB_WIDTH", "320"))
+INCIDENT_MIN_SEVERITY: str = os.getenv("SMART_CANE_INCIDENT_MIN_SEVERITY", "critical")
+INCIDENT_COOLDOWN_SEC: float = float(os.getenv("SMART_CANE_INCIDENT_COOLDOWN_SEC", "10.0"))
+INCIDENT_DIR: Path = DATA_DIR / "incidents"
+INCIDENT_RETENTION_MAX_BYTES: int = int(
+    os.getenv("SMART_CANE_INCIDENT_RETENTION_BYTES", str(256 * 1024 * 1024))
+)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pi4.core.event_schema import Event
+
+SEVERITY_LEVELS = ("low", "mid", "high", "critical")
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITY_LEVELS)}
+
+# Code used for missing strings (direction / label) in the code columns.
+MISSING = -1
+
+
+class StringTable:
+    """Interns strings to small integer codes."""
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self._codes: Dict[str, int] = {}
+        self._values: List[str] = []
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._values)
+            self._codes[value] = code
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int:
+        """Code of ``value`` without interning it (``MISSING`` if unknown)."""
+        return self._codes.get(value, MISSING)
+
+    def value(self, code: int) -> Optional[str]:
+        return None if code < 0 else self._values[code]
+
+    def copy(self) -> "StringTable":
+        return StringTable(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class EventBatch:
+    """Column-oriented view over many events for vectorized filtering.
+
+    Timestamps (epoch seconds), distances, severities and the interned
+    type / source / direction / label codes live in NumPy arrays; ids and
+    ``extra`` dicts stay as Python lists.  Missing distances are NaN and
+    missing strings use the ``MISSING`` code.
+    """
+
+    def __init__(
+        self,
+        strings: StringTable,
+        event_ids: List[str],
+        ts: np.ndarray,
+        distance_m: np.ndarray,
+        severity: np.ndarray,
+        type_code: np.ndarray,
+        source_code: np.ndarray,
+        direction_code: np.ndarray,
+        label_code: np.ndarray,
+        extras: List[Optional[dict]],
+    ) -> None:
+        self.strings = strings
+        self.event_ids = event_ids
+        self.ts = ts
+        self.distance_m = distance_m
+        self.severity = severity
+        self.type_code = type_code
+        self.source_code = source_code
+        self.direction_code = direction_code
+        self.label_code = label_code
+        self.extras = extras
+
+    # -- conversion -------------------------------------------------------
+
+    @classmethod
+    def empty(cls, strings: StringTable | None = None) -> "EventBatch":
+        return cls.from_events([], strings)
+
+    @classmethod
+    def from_events(
+        cls, events: Iterable[Event], strings: StringTable | None = None
+    ) -> "EventBatch":
+        strings = strings if strings is not None else StringTable()
+        intern = strings.intern
+        event_ids: List[str] = []
+        ts: List[float] = []
+        distances: List[float] = []
+        severity: List[int] = []
+        types: List[int] = []
+        sources: List[int] = []
+        directions: List[int] = []
+        labels: List[int] = []
+        extras: List[Optional[dict]] = []
+        nan = float("nan")
+        for event in events:
+            event_ids.append(event.event_id)
+            ts.append(event.timestamp())
+            distances.append(nan if event.distance_m is None else event.distance_m)
+            severity.append(SEVERITY_CODES[event.severity])
+            types.append(intern(event.type))
+            sources.append(intern(event.source))
+            directions.append(intern(event.direction))
+            labels.append(intern(event.object_label))
+            extras.append(event._extra)
+        return cls(
+            strings,
+            event_ids,
+            np.asarray(ts, dtype=np.float64),
+            np.asarray(distances, dtype=np.float64),
+            np.asarray(severity, dtype=np.int8),
+            np.asarray(types, dtype=np.int32),
+            np.asarray(sources, dtype=np.int32),
+            np.asarray(directions, dtype=np.int32),
+            np.asarray(labels, dtype=np.int32),
+            extras,
+        )
+
+    def to_events(self) -> List[Event]:
+        value = self.strings.value
+        events: List[Event] = []
+        for index in range(len(self)):
+            distance = float(self.distance_m[index])
+            extra = self.extras[index]
+            events.append(
+                Event(
+                    event_id=self.event_ids[index],
+                    ts=datetime.fromtimestamp(float(self.ts[index]), tz=timezone.utc),
+                    type=value(int(self.type_code[index])),
+                    source=value(int(self.source_code[index])),
+                    severity=SEVERITY_LEVELS[int(self.severity[index])],
+                    distance_m=None if np.isnan(distance) else distance,
+                    direction=value(int(self.direction_code[index])),
+                    object_label=value(int(self.label_code[index])),
+                    extra=dict(extra) if extra else None,
+                )
+            )
+        return events
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self.to_events())
+
+    # -- selection --------------------------------------------------------
+
+    def mask(
+        self,
+        min_severity: str | None = None,
+        max_distance_m: float | None = None,
+        within_sec: float | None = None,
+        now: float | None = None,
+        types: Sequence[str] | None = None,
+        source: str | None = None,
+    ) -> np.ndarray:
+        """Boolean mask for the given criteria (all of them must hold)."""
+        keep = np.ones(len(self), dtype=bool)
+        if min_severity is not None:
+            keep &= self.severity >= SEVERITY_CODES[min_severity]
+        if max_distance_m is not None:
+            # NaN (unknown distance) compares False and is excluded.
+            keep &= self.distance_m <= max_distance_m
+        if within_sec is not None:
+            now = time.time() if now is None else now
+            keep &= self.ts >= now - within_sec
+        if types is not None:
+            codes = [self.strings.lookup(name) for name in types]
+            keep &= np.isin(self.type_code, [code for code in codes if code != MISSING])
+        if source is not None:
+            keep &= self.source_code == self.strings.lookup(source)
+        return keep
+
+    def filter(self, **criteria) -> "EventBatch":
+        """Events matching ``mask(**criteria)``, e.g. high+ within 2 m in the last 5 s."""
+        return self.take(np.flatnonzero(self.mask(**criteria)))
+
+    def take(self, indices: Sequence[int] | np.ndarray) -> "EventBatch":
+        indices = np.asarray(indices, dtype=np.intp)
+        return EventBatch(
+            self.strings,
+            [self.event_ids[index] for index in indices],
+            self.ts[indices],
+            self.distance_m[indices],
+            self.severity[indices],
+            self.type_code[indices],
+            self.source_code[indices],
+            self.direction_code[indices],
+            self.label_code[indices],
+            [self.extras[index] for index in indices],
+        )
+
+    def sort_by(self, column: str = "ts", descending: bool = False) -> "EventBatch":
+        """Stable sort on ``ts``, ``distance_m`` or ``severity``."""
+        values = getattr(self, column)
+        order = np.argsort(-values if descending else values, kind="stable")
+        return self.take(order)
+
+    def most_urgent(self, count: int = 1) -> "EventBatch":
+        """Highest severity first, nearest first within a severity."""
+        distance = np.where(np.isnan(self.distance_m), np.inf, self.distance_m)
+        order = np.lexsort((distance, -self.severity.astype(np.int16)))
+        return self.take(order[:count])
+
+    # -- aggregation ------------------------------------------------------
+
+    def count_by(self, *columns: str) -> List[Tuple[tuple, int]]:
+        """Counts per distinct combination of code columns, most frequent first.
+
+        ``columns`` are ``type``, ``source``, ``direction``, ``label`` or
+        ``severity``; keys are returned decoded, in first-seen order for ties.
+        """
+        if not len(self):
+            return []
+        codes = np.stack([self._column_codes(column) for column in columns], axis=1)
+        unique, first, counts = np.unique(
+            codes, axis=0, return_index=True, return_counts=True
+        )
+        order = np.lexsort((first, -counts))
+        return [
+            (
+                tuple(
+                    self._decode(column, int(code))
+                    for column, code in zip(columns, unique[row])
+                ),
+                int(counts[row]),
+            )
+            for row in order
+        ]
+
+    def min_distance(self) -> Optional[float]:
+        if not len(self) or np.isnan(self.distance_m).all():
+            return None
+        return float(np.nanmin(self.distance_m))
+
+    def max_severity(self) -> Optional[str]:
+        if not len(self):
+            return None
+        return SEVERITY_LEVELS[int(self.severity.max())]
+
+    def time_span(self) -> float:
+        if not len(self):
+            return 0.0
+        return float(self.ts.max() - self.ts.min())
+
+    def _column_codes(self, column: str) -> np.ndarray:
+        if column == "severity":
+            return self.severity.astype(np.int32)
+        return getattr(self, f"{column}_code")
+
+    def _decode(self, column: str, code: int) -> Optional[str]:
+        if column == "severity":
+            return SEVERITY_LEVELS[code]
+        return self.strings.value(code)
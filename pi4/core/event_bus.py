@@ -1,23 +1,298 @@
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import inspect
+import queue
+import threading
 from collections import defaultdict
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from pi4.core.bounded_queue import BoundedQueue, OverflowPolicy
+from pi4.core.config import EVENT_BUS_DEFAULT_MODE, EVENT_BUS_QUEUE_SIZE
+from pi4.core.logger import get_logger
 
 Callback = Callable[[str, Any], None]
+DispatchMode = Literal["sync", "thread", "async"]
+
+LOGGER = get_logger("event_bus")
+
+_WILDCARD_CHARS = set("*?[")
+
+
+def _is_pattern(topic: str) -> bool:
+    return any(char in _WILDCARD_CHARS for char in topic)
+
+
+class Subscription:
+    """A callback registered on a topic (or wildcard pattern such as ``*.events``)."""
+
+    mode: DispatchMode = "sync"
+
+    def __init__(self, topic: str, callback: Callback) -> None:
+        self.topic = topic
+        self.callback = callback
+        self.delivered = 0
+        self._dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def deliver(self, topic: str, payload: Any) -> None:
+        self.callback(topic, payload)
+        self.delivered += 1
+
+    def close(self, timeout: float | None = None) -> None:
+        return None
+
+
+class ThreadedSubscription(Subscription):
+    """Delivers through a bounded queue drained by dedicated worker threads."""
+
+    mode: DispatchMode = "thread"
+
+    def __init__(
+        self,
+        topic: str,
+        callback: Callback,
+        maxsize: int,
+        policy: OverflowPolicy,
+        workers: int = 1,
+    ) -> None:
+        super().__init__(topic, callback)
+        self._queue = BoundedQueue(maxsize, policy)
+        self._count_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"EventBus-{topic}-{index}", daemon=True
+            )
+            for index in range(max(workers, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def dropped(self) -> int:
+        return self._queue.dropped
+
+    def deliver(self, topic: str, payload: Any) -> None:
+        self._queue.put((topic, payload))
+
+    def _run(self) -> None:
+        while True:
+            try:
+                topic, payload = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._queue.closed:
+                    return
+                continue
+            try:
+                self.callback(topic, payload)
+            except Exception:
+                LOGGER.exception("Subscriber for %s failed", self.topic)
+                continue
+            with self._count_lock:
+                self.delivered += 1
+
+    def close(self, timeout: float | None = None) -> None:
+        self._queue.close()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+
+class AsyncSubscription(Subscription):
+    """Delivers into an ``asyncio.Queue`` consumed by tasks on ``loop``.
+
+    The callback may be a plain function or a coroutine function.  Publishing
+    is thread-safe; with the ``block`` policy a publisher on another thread
+    waits for space, while a publisher on the loop thread queues a put task.
+    """
+
+    mode: DispatchMode = "async"
+
+    def __init__(
+        self,
+        topic: str,
+        callback: Callback,
+        loop: asyncio.AbstractEventLoop,
+        maxsize: int,
+        policy: OverflowPolicy,
+        workers: int = 1,
+    ) -> None:
+        super().__init__(topic, callback)
+        self._loop = loop
+        self._maxsize = maxsize
+        self._policy = policy
+        self._workers = max(workers, 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Runs before any enqueue callback scheduled afterwards.
+        loop.call_soon_threadsafe(self._setup)
+
+    def _setup(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self._maxsize)
+        self._tasks = [self._loop.create_task(self._run()) for _ in range(self._workers)]
+
+    def deliver(self, topic: str, payload: Any) -> None:
+        if self._loop.is_closed():
+            self._dropped += 1
+            return
+        item = (topic, payload)
+        if self._policy == "block" and _running_loop() is not self._loop:
+            future = asyncio.run_coroutine_threadsafe(self._put_blocking(item), self._loop)
+            future.result()
+            return
+        self._loop.call_soon_threadsafe(self._enqueue, item)
+
+    async def _put_blocking(self, item: tuple) -> None:
+        await self._queue.put(item)
+
+    def _enqueue(self, item: tuple) -> None:
+        assert self._queue is not None
+        if self._queue.full():
+            if self._policy == "drop_newest":
+                self._dropped += 1
+                return
+            if self._policy == "drop_oldest":
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._dropped += 1
+            else:
+                # "block" from the loop thread itself cannot wait here.
+                self._loop.create_task(self._queue.put(item))
+                return
+        self._queue.put_nowait(item)
+
+    async def _run(self) -> None:
+        while True:
+            topic, payload = await self._queue.get()
+            try:
+                result = self.callback(topic, payload)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except Exception:
+                LOGGER.exception("Async subscriber for %s failed", self.topic)
+            finally:
+                self._queue.task_done()
+
+    def close(self, timeout: float | None = None) -> None:
+        if self._loop.is_closed():
+            return
+
+        def _cancel() -> None:
+            for task in self._tasks:
+                task.cancel()
+
+        self._loop.call_soon_threadsafe(_cancel)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
 
 class EventBus:
-    def __init__(self) -> None:
-        self._subscribers: Dict[str, List[Callback]] = defaultdict(list)
+    def __init__(
+        self,
+        default_mode: DispatchMode = EVENT_BUS_DEFAULT_MODE,  # type: ignore[assignment]
+        queue_size: int = EVENT_BUS_QUEUE_SIZE,
+    ) -> None:
+        self._subscribers: Dict[str, List[Subscription]] = defaultdict(list)
+        self._patterns: List[Subscription] = []
+        self._match_cache: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._default_mode = default_mode
+        self._queue_size = queue_size
+
+    def subscribe(
+        self,
+        topic: str,
+        callback: Callback,
+        mode: DispatchMode | None = None,
+        policy: OverflowPolicy = "drop_oldest",
+        maxsize: int | None = None,
+        workers: int = 1,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> Subscription:
+        """Register a callback for a topic or a wildcard pattern (``*.events``).
+
+        ``mode`` selects delivery: ``sync`` calls the callback on the
+        publisher's thread (the original behaviour), ``thread`` hands events
+        to ``workers`` dedicated threads and ``async`` to tasks on ``loop``.
+        Queued modes hold at most ``maxsize`` events and apply ``policy``
+        (drop_oldest, drop_newest or block) when the subscriber falls behind.
+        ``block`` makes the publisher wait for a slow subscriber, so it is
+        opt-in; the default drops the oldest queued event.
+        """
+        mode = mode or self._default_mode
+        size = maxsize or self._queue_size
+        if mode == "sync":
+            subscription = Subscription(topic, callback)
+        elif mode == "thread":
+            subscription = ThreadedSubscription(topic, callback, size, policy, workers)
+        elif mode == "async":
+            if loop is None:
+                loop = _running_loop()
+            if loop is None:
+                raise ValueError("async subscriptions need an event loop")
+            subscription = AsyncSubscription(topic, callback, loop, size, policy, workers)
+        else:
+            raise ValueError(f"Invalid dispatch mode: {mode}")
+        with self._lock:
+            if _is_pattern(topic):
+                self._patterns.append(subscription)
+            else:
+                self._subscribers[topic].append(subscription)
+            self._match_cache.clear()
+        return subscription
 
-    def subscribe(self, topic: str, callback: Callback) -> None:
-        """Register a callback to receive publications for a topic."""
-        self._subscribers[topic].append(callback)
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._patterns:
+                self._patterns.remove(subscription)
+            else:
+                subs = self._subscribers.get(subscription.topic, [])
+                if subscription in subs:
+                    subs.remove(subscription)
+            self._match_cache.clear()
+        subscription.close()
+
+    def _matching(self, topic: str) -> List[Subscription]:
+        with self._lock:
+            matched = self._match_cache.get(topic)
+            if matched is None:
+                matched = list(self._subscribers.get(topic, []))
+                matched.extend(
+                    sub for sub in self._patterns if fnmatch.fnmatchcase(topic, sub.topic)
+                )
+                self._match_cache[topic] = matched
+            return matched
 
     def publish(self, topic: str, payload: Any) -> None:
         """Publish payload to all subscribers of topic."""
-        for cb in list(self._subscribers.get(topic, [])):
-            cb(topic, payload)
+        for sub in self._matching(topic):
+            sub.deliver(topic, payload)
+
+    def close(self, timeout: float | None = 2.0) -> None:
+        """Stop queued subscribers' workers and drop all subscriptions."""
+        with self._lock:
+            subs = [sub for group in self._subscribers.values() for sub in group]
+            subs.extend(self._patterns)
+            self._subscribers.clear()
+            self._patterns.clear()
+            self._match_cache.clear()
+        for sub in subs:
+            sub.close(timeout)
 
     def clear(self) -> None:
         """Clear all subscribers (useful in tests)."""
-        self._subscribers.clear()
+        self.close(timeout=0)
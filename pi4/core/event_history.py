@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class EventHistory(Generic[T]):
+    """Fixed-capacity ring of items indexed by monotonic arrival time.
+
+    Appends are O(1); items older than ``max_age_sec`` are evicted lazily and
+    the oldest item is overwritten once ``capacity`` is reached.  Arrival
+    stamps are kept in a NumPy array so "last N seconds" queries are a binary
+    search instead of a scan.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_age_sec: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.max_age_sec = max_age_sec
+        self._clock = clock
+        self._items: List[Optional[T]] = [None] * capacity
+        self._stamps = np.zeros(capacity, dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._last_stamp = float("-inf")
+        self._lock = threading.Lock()
+
+    # -- writes -----------------------------------------------------------
+
+    def append(self, item: T, stamp: float | None = None) -> None:
+        now = self._clock() if stamp is None else stamp
+        with self._lock:
+            # Keep stamps non-decreasing so the ring stays sorted.
+            now = max(now, self._last_stamp)
+            self._last_stamp = now
+            self._evict_expired(now)
+            if self._size == self.capacity:
+                self._items[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+                self._size -= 1
+            slot = (self._head + self._size) % self.capacity
+            self._items[slot] = item
+            self._stamps[slot] = now
+            self._size += 1
+
+    def extend(self, items: Iterable[T]) -> None:
+        now = self._clock()
+        for item in items:
+            self.append(item, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items = [None] * self.capacity
+            self._head = 0
+            self._size = 0
+
+    def drain(self, within_sec: float | None = None) -> List[T]:
+        """Return every live item and empty the history atomically.
+
+        With ``within_sec`` only items that arrived at most that long before
+        the newest one are returned; the rest are discarded too.
+        """
+        with self._lock:
+            self._evict_expired(self._clock())
+            start = 0
+            if within_sec is not None:
+                start = self._first_index_at_or_after(self._last_stamp - within_sec)
+            items = self._slice(start)
+            self._items = [None] * self.capacity
+            self._head = 0
+            self._size = 0
+        return items
+
+    # -- reads ------------------------------------------------------------
+
+    def since(self, seconds: float, now: float | None = None) -> List[T]:
+        """Items that arrived within the last ``seconds``, oldest first."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            self._evict_expired(now)
+            return self._slice(self._first_index_at_or_after(now - seconds))
+
+    def latest(self, count: int) -> List[T]:
+        """The ``count`` most recent items, oldest first."""
+        with self._lock:
+            self._evict_expired(self._clock())
+            return self._slice(max(self._size - max(count, 0), 0))
+
+    def snapshot(self) -> List[T]:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return self._slice(0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.snapshot())
+
+    # -- internals (caller holds the lock) --------------------------------
+
+    def _segments(self) -> tuple[np.ndarray, np.ndarray]:
+        end = self._head + self._size
+        if end <= self.capacity:
+            return self._stamps[self._head:end], self._stamps[:0]
+        return self._stamps[self._head:], self._stamps[: end - self.capacity]
+
+    def _first_index_at_or_after(self, cutoff: float) -> int:
+        first, second = self._segments()
+        index = int(np.searchsorted(first, cutoff, side="left"))
+        if index < len(first):
+            return index
+        return len(first) + int(np.searchsorted(second, cutoff, side="left"))
+
+    def _evict_expired(self, now: float) -> None:
+        if self.max_age_sec is None or self._size == 0:
+            return
+        expired = self._first_index_at_or_after(now - self.max_age_sec)
+        for _ in range(expired):
+            self._items[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+        self._size -= expired
+
+    def _slice(self, start: int) -> List[T]:
+        items: List[T] = []
+        for offset in range(start, self._size):
+            items.append(self._items[(self._head + offset) % self.capacity])
+        return items
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
-from typing import Optional
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
 
 try:
     from typing import Literal
@@ -13,26 +14,139 @@ Severity = Literal["low", "mid", "high", "critical"]
 
 VALID_SEVERITIES = {"low", "mid", "high", "critical"}
 
-@dataclass
+# Anchor pair used to turn monotonic stamps into wall-clock time lazily.
+_MONO_ANCHOR_NS = time.monotonic_ns()
+_WALL_ANCHOR_NS = time.time_ns()
+_id_counter = itertools.count()
+
+
+def _wall_ns_from_monotonic(mono_ns: int) -> int:
+    return _WALL_ANCHOR_NS + (mono_ns - _MONO_ANCHOR_NS)
+
+
+def new_event_id(mono_ns: int | None = None) -> str:
+    """Cheap, lexicographically sortable id: wall-clock ns + per-process counter."""
+    if mono_ns is None:
+        mono_ns = time.monotonic_ns()
+    return "%016x%04x" % (_wall_ns_from_monotonic(mono_ns), next(_id_counter) & 0xFFFF)
+
+
 class Event:
-    event_id: str
-    ts: datetime
-    type: str
-    source: str
-    severity: Severity
-    distance_m: Optional[float] = None
-    direction: Optional[str] = None
-    object_label: Optional[str] = None
-    extra: dict = field(default_factory=dict)
-
-    def __post_init__(self) -> None:
-        if self.severity not in VALID_SEVERITIES:
-            raise ValueError(f"Invalid severity: {self.severity}")
+    """Safety event with the same public fields as the original dataclass.
+
+    Slotted to keep per-event memory low.  Events created with
+    `Event.new` carry only a monotonic nanosecond stamp (``ts_ns``); the
+    ``ts`` datetime and the ``extra`` dict are built on first access.
+    """
+
+    __slots__ = (
+        "event_id",
+        "_ts",
+        "ts_ns",
+        "type",
+        "source",
+        "severity",
+        "distance_m",
+        "direction",
+        "object_label",
+        "_extra",
+    )
+
+    def __init__(
+        self,
+        event_id: Optional[str],
+        ts: Optional[datetime],
+        type: str,
+        source: str,
+        severity: Severity,
+        distance_m: Optional[float] = None,
+        direction: Optional[str] = None,
+        object_label: Optional[str] = None,
+        extra: Optional[dict] = None,
+        *,
+        ts_ns: Optional[int] = None,
+    ) -> None:
+        if severity not in VALID_SEVERITIES:
+            raise ValueError(f"Invalid severity: {severity}")
+        if ts is None and ts_ns is None:
+            ts_ns = time.monotonic_ns()
+        self.event_id = event_id if event_id is not None else new_event_id(ts_ns)
+        self._ts = ts
+        self.ts_ns = ts_ns
+        self.type = type
+        self.source = source
+        self.severity = severity
+        self.distance_m = distance_m
+        self.direction = direction
+        self.object_label = object_label
+        self._extra = extra
+
+    @classmethod
+    def new(
+        cls,
+        type: str,
+        source: str,
+        severity: Severity,
+        distance_m: Optional[float] = None,
+        direction: Optional[str] = None,
+        object_label: Optional[str] = None,
+        extra: Optional[dict] = None,
+    ) -> "Event":
+        """Create an event stamped now, with a generated id."""
+        ts_ns = time.monotonic_ns()
+        return cls(
+            new_event_id(ts_ns),
+            None,
+            type,
+            source,
+            severity,
+            distance_m,
+            direction,
+            object_label,
+            extra,
+            ts_ns=ts_ns,
+        )
+
+    @property
+    def ts(self) -> datetime:
+        if self._ts is None:
+            wall_ns = _wall_ns_from_monotonic(self.ts_ns)
+            self._ts = datetime.fromtimestamp(wall_ns / 1e9, tz=timezone.utc)
+        return self._ts
+
+    @ts.setter
+    def ts(self, value: datetime) -> None:
+        self._ts = value
+        self.ts_ns = None
+
+    @property
+    def extra(self) -> dict:
+        if self._extra is None:
+            self._extra = {}
+        return self._extra
+
+    @extra.setter
+    def extra(self, value: dict) -> None:
+        self._extra = value
+
+    def timestamp(self) -> float:
+        """POSIX timestamp in seconds, without building a datetime when possible."""
+        if self.ts_ns is not None:
+            return _wall_ns_from_monotonic(self.ts_ns) / 1e9
+        return self.ts.timestamp()
 
     def to_dict(self) -> dict:
-        data = asdict(self)
-        data["ts"] = self.ts.isoformat()
-        return data
+        return {
+            "event_id": self.event_id,
+            "ts": self.ts.isoformat(),
+            "type": self.type,
+            "source": self.source,
+            "severity": self.severity,
+            "distance_m": self.distance_m,
+            "direction": self.direction,
+            "object_label": self.object_label,
+            "extra": dict(self._extra) if self._extra else {},
+        }
 
     @classmethod
     def from_dict(cls, payload: dict) -> "Event":
@@ -50,3 +164,31 @@ class Event:
             object_label=payload.get("object_label"),
             extra=payload.get("extra", {}),
         )
+
+    def _key(self) -> tuple:
+        return (
+            self.event_id,
+            self.ts,
+            self.type,
+            self.source,
+            self.severity,
+            self.distance_m,
+            self.direction,
+            self.object_label,
+            self.extra,
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # type: ignore[assignment]  # mutable, like the dataclass
+
+    def __repr__(self) -> str:
+        return (
+            f"Event(event_id={self.event_id!r}, ts={self.ts!r}, type={self.type!r}, "
+            f"source={self.source!r}, severity={self.severity!r}, "
+            f"distance_m={self.distance_m!r}, direction={self.direction!r}, "
+            f"object_label={self.object_label!r}, extra={self.extra!r})"
+        )
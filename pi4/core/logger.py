@@ -1,29 +1,200 @@
 from __future__ import annotations
 
+import atexit
 import logging
-from pathlib import Path
-from typing import Any
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Dict, Hashable, List, Optional
 
-from .config import LOG_DIR, LOG_FILE_NAME, LOG_LEVEL
+from .config import (
+    LOG_BACKUP_COUNT,
+    LOG_DIR,
+    LOG_FILE_NAME,
+    LOG_LEVEL,
+    LOG_MAX_BYTES,
+    LOG_QUEUE_SIZE,
+    LOG_RATE_LIMIT_BURST,
+    LOG_RATE_LIMIT_INTERVAL_SEC,
+    LOG_ROTATE_WHEN,
+)
 
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most ``burst`` records per key through every ``interval_sec``.
+
+    The key is the call site (or ``extra={"rate_key": ...}``), so f-string
+    messages from one hot line collapse together.  Records at ``max_level``
+    (WARNING by default) or above always pass.  Suppressed counts are
+    reported by the next record let through after the window, or by
+    ``flush`` once the window has expired, whichever comes first.
+    """
+
+    def __init__(self, interval_sec: float, burst: int, max_level: int = logging.WARNING) -> None:
+        super().__init__()
+        self.interval_sec = interval_sec
+        self.burst = max(burst, 1)
+        self.max_level = max_level
+        # key -> [window start, passed in window, suppressed in window, last suppressed record]
+        self._windows: Dict[Hashable, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval_sec <= 0 or record.levelno >= self.max_level:
+            return True
+        key = getattr(record, "rate_key", None) or (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval_sec:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0, None]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} ({suppressed} similar suppressed)"
+                    record.args = None
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            window[3] = record
+            return False
+
+    def flush(self, now: float | None = None, force: bool = False) -> List[logging.LogRecord]:
+        """Summary records for expired (or, with ``force``, all) windows that suppressed something.
+
+        Flushed windows are forgotten, so quiet call sites do not pile up.
+        """
+        now = time.time() if now is None else now
+        summaries: List[logging.LogRecord] = []
+        with self._lock:
+            expired = [
+                key
+                for key, window in self._windows.items()
+                if force or now - window[0] >= self.interval_sec
+            ]
+            for key in expired:
+                _, _, suppressed, last = self._windows.pop(key)
+                if suppressed:
+                    summary = logging.makeLogRecord(last.__dict__)
+                    summary.msg = f"{last.getMessage()} ({suppressed} similar suppressed)"
+                    summary.args = None
+                    summary.created = now
+                    summaries.append(summary)
+        return summaries
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of waiting."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Shutdown may wait for room; only producers must never block.
+        self.queue.put(self._sentinel)
+
+
+def _build_file_handler() -> logging.Handler:
+    path = LOG_DIR / LOG_FILE_NAME
+    if LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+
+
+_backend_lock = threading.Lock()
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_rate_limiter: Optional[RateLimitFilter] = None
+_flush_stop = threading.Event()
+
+
+def _flush_suppressed(force: bool = False) -> None:
+    if _rate_limiter is None or _queue_handler is None:
+        return
+    for summary in _rate_limiter.flush(force=force):
+        _queue_handler.enqueue(summary)
+
+
+def _run_flusher(interval_sec: float) -> None:
+    # Report suppressed counts even when the hot call site has gone quiet.
+    while not _flush_stop.wait(interval_sec):
+        _flush_suppressed()
+
+
+def _backend() -> NonBlockingQueueHandler:
+    """Start the shared file/console listener once and return its queue handler."""
+    global _queue_handler, _listener, _rate_limiter
+    with _backend_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+        level = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
+        formatter = logging.Formatter(_FORMAT)
+        file_handler = _build_file_handler()
+        console = logging.StreamHandler()
+        for handler in (file_handler, console):
+            handler.setFormatter(formatter)
+            handler.setLevel(level)
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(LOG_QUEUE_SIZE)
+        handler = NonBlockingQueueHandler(log_queue)
+        _rate_limiter = RateLimitFilter(LOG_RATE_LIMIT_INTERVAL_SEC, LOG_RATE_LIMIT_BURST)
+        handler.addFilter(_rate_limiter)
+        _listener = _Listener(
+            log_queue, file_handler, console, respect_handler_level=True
+        )
+        _listener.start()
+        if LOG_RATE_LIMIT_INTERVAL_SEC > 0:
+            threading.Thread(
+                target=_run_flusher,
+                args=(LOG_RATE_LIMIT_INTERVAL_SEC,),
+                name="LogRateFlusher",
+                daemon=True,
+            ).start()
+        atexit.register(shutdown_logging)
+        _queue_handler = handler
+        return handler
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    _flush_stop.set()
+    with _backend_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        _flush_suppressed(force=True)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def dropped_log_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
 def get_logger(name: str) -> logging.Logger:
-    """Return a configured logger with file and console handlers."""
+    """Return a logger feeding the shared non-blocking file/console pipeline."""
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
-
-    formatter = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
-    handler = logging.FileHandler(LOG_DIR / LOG_FILE_NAME, encoding="utf-8")
-    handler.setFormatter(formatter)
-    handler.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
-
-    console = logging.StreamHandler()
-    console.setFormatter(formatter)
-    console.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
-
     logger.setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
-    logger.addHandler(handler)
-    logger.addHandler(console)
+    logger.addHandler(_backend())
     return logger
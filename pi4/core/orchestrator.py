@@ -3,26 +3,36 @@ from __future__ import annotations
 import time
 import uuid
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Iterable
 
 import numpy as np
 
-from pi4.core.analyzer import log_analysis
+from pi4.core.analyzer import flush_analysis, log_analysis
 from pi4.core.config import (
+    DANGER_EVENT_WINDOW_SEC,
+    EVENT_HISTORY_CAPACITY,
+    EVENT_HISTORY_MAX_AGE_SEC,
     FRAME_BLACK_THRESHOLD,
     MAIN_LOOP_DURATION_SEC,
     MAIN_LOOP_INTERVAL_SEC,
+    SAFETY_PIPELINE_ENABLED,
     USE_CONVERSATION_LAYER,
     USE_UNDERSTANDING_LAYER,
 )
+from pi4.core.event_batch import EventBatch
 from pi4.core.event_bus import EventBus
+from pi4.core.event_history import EventHistory
 from pi4.core.event_schema import Event
 from pi4.core.logger import get_logger
+from pi4.core.pipeline import SafetyPipeline
+from pi4.core.tracing import TRACER
 from pi4.llm import (conversation_chatgpt_client,
                      understanding_ollama_client)
 from pi4.safety.cane_client import cane_safety, tof_receiver
 from pi4.safety.vision import camera_capture, vision_safety
+from pi4.safety.vision.camera_capture import CapturedFrame
 from pi4.voice.voice_output import VoiceOutput
 from pi4.voice.line_api_message import LineNotifier
 
@@ -41,16 +51,54 @@ def _frame_mean(frame: "np.ndarray" | None) -> float:
 def _frame_is_blank(frame: "np.ndarray" | None) -> bool:
     return _frame_mean(frame) <= FRAME_BLACK_THRESHOLD
 
+
+def _photo_of(event: Event) -> str | None:
+    """Saved frame the event was detected on, if that frame was kept."""
+    return event._extra.get("photo") if event._extra else None
+
+
+# Simple translation map for fallback
+_LABEL_TRANSLATIONS = {
+    "person": "行人",
+    "car": "車輛",
+    "bike": "腳踏車",
+    "drop": "落差",
+    "step": "台階",
+    "step_down": "下台階",
+    "background": "背景",
+}
+
+
+@dataclass
+class VoiceAlert:
+    """A composed alert waiting to be spoken."""
+
+    event: Event
+    voice_text: str
+    rewritten: str
+    source_tag: str
+    trace_id: str | None = None
+    image_name: str | None = None
+
+
 class Orchestrator:
     def __init__(self) -> None:
         self.bus = EventBus()
         self.voice = VoiceOutput()
-        self.recent_camera_events: list[Event] = []
-        self.recent_cane_events: list[Event] = []
-        self.recent_danger_events: list[Event] = []
-        self.recent_danger_events: list[Event] = []
-        self.bus.subscribe("danger.events", self._collect_danger_event)
+        self.recent_camera_events: EventHistory[Event] = EventHistory(
+            EVENT_HISTORY_CAPACITY, EVENT_HISTORY_MAX_AGE_SEC
+        )
+        self.recent_cane_events: EventHistory[Event] = EventHistory(
+            EVENT_HISTORY_CAPACITY, EVENT_HISTORY_MAX_AGE_SEC
+        )
+        # Capped by count only: in the sequential loop the alert is spoken
+        # (often for longer than DANGER_EVENT_WINDOW_SEC) before the summary
+        # drains it, so the window is measured from the newest event instead.
+        self.recent_danger_events: EventHistory[Event] = EventHistory(EVENT_HISTORY_CAPACITY)
+        # Cheap in-memory append: keep it on the publisher's thread.
+        self.bus.subscribe("danger.events", self._collect_danger_event, mode="sync")
         self.line_notifier = LineNotifier()
+        self._pipeline: SafetyPipeline | None = None
 
     def _wait_for_voice_idle(self) -> None:
         if self.voice.is_busy():
@@ -60,8 +108,6 @@ class Orchestrator:
 
     def _collect_danger_event(self, topic: str, payload: Event) -> None:
         self.recent_danger_events.append(payload)
-        window_limit = int(1 / max(MAIN_LOOP_INTERVAL_SEC, 0.01))
-        self.recent_danger_events = self.recent_danger_events[-window_limit:]
 
     # Add cooldown for LINE to prevent 429 errors
     _last_line_sent_time: float = 0.0
@@ -73,11 +119,166 @@ class Orchestrator:
             if event.severity in ("mid", "high", "critical"):
                 self.bus.publish("danger.events", event)
 
+    def _read_trigger(self) -> float | None:
+        """Return the ToF trigger distance in meters, or None when idle."""
+        return tof_receiver.read_latest_distance()
+
+    def _capture_frame(self, distance: float) -> CapturedFrame | None:
+        """Wake the camera for a trigger; return None if the frame is unusable."""
+        logger.info(f"Trigger received (dist={distance:.2f}m). Processing vision...")
+
+        captured = camera_capture.capture()
+        if _frame_is_blank(captured.image):
+            logger.warning(
+                "Captured frame looks blank (mean %.1f <= %.1f); skipping vision processing",
+                _frame_mean(captured.image),
+                FRAME_BLACK_THRESHOLD,
+            )
+            return None
+        return captured
+
+    def _detect_events(self, distance: float, captured: CapturedFrame) -> list[Event]:
+        """Run vision and cane evaluation for one trigger and publish the events."""
+        # The capture time, not "now", so queueing never stretches the tracker's dt.
+        camera_events = vision_safety.process_frame(captured.image, captured.timestamp)
+        # Generate Cane Event from the trigger distance
+        cane_events = cane_safety.eval_distance(distance)
+        events = camera_events + cane_events
+        # Tag the events with their own frame; in the pipeline later frames
+        # are captured (and saved) before these events are spoken or summarised.
+        image_name = camera_capture.report_events(events, captured)
+        if image_name is not None:
+            for event in events:
+                event.extra["photo"] = image_name
+
+        self._publish_events("camera.events", camera_events)
+        self.recent_camera_events.extend(camera_events)
+        self._publish_events("cane.events", cane_events)
+        self.recent_cane_events.extend(cane_events)
+        return events
+
+    def _compose_alert(self, event: Event) -> VoiceAlert | None:
+        """Build (and optionally LLM-rewrite) the spoken alert for an event."""
+        if event.severity not in ("mid", "high", "critical") or event.distance_m is None:
+            return None
+        label_raw = event.object_label or event.type.split(".")[-1]
+        label_zh = _LABEL_TRANSLATIONS.get(label_raw, label_raw)
+
+        voice_text = (
+            f"前方有 {label_zh}，距離約 {event.distance_m:.1f} 公尺，請注意"
+        )
+        rewritten = voice_text
+        used_ollama = False
+        if USE_UNDERSTANDING_LAYER:
+            rewritten, used_ollama = understanding_ollama_client.rewrite_voice_text(
+                [event], voice_text
+            )
+        source_tag = "Ollama" if used_ollama else "NAN"
+        return VoiceAlert(
+            event=event,
+            voice_text=voice_text,
+            rewritten=rewritten,
+            source_tag=source_tag,
+            trace_id=TRACER.current_trace_id(),
+            image_name=_photo_of(event),
+        )
+
+    def _deliver_alert(self, alert: VoiceAlert) -> None:
+        """Speak an alert, record it and notify the caregiver if needed."""
+        self.voice.speak(alert.rewritten, priority="high", source=alert.source_tag)
+        self._wait_for_voice_idle()
+        self._log_alert(alert)
+        self._notify_caregiver(alert.event, alert.voice_text)
+
+    def _log_alert(self, alert: VoiceAlert) -> None:
+        log_analysis(
+            alert.image_name,
+            {
+                "voice_text": alert.voice_text,
+                "voice_source": alert.source_tag,
+                "rewritten_voice_text": alert.rewritten,
+                "event": alert.event.to_dict(),
+            },
+            "voice_distance_alert",
+            tags=["voice", "distance"],
+        )
+
+    def _should_notify_caregiver(self, event: Event) -> bool:
+        """LINE Notification for Caregiver (High Severity only) with Cooldown."""
+        now = time.time()
+        if event.severity in ("high", "critical"):
+            if now - self._last_line_sent_time > self._LINE_COOLDOWN_SEC:
+                self._last_line_sent_time = now
+                return True
+        return False
+
+    def _send_caregiver_alert(self, event: Event, voice_text: str) -> None:
+        try:
+            caregiver_text = understanding_ollama_client.rewrite_caregiver_text(
+                [event], voice_text
+            )
+            self.line_notifier.send(caregiver_text)
+        except Exception as e:
+            logger.error(f"Failed to send LINE alert: {e}")
+
+    def _notify_caregiver(self, event: Event, voice_text: str) -> None:
+        if self._should_notify_caregiver(event):
+            # Run in background to avoid blocking detection loop
+            threading.Thread(
+                target=self._send_caregiver_alert,
+                args=(event, voice_text),
+                daemon=True
+            ).start()
+
+    def _summarize_danger_events(self) -> None:
+        if not (USE_UNDERSTANDING_LAYER and self.recent_danger_events):
+            return
+        events_snapshot = self.recent_danger_events.drain(DANGER_EVENT_WINDOW_SEC)
+        msg = understanding_ollama_client.summarize_events(
+            EventBatch.from_events(events_snapshot)
+        )
+        if msg:
+            # The newest summarised event's own frame, not whatever was saved last.
+            photo = next(filter(None, map(_photo_of, reversed(events_snapshot))), None)
+            log_analysis(
+                photo,
+                {
+                    "summary": msg,
+                    "events": [event.to_dict() for event in events_snapshot],
+                },
+                "understanding_summary",
+                tags=["voice", "understanding"],
+            )
+
+    def _conversation_reply(self) -> str:
+        context = conversation_chatgpt_client.ConversationContext(
+            camera_events=self.recent_camera_events.latest(5),
+            cane_events=self.recent_cane_events.latest(5),
+            position="unknown",
+            time=datetime.now(timezone.utc),
+        )
+        query = "目前狀況如何？"
+        reply = conversation_chatgpt_client.answer_question(
+            context, query)
+        log_analysis(
+            camera_capture.get_latest_image_name(),
+            {"user_query": query, "reply": reply},
+            reply,
+            tags=["voice", "conversation"],
+        )
+        return reply
+
     def _process_safety(self) -> None:
+        # The trace opened by the trigger ends here, so later conversation
+        # and speech spans are not charged to it.
+        with TRACER.trace():
+            self._process_trigger()
+
+    def _process_trigger(self) -> None:
         self._wait_for_voice_idle()
         
         # 1. Check ToF Trigger first (Event-Triggered)
-        distance = tof_receiver.read_latest_distance()
+        distance = self._read_trigger()
         
         # If no trigger from ToF, and we are in event-triggered mode, we skip vision
         # Unless we want to support a "continuous mode" flag. 
@@ -87,135 +288,60 @@ class Orchestrator:
             return
 
         # 2. Trigger received! Wake up camera
-        logger.info(f"Trigger received (dist={distance:.2f}m). Processing vision...")
-        
-        frame = camera_capture.get_frame()
-        if _frame_is_blank(frame):
-            logger.warning(
-                "Captured frame looks blank (mean %.1f <= %.1f); skipping vision processing",
-                _frame_mean(frame),
-                FRAME_BLACK_THRESHOLD,
-            )
+        captured = self._capture_frame(distance)
+        if captured is None:
             return
-            
-        camera_events = vision_safety.process_frame(frame)
-        self._publish_events("camera.events", camera_events)
-        self.recent_camera_events.extend(camera_events)
-        
-        # Generate Cane Event from the trigger distance
-        cane_events = cane_safety.eval_distance(distance)
-        self._publish_events("cane.events", cane_events)
-        self.recent_cane_events.extend(cane_events)
-        
-        for event in camera_events + cane_events:
-            if event.severity in ("mid", "high", "critical") and event.distance_m is not None:
-                label_raw = event.object_label or event.type.split(".")[-1]
-                
-                # Simple translation map for fallback
-                _TRANS_MAP = {
-                    "person": "行人",
-                    "car": "車輛",
-                    "bike": "腳踏車",
-                    "drop": "落差",
-                    "step": "台階",
-                    "step_down": "下台階",
-                    "background": "背景",
-                }
-                label_zh = _TRANS_MAP.get(label_raw, label_raw)
-                
-                voice_text = (
-                    f"前方有 {label_zh}，距離約 {event.distance_m:.1f} 公尺，請注意"
-                )
-                rewritten = voice_text
-                used_ollama = False
-                if USE_UNDERSTANDING_LAYER:
-                    rewritten, used_ollama = understanding_ollama_client.rewrite_voice_text(
-                        [event], voice_text
-                    )
-                source_tag = "Ollama" if used_ollama else "NAN"
-                self.voice.speak(rewritten, priority="high", source=source_tag)
-                self._wait_for_voice_idle()
-                log_analysis(
-                    camera_capture.get_latest_image_name(),
-                    {
-                        "voice_text": voice_text,
-                        "voice_source": source_tag,
-                        "rewritten_voice_text": rewritten,
-                        "event": event.to_dict(),
-                    },
-                    "voice_distance_alert",
-                    tags=["voice", "distance"],
-                )
-                
-                # LINE Notification for Caregiver (High Severity only) with Cooldown
-                # LINE Notification for Caregiver (High Severity only) with Cooldown
-                now = time.time()
-                if event.severity in ("high", "critical"):
-                    if now - self._last_line_sent_time > self._LINE_COOLDOWN_SEC:
-                        self._last_line_sent_time = now
-                        
-                        def _send_line_async(evt, txt):
-                            try:
-                                caregiver_text = understanding_ollama_client.rewrite_caregiver_text(
-                                    [evt], txt
-                                )
-                                self.line_notifier.send(caregiver_text)
-                            except Exception as e:
-                                logger.error(f"Failed to send LINE alert: {e}")
-
-                        # Run in background to avoid blocking detection loop
-                        threading.Thread(
-                            target=_send_line_async, 
-                            args=(event, voice_text), 
-                            daemon=True
-                        ).start()
+
+        for event in self._detect_events(distance, captured):
+            alert = self._compose_alert(event)
+            if alert is not None:
+                self._deliver_alert(alert)
 
     def process_safety_once(self) -> None:
         """公開方法：單次執行 Safety Layer，方便外部調度。"""
         self._process_safety()
 
-    def main_loop(self, duration_sec: float | None = None) -> None:
+    def start_pipeline(self) -> SafetyPipeline:
+        """Start the staged safety pipeline in background threads."""
+        if self._pipeline is None or not self._pipeline.is_running:
+            self._pipeline = SafetyPipeline(self)
+            self._pipeline.start()
+        return self._pipeline
+
+    def stop_pipeline(self) -> None:
+        pipeline = self._pipeline
+        self._pipeline = None
+        if pipeline is not None:
+            pipeline.stop()
+
+    def main_loop(
+        self, duration_sec: float | None = None, pipelined: bool | None = None
+    ) -> None:
         logger.info("Orchestrator main loop start")
         duration = duration_sec if duration_sec is not None else MAIN_LOOP_DURATION_SEC
+        use_pipeline = SAFETY_PIPELINE_ENABLED if pipelined is None else pipelined
         deadline = time.monotonic() + duration
         cycle = 0
-        while time.monotonic() < deadline:
-            logger.debug("Main loop cycle %d", cycle)
-            self._process_safety()
-            if USE_UNDERSTANDING_LAYER and self.recent_danger_events:
-                events_snapshot = list(self.recent_danger_events)
-                msg = understanding_ollama_client.summarize_events(events_snapshot)
-                if msg:
-                    log_analysis(
-                        camera_capture.get_latest_image_name(),
-                        {
-                            "summary": msg,
-                            "events": [event.to_dict() for event in events_snapshot],
-                        },
-                        "understanding_summary",
-                        tags=["voice", "understanding"],
-                    )
-                self.recent_danger_events.clear()
-            if USE_CONVERSATION_LAYER:
-                context = conversation_chatgpt_client.ConversationContext(
-                    camera_events=self.recent_camera_events[-5:],
-                    cane_events=self.recent_cane_events[-5:],
-                    position="unknown",
-                    time=datetime.now(timezone.utc),
-                )
-                query = "目前狀況如何？"
-                reply = conversation_chatgpt_client.answer_question(
-                    context, query)
-                log_analysis(
-                    camera_capture.get_latest_image_name(),
-                    {"user_query": query, "reply": reply},
-                    reply,
-                    tags=["voice", "conversation"],
-                )
-                self.voice.speak(reply, priority="mid")
-                self._wait_for_voice_idle()
-            time.sleep(MAIN_LOOP_INTERVAL_SEC)
-            cycle += 1
+        if use_pipeline:
+            self.start_pipeline()
+        try:
+            while time.monotonic() < deadline:
+                logger.debug("Main loop cycle %d", cycle)
+                if not use_pipeline:
+                    self._process_safety()
+                self._summarize_danger_events()
+                if USE_CONVERSATION_LAYER:
+                    reply = self._conversation_reply()
+                    self.voice.speak(reply, priority="mid")
+                    self._wait_for_voice_idle()
+                time.sleep(MAIN_LOOP_INTERVAL_SEC)
+                cycle += 1
+        finally:
+            if use_pipeline:
+                self.stop_pipeline()
+            flush_analysis(timeout=2.0)
+        if TRACER.spans():
+            logger.info("Trigger latency by stage:\n%s", TRACER.report())
         logger.info("Orchestrator main loop end")
 
     def run_safety_simulation(self, iterations: int = 3) -> None:
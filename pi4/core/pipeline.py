@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from pi4.core.bounded_queue import BoundedQueue
+from pi4.core.config import MAIN_LOOP_INTERVAL_SEC, SAFETY_PIPELINE_QUEUE_SIZE
+from pi4.core.event_batch import SEVERITY_CODES
+from pi4.core.logger import get_logger
+from pi4.core.tracing import TRACER
+
+if TYPE_CHECKING:
+    from pi4.core.orchestrator import Orchestrator
+
+LOGGER = get_logger("pipeline")
+
+StageHandler = Callable[[Any], Iterable[Any]]
+
+_STAGE_QUEUES = ("capture", "inference", "compose", "audio")
+
+
+def _alert_severity(item: tuple) -> int:
+    """Rank of a queued ``(trace_id, alert)`` by its event severity."""
+    event = getattr(item[1], "event", None)
+    return SEVERITY_CODES.get(getattr(event, "severity", None), -1)
+
+
+class SafetyPipeline:
+    """Run the safety layer as stages joined by bounded drop-oldest queues.
+
+    sensing -> capture -> inference -> compose -> audio
+
+    Each stage owns one thread, so a new ToF trigger is captured and analysed
+    while the previous alert is still being spoken.  When a downstream stage
+    falls behind, its queue discards the oldest item: stale hazards are less
+    useful than the current one.  The audio queue instead discards its least
+    severe alert, so a newer "mid" alert never pushes out a queued "critical".
+    """
+
+    def __init__(
+        self,
+        orchestrator: "Orchestrator",
+        queue_size: int = SAFETY_PIPELINE_QUEUE_SIZE,
+        poll_interval: float = MAIN_LOOP_INTERVAL_SEC,
+    ) -> None:
+        self._orchestrator = orchestrator
+        self._poll_interval = poll_interval
+        self.queues: dict[str, BoundedQueue] = {
+            name: BoundedQueue(max(queue_size, 1), policy="drop_oldest")
+            for name in _STAGE_QUEUES
+        }
+        self.queues["audio"] = BoundedQueue(
+            max(queue_size, 1), policy="drop_lowest", priority=_alert_severity
+        )
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        if self.is_running:
+            LOGGER.debug("Safety pipeline already running")
+            return
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._run_sensing, name="Pipeline-sensing", daemon=True),
+            self._stage_thread("capture", self._capture, "inference"),
+            self._stage_thread("inference", self._inference, "compose"),
+            self._stage_thread("compose", self._compose, "audio"),
+            self._stage_thread("audio", self._audio, None),
+        ]
+        for thread in self._threads:
+            thread.start()
+        LOGGER.info("Safety pipeline started (queue size %d)", self.queues["audio"].maxsize)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        for stage_queue in self.queues.values():
+            stage_queue.close()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        LOGGER.info("Safety pipeline stopped (dropped: %s)", self.dropped_counts())
+
+    def dropped_counts(self) -> dict[str, int]:
+        """Number of items each stage queue has discarded so far."""
+        return {name: stage_queue.dropped for name, stage_queue in self.queues.items()}
+
+    # -- stage bodies -----------------------------------------------------
+
+    def _capture(self, distance: float) -> Iterable[Any]:
+        captured = self._orchestrator._capture_frame(distance)
+        if captured is None:
+            return []
+        return [(distance, captured)]
+
+    def _inference(self, item: tuple) -> Iterable[Any]:
+        distance, captured = item
+        events = self._orchestrator._detect_events(distance, captured)
+        return [events] if events else []
+
+    def _compose(self, events: list) -> Iterable[Any]:
+        alerts = []
+        for event in events:
+            alert = self._orchestrator._compose_alert(event)
+            if alert is not None:
+                alerts.append(alert)
+        return alerts
+
+    def _audio(self, alert: Any) -> Iterable[Any]:
+        self._orchestrator._deliver_alert(alert)
+        return []
+
+    # -- plumbing ---------------------------------------------------------
+
+    def _run_sensing(self) -> None:
+        outbox = self.queues["capture"]
+        while not self._stop_event.is_set():
+            with TRACER.trace():
+                try:
+                    distance = self._orchestrator._read_trigger()
+                except Exception:
+                    LOGGER.exception("Pipeline stage sensing failed")
+                    distance = None
+                trace_id = TRACER.current_trace_id()
+            if distance is None:
+                time.sleep(self._poll_interval)
+                continue
+            outbox.put((trace_id, distance))
+
+    def _stage_thread(
+        self, name: str, handler: StageHandler, next_stage: str | None
+    ) -> threading.Thread:
+        inbox = self.queues[name]
+        outbox = self.queues[next_stage] if next_stage else None
+
+        def _run() -> None:
+            while not self._stop_event.is_set():
+                try:
+                    trace_id, item = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                try:
+                    # Stages run on different threads; carry the trigger's trace along.
+                    with TRACER.activate(trace_id):
+                        outputs = handler(item)
+                except Exception:
+                    LOGGER.exception("Pipeline stage %s failed", name)
+                    continue
+                if outbox is None:
+                    continue
+                for output in outputs:
+                    outbox.put((trace_id, output))
+
+        return threading.Thread(target=_run, name=f"Pipeline-{name}", daemon=True)
@@ -3,7 +3,9 @@ from __future__ import annotations
 import threading
 import time
 
-from pi4.core.config import MAIN_LOOP_INTERVAL_SEC
+from pi4.core.async_runtime import AsyncOrchestratorRuntime
+from pi4.core.config import (ASYNC_RUNTIME_ENABLED, MAIN_LOOP_INTERVAL_SEC,
+                             SAFETY_PIPELINE_ENABLED)
 from pi4.core.logger import get_logger
 from pi4.core.orchestrator import Orchestrator
 
@@ -13,8 +15,16 @@ LOGGER = get_logger("safety_support")
 class SafetySupportRunner:
     """Minimal runner that keeps safety loops alive in a background thread."""
 
-    def __init__(self, orchestrator: Orchestrator | None = None) -> None:
+    def __init__(
+        self,
+        orchestrator: Orchestrator | None = None,
+        pipelined: bool | None = None,
+        use_asyncio: bool | None = None,
+    ) -> None:
         self._orchestrator = orchestrator or Orchestrator()
+        self._pipelined = SAFETY_PIPELINE_ENABLED if pipelined is None else pipelined
+        self._use_asyncio = ASYNC_RUNTIME_ENABLED if use_asyncio is None else use_asyncio
+        self._runtime: AsyncOrchestratorRuntime | None = None
         self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
         self._lock = threading.Lock()
@@ -29,6 +39,10 @@ class SafetySupportRunner:
             LOGGER.debug("Safety support already running")
             return
         self._stop_event.clear()
+        if self._use_asyncio:
+            self._runtime = AsyncOrchestratorRuntime(self._orchestrator)
+        elif self._pipelined:
+            self._orchestrator.start_pipeline()
         self._thread = threading.Thread(
             target=self._run_loop, name="SafetySupportLoop", daemon=True
         )
@@ -40,15 +54,27 @@ class SafetySupportRunner:
             LOGGER.debug("Safety support already stopped")
             return
         self._stop_event.set()
+        if self._runtime is not None:
+            self._runtime.stop()
         thread = self._thread
         self._thread = None
         if thread is not None:
             thread.join(timeout=2.0)
+        self._runtime = None
+        if self._pipelined and not self._use_asyncio:
+            self._orchestrator.stop_pipeline()
         LOGGER.info("Safety support thread stopped")
 
     def _run_loop(self) -> None:
         LOGGER.info("Safety support loop running")
         try:
+            if self._runtime is not None:
+                self._runtime.run_blocking(duration_sec=float("inf"))
+                return
+            if self._pipelined:
+                # Stages run on their own threads; just keep this one alive.
+                self._stop_event.wait()
+                return
             while not self._stop_event.is_set():
                 with self._lock:
                     self._orchestrator.process_safety_once()
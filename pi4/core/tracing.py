@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import functools
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from pi4.core.config import TRACE_BUFFER_SIZE, TRACE_ENABLED, TRACE_JSONL_PATH
+
+# Span name of the end-to-end metric derived from each trace.
+TRIGGER_TO_SPEECH = "e2e.trigger_to_speech"
+SPEECH_SPAN = "voice.speak"
+
+_current_trace: ContextVar[Optional[str]] = ContextVar("smart_cane_trace_id", default=None)
+_trace_counter = itertools.count(1)
+
+
+@dataclass
+class Span:
+    trace_id: str
+    name: str
+    start_ns: int
+    end_ns: int
+    thread: str
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["duration_ms"] = round(self.duration_ms, 3)
+        return data
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "Span":
+        return cls(
+            trace_id=payload["trace_id"],
+            name=payload["name"],
+            start_ns=int(payload["start_ns"]),
+            end_ns=int(payload["end_ns"]),
+            thread=payload.get("thread", ""),
+        )
+
+
+def stage_percentiles(spans: Iterable[Span]) -> Dict[str, Dict[str, float]]:
+    """Return count / p50 / p95 / p99 (ms) per span name plus trigger-to-speech."""
+    durations: Dict[str, List[float]] = {}
+    trace_start: Dict[str, int] = {}
+    first_speech: Dict[str, int] = {}
+    for span in spans:
+        durations.setdefault(span.name, []).append(span.duration_ms)
+        if span.start_ns < trace_start.get(span.trace_id, span.start_ns + 1):
+            trace_start[span.trace_id] = span.start_ns
+        if span.name == SPEECH_SPAN:
+            if span.start_ns < first_speech.get(span.trace_id, span.start_ns + 1):
+                first_speech[span.trace_id] = span.start_ns
+    e2e = [
+        (speech_ns - trace_start[trace_id]) / 1e6
+        for trace_id, speech_ns in first_speech.items()
+    ]
+    if e2e:
+        durations[TRIGGER_TO_SPEECH] = e2e
+    stats: Dict[str, Dict[str, float]] = {}
+    for name, values in durations.items():
+        p50, p95, p99 = np.percentile(np.asarray(values, dtype=np.float64), [50, 95, 99])
+        stats[name] = {
+            "count": float(len(values)),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+        }
+    return stats
+
+
+def format_report(stats: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'stage':<32} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"]
+    for name in sorted(stats):
+        entry = stats[name]
+        lines.append(
+            f"{name:<32} {int(entry['count']):>6} {entry['p50']:>10.1f} "
+            f"{entry['p95']:>10.1f} {entry['p99']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+class Tracer:
+    """Collects per-trigger spans into a ring buffer and an optional JSONL file."""
+
+    def __init__(
+        self,
+        capacity: int = TRACE_BUFFER_SIZE,
+        sink_path: str | Path | None = TRACE_JSONL_PATH,
+        enabled: bool = TRACE_ENABLED,
+    ) -> None:
+        self.enabled = enabled
+        self._spans: Deque[Span] = deque(maxlen=max(capacity, 1))
+        self._lock = threading.Lock()
+        self._sink_path = Path(sink_path) if sink_path else None
+        self._sink = None
+
+    # -- trace context ----------------------------------------------------
+
+    def start_trace(self) -> str:
+        """Open a new trace and make it current for this thread / task.
+
+        It stays current until the enclosing ``trace()`` block ends.
+        """
+        trace_id = f"{time.time_ns():x}-{next(_trace_counter)}"
+        _current_trace.set(trace_id)
+        return trace_id
+
+    def current_trace_id(self) -> Optional[str]:
+        return _current_trace.get()
+
+    @contextmanager
+    def trace(self) -> Iterator[None]:
+        """Scope of one trigger: a trace started inside ends with the block."""
+        token = _current_trace.set(None)
+        try:
+            yield
+        finally:
+            _current_trace.reset(token)
+
+    @contextmanager
+    def activate(self, trace_id: Optional[str]) -> Iterator[None]:
+        """Temporarily make ``trace_id`` current (used when crossing threads)."""
+        token = _current_trace.set(trace_id)
+        try:
+            yield
+        finally:
+            _current_trace.reset(token)
+
+    # -- recording --------------------------------------------------------
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a span of the current trace, if any."""
+        trace_id = _current_trace.get()
+        if not self.enabled or trace_id is None:
+            yield
+            return
+        start_ns = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start_ns, time.monotonic_ns(), trace_id)
+
+    def record(
+        self, name: str, start_ns: int, end_ns: int, trace_id: Optional[str] = None
+    ) -> None:
+        trace_id = trace_id or _current_trace.get()
+        if not self.enabled or trace_id is None:
+            return
+        span = Span(
+            trace_id=trace_id,
+            name=name,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            thread=threading.current_thread().name,
+        )
+        with self._lock:
+            self._spans.append(span)
+            if self._sink_path is not None:
+                self._write_sink(span)
+
+    def _write_sink(self, span: Span) -> None:
+        if self._sink is None:
+            self._sink_path.parent.mkdir(parents=True, exist_ok=True)
+            self._sink = open(self._sink_path, "a", encoding="utf-8", buffering=1)
+        self._sink.write(json.dumps(span.to_dict(), separators=(",", ":")) + "\n")
+
+    # -- queries ----------------------------------------------------------
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            snapshot = list(self._spans)
+        if trace_id is None:
+            return snapshot
+        return [span for span in snapshot if span.trace_id == trace_id]
+
+    def stage_stats(self) -> Dict[str, Dict[str, float]]:
+        return stage_percentiles(self.spans())
+
+    def report(self) -> str:
+        return format_report(self.stage_stats())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._sink is not None:
+                self._sink.close()
+                self._sink = None
+
+
+TRACER = Tracer()
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator recording each call as a span of the current trace."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def load_jsonl(path: str | Path) -> List[Span]:
+    """Read spans written by a tracer JSONL sink."""
+    spans: List[Span] = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                spans.append(Span.from_dict(json.loads(line)))
+    return spans
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Union
 
 import requests
 
@@ -10,8 +10,10 @@ from pi4.core.config import (
     OLLAMA_MODEL,
     OLLAMA_REWRITE_TIMEOUT_SEC,
 )
+from pi4.core.event_batch import EventBatch
 from pi4.core.event_schema import Event
 from pi4.core.logger import get_logger
+from pi4.core.tracing import traced
 
 LOGGER = get_logger("understanding_ollama_client")
 
@@ -102,19 +104,22 @@ def _is_model_available() -> bool:
     return False
 
 
-def summarize_events(events: Iterable[Event]) -> str:
+def summarize_events(events: Union[Iterable[Event], EventBatch]) -> str:
     """Summarize danger events into a concise Chinese message."""
     if not OLLAMA_ENABLED or not _is_model_available():
         return ""
+    batch = events if isinstance(events, EventBatch) else EventBatch.from_events(events)
     items: list[str] = []
-    for event in events:
-        items.append(f"{event.type}@{event.source} ({event.severity})")
+    for (event_type, source, severity), count in batch.count_by("type", "source", "severity"):
+        suffix = f" x{count}" if count > 1 else ""
+        items.append(f"{event_type}@{source} ({severity}){suffix}")
     if not items:
         return ""
     meta = f"{OLLAMA_BASE_URL}/{_ACTIVE_MODEL or OLLAMA_MODEL}"
     return f"Ollama summary [{meta}]: " + "；".join(items)
 
 
+@traced("ollama.rewrite_voice_text")
 def rewrite_voice_text(events: Iterable[Event], original_text: str) -> tuple[str, bool]:
     """Use Ollama to rewrite safety text into a friendly voice copy."""
     if not OLLAMA_ENABLED or not _is_model_available():
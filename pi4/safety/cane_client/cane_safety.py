@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import uuid
-from datetime import datetime, timezone
 from typing import List
 
 from pi4.core.config import (DROP_MAX_DISTANCE_M, DROP_MIN_DISTANCE_M,
@@ -28,9 +26,7 @@ def eval_distance(distance_m: float) -> List[Event]:
     else:
         return []
     return [
-        Event(
-            event_id=str(uuid.uuid4()),
-            ts=datetime.now(timezone.utc),
+        Event.new(
             type=event_type,
             source="tof",
             severity=severity,
@@ -0,0 +1,176 @@
+"""Wire formats between the Pico ToF firmware and the Pi.
+
+The Pico boots speaking JSON lines.  After the Pi asks for ``bin1`` (see
+``mode_command``) it acknowledges with a JSON line and switches readings
+to fixed 14-byte little-endian frames::
+
+    offset  size  field
+    0       2     sync  A5 5A
+    2       1     kind  (KIND_TOF / KIND_TRIGGER)
+    3       1     flags (reserved, 0)
+    4       2     seq   (u16, wraps)
+    6       4     ts    (Pico ticks_ms, u32)
+    10      2     d_mm  (u16)
+    12      2     crc   CRC-16/CCITT-FALSE over bytes 2..11
+
+Status messages stay JSON in both modes.  ASCII never contains 0xA5, so
+one decoder handles a stream mixing both and old JSON-only firmware
+keeps working.  ``pico_firmware/src/tof_frame.py`` is the encoder side.
+"""
+
+from __future__ import annotations
+
+import binascii
+import json
+import struct
+from typing import List, Optional, Tuple
+
+KIND_TOF = 0
+KIND_TRIGGER = 1
+
+SYNC = b"\xa5\x5a"
+FRAME = struct.Struct("<2sBBHIHH")
+FRAME_SIZE = FRAME.size
+_BODY = struct.Struct("<BBHIH")
+_CRC_INIT = 0xFFFF
+_SYNC_FIRST = SYNC[0]
+# Longest JSON line kept while waiting for its newline; anything longer is noise.
+_MAX_LINE_BYTES = 512
+
+MODE_JSON = "json"
+MODE_BINARY = "bin1"
+
+# (pico_ts, d_mm, kind)
+Reading = Tuple[int, int, int]
+
+
+def crc16(data: bytes) -> int:
+    return binascii.crc_hqx(data, _CRC_INIT)
+
+
+def encode_frame(kind: int, seq: int, ts_ms: int, d_mm: int, flags: int = 0) -> bytes:
+    body = _BODY.pack(kind, flags, seq & 0xFFFF, ts_ms & 0xFFFFFFFF, max(min(d_mm, 0xFFFF), 0))
+    return SYNC + body + struct.pack("<H", crc16(body))
+
+
+def mode_command(mode: str) -> bytes:
+    """Line the Pi writes to ask the firmware for ``mode``."""
+    return json.dumps({"cmd": "proto", "mode": mode}).encode("ascii") + b"\n"
+
+
+def parse_line(line: bytes) -> Optional[Reading]:
+    """``(pico_ts, d_mm, kind)`` for a JSON reading line, None for anything else.
+
+    Readings with values that are not numbers (``"d_mm": "abc"``, ``null``,
+    ``1e400``) are None too.
+    """
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    d_mm = data.get("d_mm")
+    if d_mm is None:
+        return None
+    if data.get("event") == "trigger":
+        kind = KIND_TRIGGER
+    elif data.get("type") == "tof":
+        kind = KIND_TOF
+    else:
+        return None
+    try:
+        return int(data.get("ts", -1)), int(d_mm), kind
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class StreamDecoder:
+    """Incremental decoder for a serial stream of JSON lines and binary frames.
+
+    ``feed`` takes whatever bulk read returned and decodes frames in place
+    with ``struct.unpack_from`` over a ``memoryview``; only the undecoded
+    tail is kept for the next call.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.mode = MODE_JSON
+        self.frames = 0
+        self.lines = 0
+        self.crc_errors = 0
+        self.bad_lines = 0
+        self.lost_frames = 0
+        self._last_seq: Optional[int] = None
+
+    def reset(self) -> None:
+        """Forget partial input, e.g. after the port was reopened."""
+        self._buffer.clear()
+        self._last_seq = None
+
+    def feed(self, chunk: bytes) -> List[Reading]:
+        self._buffer += chunk
+        readings: List[Reading] = []
+        buffer = self._buffer
+        size = len(buffer)
+        pos = 0
+        with memoryview(buffer) as view:
+            while pos < size:
+                if buffer[pos] == _SYNC_FIRST:
+                    if size - pos < FRAME_SIZE:
+                        break
+                    sync, kind, _flags, seq, ts, d_mm, crc = FRAME.unpack_from(view, pos)
+                    if sync != SYNC or crc16(view[pos + 2 : pos + 12]) != crc:
+                        # Not a frame start (or corrupted): resync one byte later.
+                        self.crc_errors += 1
+                        pos += 1
+                        continue
+                    self._track_seq(seq)
+                    self.frames += 1
+                    readings.append((ts, d_mm, kind))
+                    pos += FRAME_SIZE
+                    continue
+                newline = buffer.find(b"\n", pos)
+                sync_at = buffer.find(SYNC, pos)
+                if newline < 0 or (0 <= sync_at < newline):
+                    if sync_at < 0:
+                        if size - pos > _MAX_LINE_BYTES:
+                            pos = size
+                        break
+                    if sync_at > pos:
+                        self.bad_lines += 1
+                    pos = sync_at
+                    continue
+                line = bytes(view[pos:newline])
+                pos = newline + 1
+                if line.strip():
+                    self._handle_line(line, readings)
+        del buffer[:pos]
+        return readings
+
+    def _handle_line(self, line: bytes, readings: List[Reading]) -> None:
+        reading = parse_line(line)
+        if reading is not None:
+            self.lines += 1
+            readings.append(reading)
+            return
+        try:
+            data = json.loads(line)
+        except ValueError:
+            self.bad_lines += 1
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("event") == "proto":
+            self.mode = str(data.get("mode", MODE_JSON))
+            self._last_seq = None
+        elif data.get("d_mm") is not None:
+            # A reading whose values did not parse.
+            self.bad_lines += 1
+
+    def _track_seq(self, seq: int) -> None:
+        if self._last_seq is not None:
+            gap = (seq - self._last_seq - 1) & 0xFFFF
+            if gap < 0x8000:
+                self.lost_frames += gap
+        self._last_seq = seq
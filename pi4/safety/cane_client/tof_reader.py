@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+import serial
+
+from pi4.core.config import (
+    TOF_BAUDRATE,
+    TOF_PROTOCOL,
+    TOF_RECONNECT_MAX_SEC,
+    TOF_RECONNECT_MIN_SEC,
+    TOF_RING_SIZE,
+    TOF_SERIAL_PORT,
+    TRIGGER_DISTANCE_MM,
+)
+from pi4.core.logger import get_logger
+from pi4.safety.cane_client.tof_protocol import (KIND_TOF, KIND_TRIGGER,
+                                                 MODE_BINARY, MODE_JSON,
+                                                 StreamDecoder, mode_command)
+
+logger = get_logger("tof_reader")
+
+RECORD_DTYPE = np.dtype(
+    [("pico_ts", np.int64), ("host_ns", np.int64), ("d_mm", np.int32), ("kind", np.int8)]
+)
+
+
+class TofRecord(NamedTuple):
+    pico_ts: int  # Pico ticks_ms, -1 if the line had none
+    host_ns: int  # time.monotonic_ns() when the bytes arrived
+    d_mm: int
+    kind: int
+
+
+def _is_trigger(d_mm: np.ndarray, kind: np.ndarray) -> np.ndarray:
+    # Periodic readings inside the trigger range count too (8191 = out of range).
+    return (kind == KIND_TRIGGER) | ((d_mm > 0) & (d_mm < TRIGGER_DISTANCE_MM))
+
+
+class TofReader:
+    """Owns the ToF serial port on a background thread.
+
+    Readings (JSON lines or binary frames, see ``tof_protocol``) are decoded
+    as they arrive into a preallocated ring of ``RECORD_DTYPE`` records, so no reading is lost between polls and
+    parsing never runs on the safety loop.  When the port disappears the
+    reader reopens it with exponential backoff.  ``notify_fileno`` becomes
+    readable whenever a new trigger is recorded.
+    """
+
+    def __init__(
+        self,
+        port: str = TOF_SERIAL_PORT,
+        baudrate: int = TOF_BAUDRATE,
+        capacity: int = TOF_RING_SIZE,
+        opener: Callable[..., "serial.Serial"] = serial.Serial,
+        backoff_min_sec: float = TOF_RECONNECT_MIN_SEC,
+        backoff_max_sec: float = TOF_RECONNECT_MAX_SEC,
+        protocol: str = TOF_PROTOCOL,
+    ) -> None:
+        if protocol not in ("binary", "json"):
+            raise ValueError(f"Invalid ToF protocol: {protocol}")
+        self.port = port
+        self.baudrate = baudrate
+        self.backoff_min_sec = backoff_min_sec
+        self.backoff_max_sec = backoff_max_sec
+        self._opener = opener
+        self._mode = MODE_BINARY if protocol == "binary" else MODE_JSON
+        self.decoder = StreamDecoder()
+        self._ring = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self._count = 0
+        self._taken_ns = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.connected = False
+        self.reconnects = 0
+        self._notify_r, self._notify_w = (os.pipe() if os.name == "posix" else (None, None))
+        if self._notify_r is not None:
+            os.set_blocking(self._notify_r, False)
+            os.set_blocking(self._notify_w, False)
+
+    # -- lifecycle ----------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TofReader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify_fileno(self) -> Optional[int]:
+        """Descriptor that is readable while an untaken trigger is pending (POSIX only)."""
+        return self._notify_r
+
+    # -- queries ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._ring))
+
+    def window(self, since_ns: int = 0) -> np.ndarray:
+        """Copy of the records that arrived at or after ``since_ns``, oldest first."""
+        with self._lock:
+            records = self._ordered()
+        return records[records["host_ns"] >= since_ns]
+
+    def latest_trigger(self) -> Optional[TofRecord]:
+        """Newest trigger still in the ring, taken or not."""
+        with self._lock:
+            return self._newest_trigger(0)
+
+    def take_trigger(self) -> Optional[TofRecord]:
+        """Newest trigger that arrived since the previous ``take_trigger``, if any."""
+        self._drain_notify()
+        with self._lock:
+            record = self._newest_trigger(self._taken_ns + 1)
+            if record is not None:
+                self._taken_ns = record.host_ns
+            return record
+
+    def _ordered(self) -> np.ndarray:
+        capacity = len(self._ring)
+        if self._count <= capacity:
+            return self._ring[: self._count].copy()
+        head = self._count % capacity
+        return np.concatenate([self._ring[head:], self._ring[:head]])
+
+    def _newest_trigger(self, since_ns: int) -> Optional[TofRecord]:
+        filled = len(self)
+        if not filled:
+            return None
+        ring = self._ring[:filled]
+        hits = np.flatnonzero(_is_trigger(ring["d_mm"], ring["kind"]) & (ring["host_ns"] >= since_ns))
+        if not len(hits):
+            return None
+        # Arrival rank of each slot: the most recently written slot ranks highest.
+        rank = (hits - self._count) % len(self._ring)
+        row = ring[hits[np.argmax(rank)]]
+        return TofRecord(int(row["pico_ts"]), int(row["host_ns"]), int(row["d_mm"]), int(row["kind"]))
+
+    # -- reader thread ------------------------------------------------------
+
+    @property
+    def bad_lines(self) -> int:
+        return self.decoder.bad_lines
+
+    def feed(self, chunk: bytes, host_ns: int | None = None) -> int:
+        """Decode a chunk of serial bytes; returns how many records were stored."""
+        host_ns = time.monotonic_ns() if host_ns is None else host_ns
+        parsed = self.decoder.feed(chunk)
+        if not parsed:
+            return 0
+        triggered = False
+        with self._lock:
+            capacity = len(self._ring)
+            for pico_ts, d_mm, kind in parsed:
+                self._ring[self._count % capacity] = (pico_ts, host_ns, d_mm, kind)
+                self._count += 1
+                triggered = triggered or kind == KIND_TRIGGER or 0 < d_mm < TRIGGER_DISTANCE_MM
+        if triggered:
+            self._notify()
+        return len(parsed)
+
+    def _notify(self) -> None:
+        if self._notify_w is not None:
+            try:
+                os.write(self._notify_w, b"\x01")
+            except BlockingIOError:
+                pass  # already readable
+
+    def _drain_notify(self) -> None:
+        if self._notify_r is None:
+            return
+        try:
+            while os.read(self._notify_r, 64):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _open(self) -> Optional["serial.Serial"]:
+        try:
+            port = self._opener(self.port, self.baudrate, timeout=0.05)
+            port.reset_input_buffer()
+            # Firmware without binary support ignores this and keeps sending JSON.
+            port.write(mode_command(self._mode))
+        except (serial.SerialException, OSError, ValueError) as error:
+            logger.debug("ToF serial port %s unavailable: %s", self.port, error)
+            return None
+        except Exception:
+            logger.exception("Opening ToF serial port %s failed", self.port)
+            return None
+        logger.info("Opened ToF serial port: %s", self.port)
+        return port
+
+    def _run(self) -> None:
+        backoff = self.backoff_min_sec
+        while not self._stop.is_set():
+            port = self._open()
+            if port is None:
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(backoff * 2, self.backoff_max_sec)
+                continue
+            self.connected = True
+            backoff = self.backoff_min_sec
+            self.decoder.reset()
+            try:
+                while not self._stop.is_set():
+                    # Blocks for at most the port timeout, then takes whatever is buffered.
+                    chunk = port.read(max(port.in_waiting, 1))
+                    if chunk:
+                        self.feed(chunk)
+            except (serial.SerialException, OSError) as error:
+                logger.warning("ToF serial port lost (%s); reconnecting", error)
+                self.reconnects += 1
+            except Exception:
+                # Never let one bad chunk end the reader for good.
+                logger.exception("ToF reader failed; reconnecting")
+                self.reconnects += 1
+            finally:
+                self.connected = False
+                try:
+                    port.close()
+                except Exception:
+                    pass
@@ -1,79 +1,63 @@
 from __future__ import annotations
 
-import json
+import threading
 import time
 from typing import Optional
 
-import serial
-from pi4.core.config import TOF_BAUDRATE, TOF_SERIAL_PORT, USE_SIMULATED_SENSORS, TRIGGER_DISTANCE_MM
+from pi4.core.config import USE_SIMULATED_SENSORS
 from pi4.core.logger import get_logger
+from pi4.core.tracing import TRACER
 from pi4.safety.cane_client import tof_receiver_sim
+from pi4.safety.cane_client.tof_reader import KIND_TRIGGER, TofReader
 
 logger = get_logger("tof_receiver")
 
-_serial_port: serial.Serial | None = None
+_reader: TofReader | None = None
+_reader_lock = threading.Lock()
+
+
+def get_reader() -> TofReader:
+    """The shared background serial reader, started on first use."""
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = TofReader()
+            _reader.start()
+        return _reader
+
+
+def serial_fileno() -> Optional[int]:
+    """Return a descriptor that turns readable when a ToF trigger arrives, if any."""
+    if USE_SIMULATED_SENSORS:
+        return None
+    # Windows has no selectable descriptor; callers fall back to polling.
+    return get_reader().notify_fileno()
+
+
+def _start_trigger_trace(arrival_ns: int) -> None:
+    """Open a latency trace for a trigger whose serial line arrived at arrival_ns."""
+    TRACER.start_trace()
+    TRACER.record("tof.serial", arrival_ns, time.monotonic_ns())
 
-def _init_serial() -> None:
-    global _serial_port
-    if _serial_port is not None:
-        return
-    try:
-        _serial_port = serial.Serial(TOF_SERIAL_PORT, TOF_BAUDRATE, timeout=0.05)
-        _serial_port.reset_input_buffer()
-        logger.info(f"Opened ToF serial port: {TOF_SERIAL_PORT}")
-    except Exception as e:
-        logger.error(f"Failed to open ToF serial port: {e}")
 
 def read_latest_distance() -> Optional[float]:
     """
-    Return the most recent ToF reading, in meters.
-    For event-triggered logic, this might return None if no trigger received.
+    Return the most recent ToF trigger distance, in meters.
+    Returns None if no trigger arrived since the previous call.
     """
     if USE_SIMULATED_SENSORS:
-        return tof_receiver_sim.read_latest_distance()
-    
-    _init_serial()
-    if _serial_port is None:
+        arrival_ns = time.monotonic_ns()
+        distance = tof_receiver_sim.read_latest_distance()
+        if distance is not None:
+            _start_trigger_trace(arrival_ns)
+        return distance
+
+    record = get_reader().take_trigger()
+    if record is None:
         return None
-
-    # Read all available lines, keep the last valid trigger
-    last_valid_dist = None
-    
-    while _serial_port.in_waiting > 0:
-        try:
-            line = _serial_port.readline()
-            if not line:
-                continue
-            text = line.decode("utf-8", errors="ignore").strip()
-            if not text:
-                continue
-            
-            # Parse JSON
-            try:
-                data = json.loads(text)
-                
-                # Check for explicit trigger event
-                if data.get("event") == "trigger":
-                    d_mm = data.get("d_mm")
-                    if d_mm is not None:
-                        last_valid_dist = float(d_mm) / 1000.0
-                        logger.info(f"ToF Trigger received: {d_mm} mm")
-                
-                # Check for periodic 'tof' message but validation against distance threshold
-                elif data.get("type") == "tof":
-                    d_mm = data.get("d_mm")
-                    if d_mm is not None:
-                        # Only treat as trigger if within range (and not max value 8191)
-                        if 0 < d_mm < TRIGGER_DISTANCE_MM:
-                             last_valid_dist = float(d_mm) / 1000.0
-                             logger.info(f"ToF Raw Trigger (valid distance): {d_mm} mm")
-
-            except json.JSONDecodeError:
-                pass
-            except json.JSONDecodeError:
-                pass
-                
-        except Exception as e:
-            logger.error(f"Error reading from serial: {e}")
-            
-    return last_valid_dist
+    if record.kind == KIND_TRIGGER:
+        logger.info(f"ToF Trigger received: {record.d_mm} mm")
+    else:
+        logger.info(f"ToF Raw Trigger (valid distance): {record.d_mm} mm")
+    _start_trigger_trace(record.host_ns)
+    return record.d_mm / 1000.0
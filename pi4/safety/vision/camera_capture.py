@@ -1,39 +1,103 @@
 from __future__ import annotations
 
-from pi4.core.config import PLATFORM, USE_SIMULATED_SENSORS
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+from pi4.core.config import (CAMERA_GRABBER_ENABLED, INCIDENT_RING_ENABLED,
+                             PLATFORM, USE_SIMULATED_SENSORS)
+from pi4.core.event_schema import Event
 from pi4.core.logger import get_logger
+from pi4.core.tracing import TRACER
 from pi4.safety.vision import camera_capture_pi, camera_capture_sim
-from pi4.safety.vision.frame_storage import latest_frame_name, save_frame
+from pi4.safety.vision.frame_storage import (latest_frame_name, note_events,
+                                             record_incident_frame, save_frame)
 
 LOGGER = get_logger("camera_capture")
 _frame_source: str = "simulation"
+_ring_fallback_logged = False
+
+
+@dataclass
+class CapturedFrame:
+    """A frame, its capture time and the file name it is saved under.
+
+    ``timestamp`` is ``time.monotonic()`` seconds (for tracking) and
+    ``wall_time`` is ``time.time()`` (for file names).  ``name`` stays None
+    until the save policy decides to keep the frame.
+    """
+
+    image: "Frame"
+    timestamp: float
+    wall_time: float
+    name: Optional[str] = None
+
+
+def capture() -> CapturedFrame:
+    """Grab a frame and offer it to frame storage."""
+    with TRACER.span("camera.get_frame"):
+        frame, timestamp = _acquire_frame()
+    wall_time = time.time()
+    if _frame_source != "hardware" or not CAMERA_GRABBER_ENABLED:
+        _feed_incident_ring(frame, wall_time)
+    return CapturedFrame(frame, timestamp, wall_time, save_frame(frame, wall_time))
+
+
+def _feed_incident_ring(frame: "Frame", wall_time: float) -> None:
+    """Stand in for the Pi frame grabber, which otherwise feeds the ring."""
+    global _ring_fallback_logged
+    if INCIDENT_RING_ENABLED and not _ring_fallback_logged:
+        _ring_fallback_logged = True
+        LOGGER.info(
+            "Camera grabber not in use (%s source); incident clips only hold trigger captures.",
+            _frame_source,
+        )
+    record_incident_frame(frame, wall_time)
 
 
 def get_frame() -> "Frame":
     """Return a video frame depending on platform and simulation config."""
+    return capture().image
+
+
+def get_frame_with_timestamp() -> Tuple["Frame", float]:
+    """Like `get_frame`, plus the capture time in ``time.monotonic()`` seconds."""
+    captured = capture()
+    return captured.image, captured.timestamp
+
+
+def _acquire_frame() -> Tuple["Frame", float]:
     global _frame_source
     if not USE_SIMULATED_SENSORS:
         try:
-            frame = camera_capture_pi.get_frame()
+            frame, stamp_ns = camera_capture_pi.get_frame_with_timestamp()
             _frame_source = "hardware"
+            return frame, stamp_ns / 1e9
         except Exception as error:
             LOGGER.warning(
                 "Hardware capture unavailable (%s), falling back to simulation.",
                 error,
             )
-            frame = camera_capture_sim.get_frame()
-            _frame_source = "simulation"
-    else:
-        frame = camera_capture_sim.get_frame()
-        _frame_source = "simulation"
-    save_frame(frame)
-    return frame
+    frame = camera_capture_sim.get_frame()
+    _frame_source = "simulation"
+    return frame, time.monotonic()
 
 
 def get_latest_image_name() -> str | None:
     return latest_frame_name()
 
 
+def report_events(events: Iterable[Event], captured: CapturedFrame) -> str | None:
+    """Pass the events found in ``captured`` on to frame storage.
+
+    Returns the name the frame is saved under, if it is saved at all.
+    """
+    name = note_events(events, captured.image, captured.wall_time)
+    if name is not None:
+        captured.name = name
+    return captured.name
+
+
 def last_frame_source() -> str:
     """Return the source of the most recently captured frame."""
     return _frame_source
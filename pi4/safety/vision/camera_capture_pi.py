@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import atexit
 import platform
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
-from pi4.core.config import CAMERA_DEVICE_INDEX
+from pi4.core.config import (
+    CAMERA_DEVICE_INDEX,
+    CAMERA_GRABBER_ENABLED,
+    CAMERA_MAX_FRAME_AGE_SEC,
+    CAMERA_RING_SLOTS,
+)
 from pi4.core.logger import get_logger
+from pi4.safety.vision import frame_storage
 
 logger = get_logger("camera_capture_pi")
 _capture: cv2.VideoCapture | None = None
@@ -67,8 +79,202 @@ def _ensure_capture() -> cv2.VideoCapture:
     return _capture
 
 
+class FrameGrabber:
+    """Keeps draining a capture device into a small preallocated frame ring.
+
+    ``latest`` returns the newest frame and its capture time without copying.
+    Frames handed out are leased: the grabber never reads into a leased slot
+    or the newest one, so a frame stays intact while detection and storage
+    use it.  The ``slots - 2`` most recent frames returned by ``latest`` stay
+    leased; ``lease()`` pins a frame only for the duration of a block.
+    ``on_frame(frame, stamp_ns)`` runs on the grabber thread for every
+    frame read, while that frame is still the newest one.
+    """
+
+    def __init__(
+        self,
+        capture: cv2.VideoCapture,
+        slots: int = CAMERA_RING_SLOTS,
+        reopen: Callable[[], cv2.VideoCapture] | None = None,
+        on_frame: Callable[[np.ndarray, int], None] | None = None,
+    ) -> None:
+        if slots < 3:
+            raise ValueError("FrameGrabber needs at least 3 slots")
+        self._capture = capture
+        self._reopen = reopen
+        self._on_frame = on_frame
+        self._buffers: List[Optional[np.ndarray]] = [None] * slots
+        self._stamps = [0] * slots
+        self._pins = [0] * slots
+        self._leased: Deque[int] = deque()
+        self._max_leases = slots - 2
+        self._newest = -1
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.frames = 0
+        self.skipped = 0
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(
+        self, max_age_sec: float | None = CAMERA_MAX_FRAME_AGE_SEC, timeout: float = 1.0
+    ) -> Tuple[np.ndarray, int]:
+        """Newest frame and its ``time.monotonic_ns()`` capture stamp.
+
+        Waits up to ``timeout`` for a frame younger than ``max_age_sec``.
+        """
+        with self._cond:
+            slot = self._wait_fresh(max_age_sec, timeout)
+            self._pins[slot] += 1
+            self._leased.append(slot)
+            if len(self._leased) > self._max_leases:
+                self._pins[self._leased.popleft()] -= 1
+            return self._buffers[slot], self._stamps[slot]
+
+    @contextmanager
+    def lease(
+        self, max_age_sec: float | None = CAMERA_MAX_FRAME_AGE_SEC, timeout: float = 1.0
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        with self._cond:
+            slot = self._wait_fresh(max_age_sec, timeout)
+            self._pins[slot] += 1
+            frame, stamp = self._buffers[slot], self._stamps[slot]
+        try:
+            yield frame, stamp
+        finally:
+            with self._cond:
+                self._pins[slot] -= 1
+
+    def _wait_fresh(self, max_age_sec: float | None, timeout: float) -> int:
+        deadline = time.monotonic() + timeout
+        while True:
+            slot = self._newest
+            if slot >= 0 and (
+                max_age_sec is None
+                or time.monotonic_ns() - self._stamps[slot] <= max_age_sec * 1e9
+            ):
+                return slot
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("no fresh camera frame")
+            self._cond.wait(remaining)
+
+    def _free_slot(self) -> int:
+        count = len(self._buffers)
+        for step in range(1, count + 1):
+            slot = (self._newest + step) % count
+            if slot != self._newest and self._pins[slot] == 0:
+                return slot
+        return -1
+
+    def _run(self) -> None:
+        consecutive_failures = 0
+        while not self._stop.is_set():
+            with self._cond:
+                slot = self._free_slot()
+            if slot < 0:
+                # Every slot is in use: keep the driver queue drained without decoding.
+                self._capture.grab()
+                self.skipped += 1
+                continue
+            buffer = self._buffers[slot]
+            if buffer is None:
+                ok, frame = self._capture.read()
+            else:
+                ok, frame = self._capture.read(buffer)
+            stamp = time.monotonic_ns()
+            if not ok or frame is None:
+                self.failures += 1
+                consecutive_failures += 1
+                if consecutive_failures >= 10 and self._reopen is not None:
+                    consecutive_failures = 0
+                    self._reopen_capture()
+                self._stop.wait(0.01)
+                continue
+            consecutive_failures = 0
+            with self._cond:
+                self._buffers[slot] = frame
+                self._stamps[slot] = stamp
+                self._newest = slot
+                self.frames += 1
+                self._cond.notify_all()
+            if self._on_frame is not None:
+                try:
+                    self._on_frame(frame, stamp)
+                except Exception:
+                    logger.exception("Frame callback failed")
+
+    def _reopen_capture(self) -> None:
+        logger.warning("Camera reads keep failing; reopening device")
+        try:
+            self._capture = self._reopen()
+        except Exception as error:
+            logger.error("Camera reopen failed: %s", error)
+            self._stop.wait(1.0)
+
+
+_grabber: FrameGrabber | None = None
+_grabber_lock = threading.Lock()
+
+
+def _reopen_capture() -> cv2.VideoCapture:
+    global _capture
+    if _capture is not None:
+        _capture.release()
+    _capture = None
+    return _ensure_capture()
+
+
+def _record_incident_frame(frame: np.ndarray, stamp_ns: int) -> None:
+    # Every grabbed frame goes into the pre-trigger ring, not only trigger captures.
+    frame_storage.record_incident_frame(frame)
+
+
+def _ensure_grabber() -> FrameGrabber:
+    global _grabber
+    with _grabber_lock:
+        if _grabber is None:
+            cap = _ensure_capture()
+            buffer_size = getattr(cv2, "CAP_PROP_BUFFERSIZE", None)
+            if buffer_size is not None:
+                cap.set(buffer_size, 1)
+            _grabber = FrameGrabber(cap, reopen=_reopen_capture, on_frame=_record_incident_frame)
+            atexit.register(_grabber.stop)
+        _grabber.start()
+        return _grabber
+
+
+def get_frame_with_timestamp() -> Tuple["np.ndarray", int]:
+    """Newest frame plus its ``time.monotonic_ns()`` capture time."""
+    if not CAMERA_GRABBER_ENABLED:
+        frame = _read_frame()
+        return frame, time.monotonic_ns()
+    return _ensure_grabber().latest()
+
+
 def get_frame() -> "np.ndarray":
     """Capture a frame from Pi4 camera; raises if unavailable."""
+    return get_frame_with_timestamp()[0]
+
+
+def _read_frame() -> "np.ndarray":
     cap = _ensure_capture()
     ret, frame = cap.read()
     if not ret or frame is None:
@@ -1,24 +1,221 @@
 from __future__ import annotations
 
+import atexit
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Optional, Tuple
 
 import numpy as np
 
-from pi4.core.config import SIM_VIDEO_PATH
+from pi4.core.bounded_queue import BoundedQueue
+from pi4.core.config import (
+    SIM_PREFETCH_FRAMES,
+    SIM_VIDEO_LOOP,
+    SIM_VIDEO_PACING,
+    SIM_VIDEO_PATH,
+)
+from pi4.core.logger import get_logger
+
+try:
+    import cv2
+except ImportError:  # pragma: no cover - depends on the platform
+    cv2 = None
+
+LOGGER = get_logger("camera_capture_sim")
+_DEFAULT_FPS = 30.0
+_VALID_PACING = ("realtime", "fast")
+
+
+def _placeholder() -> "np.ndarray":
+    return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+class SimulatedVideoSource:
+    """Streams a video file like a live camera.
+
+    One decoder stays open and a background thread reads ahead into a
+    prefetch buffer, looping at the end of the file.  With ``realtime``
+    pacing frames are released at the video's FPS and ``read`` returns the
+    newest one, dropping any the caller was too slow for; with ``fast``
+    pacing every frame is delivered in order as quickly as it decodes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        pacing: str = SIM_VIDEO_PACING,
+        loop: bool = SIM_VIDEO_LOOP,
+        prefetch: int = SIM_PREFETCH_FRAMES,
+        fps: float | None = None,
+    ) -> None:
+        if pacing not in _VALID_PACING:
+            raise ValueError(f"Invalid pacing: {pacing}")
+        if cv2 is None:
+            raise RuntimeError("OpenCV is not installed")
+        self.path = Path(path)
+        self.pacing = pacing
+        self.loop = loop
+        self._capture = cv2.VideoCapture(str(self.path))
+        if not self._capture.isOpened():
+            raise RuntimeError(f"Cannot open video {self.path}")
+        reported = self._capture.get(cv2.CAP_PROP_FPS) or 0.0
+        self.fps = float(fps or (reported if reported > 0 else _DEFAULT_FPS))
+        self.frame_count = int(self._capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self._buffer = BoundedQueue(
+            max(prefetch, 1), "drop_oldest" if pacing == "realtime" else "block"
+        )
+        self._lock = threading.Lock()
+        self._seek_to: Optional[float] = None
+        # Bumped on every seek so frames decoded before it are discarded.
+        self._generation = 0
+        self._position = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.frames = 0
+        self.loops = 0
+
+    @property
+    def duration_sec(self) -> float:
+        return self.frame_count / self.fps if self.frame_count else 0.0
+
+    @property
+    def position_sec(self) -> float:
+        """Video timestamp of the last frame handed out by ``read``."""
+        return self._position
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="SimulatedVideoSource", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        self._buffer.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._capture.release()
+
+    def seek(self, seconds: float) -> None:
+        """Continue from ``seconds`` into the video; prefetched frames are discarded."""
+        with self._lock:
+            self._seek_to = max(float(seconds), 0.0)
+            self._generation += 1
+        self._buffer.clear()
+
+    def read(self, timeout: float = 1.0) -> Tuple["np.ndarray", float]:
+        """Next frame and its video timestamp in seconds.
+
+        Raises ``RuntimeError`` if none arrives within ``timeout`` or the
+        video ended without looping.
+        """
+        if not self.running:
+            self.start()
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if self.pacing == "realtime":
+                    item = self._buffer.get_batch(self._buffer.maxsize, max(remaining, 0.0))[-1]
+                else:
+                    item = self._buffer.get(max(remaining, 0.0))
+            except queue.Empty:
+                raise RuntimeError("no simulated frame available") from None
+            generation, frame, position = item
+            if generation == self._generation:
+                self._position = position
+                return frame, position
+
+    def get_frame(self, timeout: float = 1.0) -> "np.ndarray":
+        return self.read(timeout)[0]
+
+    def _decode(self) -> Tuple[bool, Optional["np.ndarray"], float]:
+        # POS_MSEC lags a frame behind on some backends; the frame index does not.
+        position = self._capture.get(cv2.CAP_PROP_POS_FRAMES) / self.fps
+        ok, frame = self._capture.read()
+        return ok and frame is not None, frame, position
+
+    def _run(self) -> None:
+        # Pacing anchor: wall time at which video time ``anchor_pos`` is due.
+        anchor_wall = time.monotonic()
+        anchor_pos: Optional[float] = None
+        while not self._stop.is_set():
+            with self._lock:
+                seek_to, self._seek_to = self._seek_to, None
+                generation = self._generation
+            if seek_to is not None:
+                self._capture.set(cv2.CAP_PROP_POS_MSEC, seek_to * 1000.0)
+                anchor_pos = None
+            ok, frame, position = self._decode()
+            if not ok:
+                if not self.loop:
+                    self._buffer.close()
+                    return
+                self.loops += 1
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                anchor_pos = None
+                continue
+            if self.pacing == "realtime":
+                if anchor_pos is None or position < anchor_pos:
+                    anchor_wall, anchor_pos = time.monotonic(), position
+                due = anchor_wall + (position - anchor_pos)
+                if self._stop.wait(max(due - time.monotonic(), 0.0)):
+                    return
+            if generation != self._generation:
+                continue
+            self.frames += 1
+            self._buffer.put((generation, frame, position))
+
+
+_source: Optional[SimulatedVideoSource] = None
+_source_lock = threading.Lock()
+_source_failed = False
+
+
+def _ensure_source() -> Optional[SimulatedVideoSource]:
+    global _source, _source_failed
+    with _source_lock:
+        if _source is not None or _source_failed:
+            return _source
+        video_path = Path(SIM_VIDEO_PATH)
+        if cv2 is None or not video_path.exists():
+            _source_failed = True
+            return None
+        try:
+            _source = SimulatedVideoSource(video_path)
+        except (RuntimeError, ValueError) as error:
+            LOGGER.warning("Simulated video unavailable (%s); using blank frames.", error)
+            _source_failed = True
+            return None
+        _source.start()
+        atexit.register(_source.stop)
+        LOGGER.info(
+            "Streaming %s at %.1f fps (%s pacing)", video_path, _source.fps, _source.pacing
+        )
+        return _source
+
+
+def get_source() -> Optional[SimulatedVideoSource]:
+    """The shared source for ``SIM_VIDEO_PATH``, or None if it cannot be played."""
+    return _ensure_source()
 
 
 def get_frame() -> "np.ndarray":
-    """Return a frame from the configured video or a placeholder."""
-    video_path = Path(SIM_VIDEO_PATH)
-    if not video_path.exists():
-        return np.zeros((480, 640, 3), dtype=np.uint8)
+    """Return the next frame from the configured video or a placeholder."""
+    source = _ensure_source()
+    if source is None:
+        return _placeholder()
     try:
-        import cv2
-    except ImportError:
-        return np.zeros((480, 640, 3), dtype=np.uint8)
-    cap = cv2.VideoCapture(str(video_path))
-    ret, frame = cap.read()
-    cap.release()
-    if not ret or frame is None:
-        return np.zeros((480, 640, 3), dtype=np.uint8)
-    return frame
+        return source.get_frame()
+    except RuntimeError:
+        return _placeholder()
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Iterable, Optional, Tuple
+
+import numpy as np
+
+from pi4.core.bounded_queue import BoundedQueue
+from pi4.core.config import (
+    FRAME_JPEG_QUALITY,
+    FRAME_RETENTION_MAX_AGE_SEC,
+    FRAME_RETENTION_MAX_BYTES,
+    FRAME_SAVE_EVERY_N,
+    FRAME_SAVE_MIN_SEVERITY,
+    FRAME_SAVE_POLICY,
+    FRAME_SAVE_QUEUE_SIZE,
+)
+from pi4.core.event_batch import SEVERITY_CODES
+from pi4.core.event_schema import Event
+from pi4.core.logger import get_logger
+
+try:
+    import cv2
+except ImportError:  # pragma: no cover - depends on the platform
+    cv2 = None
+
+LOGGER = get_logger("frame_persistence")
+VALID_POLICIES = ("always", "every_n", "severity", "never")
+
+
+class RetentionManager:
+    """Keeps a directory of frames under a total size and age, oldest first."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = FRAME_RETENTION_MAX_BYTES,
+        max_age_sec: float = FRAME_RETENTION_MAX_AGE_SEC,
+        pattern: str = "*.jpg",
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+        # (mtime, size, path), oldest first
+        self._files: Deque[Tuple[float, int, Path]] = deque()
+        self.total_bytes = 0
+        self.removed = 0
+        entries = []
+        for path in self.directory.glob(pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        for entry in sorted(entries):
+            self._files.append(entry)
+            self.total_bytes += entry[1]
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def add(self, path: Path, size: int, mtime: float | None = None) -> None:
+        self._files.append((time.time() if mtime is None else mtime, size, path))
+        self.total_bytes += size
+
+    def prune(self, now: float | None = None) -> int:
+        """Delete the oldest files until both caps hold; returns how many went."""
+        now = time.time() if now is None else now
+        removed = 0
+        while self._files and (
+            (self.max_bytes > 0 and self.total_bytes > self.max_bytes)
+            or (self.max_age_sec > 0 and now - self._files[0][0] > self.max_age_sec)
+        ):
+            _, size, path = self._files.popleft()
+            self.total_bytes -= size
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as error:
+                LOGGER.warning("Could not prune %s: %s", path, error)
+                continue
+            removed += 1
+        self.removed += removed
+        return removed
+
+
+class FramePersistence:
+    """Writes selected camera frames to disk off the capture path.
+
+    ``offer`` is called for every captured frame and only decides: it names
+    the frame and queues a copy for a background encoder thread according
+    to the policy.  Under the ``severity`` policy nothing is saved until
+    ``note_events`` reports an event at ``min_severity`` or above together
+    with the frame it was detected on.  When the queue is full frames are
+    dropped and counted.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        policy: str = FRAME_SAVE_POLICY,
+        every_n: int = FRAME_SAVE_EVERY_N,
+        min_severity: str = FRAME_SAVE_MIN_SEVERITY,
+        queue_size: int = FRAME_SAVE_QUEUE_SIZE,
+        jpeg_quality: int = FRAME_JPEG_QUALITY,
+        retention: Optional[RetentionManager] = None,
+    ) -> None:
+        if policy not in VALID_POLICIES:
+            raise ValueError(f"Invalid frame save policy: {policy}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.policy = policy
+        self.every_n = max(every_n, 1)
+        self.min_severity = SEVERITY_CODES[min_severity]
+        self.jpeg_quality = jpeg_quality
+        self.retention = retention if retention is not None else RetentionManager(self.directory)
+        self.saved = 0
+        self.failed = 0
+        self.latest_name: Optional[str] = None
+        self._queue = BoundedQueue(queue_size, "drop_newest")
+        self._lock = threading.Lock()
+        self._offered = 0
+        self._last_stem = ""
+        self._collisions = 0
+        self._unfinished = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def dropped(self) -> int:
+        return self._queue.dropped
+
+    def offer(self, frame: "np.ndarray", timestamp: float | None = None) -> Optional[str]:
+        """Consider one captured frame; returns its file name if it will be saved."""
+        if self.policy == "never" or frame is None or getattr(frame, "ndim", 0) != 3:
+            return None
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._offered += 1
+            if self.policy == "severity":
+                return None
+            if self.policy == "every_n" and (self._offered - 1) % self.every_n:
+                return None
+        return self._enqueue(frame, timestamp)
+
+    def note_events(
+        self, events: Iterable[Event], frame: "np.ndarray", timestamp: float | None = None
+    ) -> Optional[str]:
+        """Save ``frame`` if any of its events is severe enough (``severity`` policy).
+
+        ``frame`` is the one the events were detected on, which in the
+        pipelined loop is usually not the last frame offered.
+        """
+        if self.policy != "severity" or frame is None or getattr(frame, "ndim", 0) != 3:
+            return None
+        if not any(SEVERITY_CODES.get(event.severity, -1) >= self.min_severity for event in events):
+            return None
+        return self._enqueue(frame, time.time() if timestamp is None else timestamp)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued frame is written; False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._queue.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.dropped:
+            LOGGER.warning("Frame persistence dropped %d frames (queue full)", self.dropped)
+
+    def _name(self, timestamp: float) -> str:
+        """``img_YYYYmmddHHMMSS_mmm``, suffixed with a counter if the millisecond repeats."""
+        moment = datetime.fromtimestamp(timestamp)
+        stem = moment.strftime("img_%Y%m%d%H%M%S") + f"_{moment.microsecond // 1000:03d}"
+        if stem == self._last_stem:
+            self._collisions += 1
+            return f"{stem}_{self._collisions:02d}.jpg"
+        self._last_stem = stem
+        self._collisions = 0
+        return f"{stem}.jpg"
+
+    def _enqueue(self, frame: "np.ndarray", timestamp: float) -> Optional[str]:
+        if self._thread is None:
+            self._start()
+        with self._lock:
+            name = self._name(timestamp)
+        with self._idle:
+            self._unfinished += 1
+        # Capture buffers are reused, so the encoder gets its own copy.
+        if not self._queue.put((name, np.array(frame, copy=True))):
+            self._finish()
+            return None
+        self.latest_name = name
+        return name
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="FramePersistence", daemon=True
+                )
+                self._thread.start()
+
+    def _finish(self) -> None:
+        with self._idle:
+            self._unfinished -= 1
+            self._idle.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                name, frame = self._queue.get()
+            except queue.Empty:
+                return  # closed and drained
+            try:
+                self._write(name, frame)
+            finally:
+                self._finish()
+
+    def _write(self, name: str, frame: "np.ndarray") -> None:
+        if cv2 is None:
+            self.failed += 1
+            return
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            self.failed += 1
+            LOGGER.warning("JPEG encoding failed for %s", name)
+            return
+        target = self.directory / name
+        temporary = target.with_suffix(".tmp")
+        try:
+            with open(temporary, "wb") as handle:
+                handle.write(encoded.tobytes())
+            # Readers only ever see complete JPEGs.
+            os.replace(temporary, target)
+        except OSError as error:
+            self.failed += 1
+            LOGGER.warning("Could not write %s: %s", target, error)
+            return
+        self.saved += 1
+        self.retention.add(target, int(encoded.size))
+        self.retention.prune()
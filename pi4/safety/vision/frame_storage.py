@@ -1,33 +1,78 @@
 from __future__ import annotations
 
-from datetime import datetime
-from pathlib import Path
-from typing import Optional, Tuple
+import atexit
+import threading
+from typing import Iterable, Optional
 
 import numpy as np
 
-from pi4.core.config import IMG_DIR
+from pi4.core.config import INCIDENT_DIR, INCIDENT_RING_ENABLED, IMG_DIR
+from pi4.core.event_schema import Event
+from pi4.core.tracing import traced
+from pi4.safety.vision.frame_persistence import FramePersistence
+from pi4.safety.vision.incident_recorder import IncidentRecorder
 
 IMG_DIR.mkdir(parents=True, exist_ok=True)
-_latest_frame_name: Optional[str] = None
+_persistence: Optional[FramePersistence] = None
+_recorder: Optional[IncidentRecorder] = None
+_persistence_lock = threading.Lock()
 
 
-def save_frame(frame: "np.ndarray") -> Optional[str]:
-    global _latest_frame_name
-    if frame is None:
-        return None
-    if frame.ndim != 3:
+def get_persistence() -> FramePersistence:
+    """The shared frame writer for ``IMG_DIR`` (created on first use)."""
+    global _persistence
+    with _persistence_lock:
+        if _persistence is None:
+            _persistence = FramePersistence(IMG_DIR)
+            atexit.register(_persistence.close)
+        return _persistence
+
+
+def get_incident_recorder() -> Optional[IncidentRecorder]:
+    """The shared pre-trigger ring, or None when ``INCIDENT_RING_ENABLED`` is off."""
+    global _recorder
+    if not INCIDENT_RING_ENABLED:
         return None
-    timestamp = datetime.now().strftime("img_%Y%m%d%H%M%S")
-    target = IMG_DIR / f"{timestamp}.jpg"
-    try:
-        import cv2
-    except ImportError:
+    with _persistence_lock:
+        if _recorder is None:
+            _recorder = IncidentRecorder(INCIDENT_DIR)
+            atexit.register(_recorder.close)
+        return _recorder
+
+
+def record_incident_frame(frame: "np.ndarray", timestamp: float | None = None) -> None:
+    """Add ``frame`` to the pre-trigger ring, if the ring is enabled."""
+    recorder = get_incident_recorder()
+    if recorder is not None:
+        recorder.record(frame, timestamp)
+
+
+@traced("frame.save")
+def save_frame(frame: "np.ndarray", timestamp: float | None = None) -> Optional[str]:
+    """Queue ``frame`` for saving per the policy.
+
+    Returns the file name it will get, or None if the policy skips it.
+    The incident ring is fed separately, see `record_incident_frame`.
+    """
+    if frame is None:
         return None
-    cv2.imwrite(str(target), frame)
-    _latest_frame_name = target.name
-    return target.name
+    return get_persistence().offer(frame, timestamp)
+
+
+def note_events(
+    events: Iterable[Event], frame: "np.ndarray", timestamp: float | None = None
+) -> Optional[str]:
+    """Report the events found in ``frame`` (captured at wall time ``timestamp``).
+
+    Saves the frame under the severity policy and writes the pre-trigger
+    clip for severe enough events.
+    """
+    events = list(events)
+    recorder = get_incident_recorder()
+    if recorder is not None:
+        recorder.note_events(events)
+    return get_persistence().note_events(events, frame, timestamp)
 
 
 def latest_frame_name() -> Optional[str]:
-    return _latest_frame_name
+    return _persistence.latest_name if _persistence is not None else None
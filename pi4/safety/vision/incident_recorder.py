@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from pi4.core.bounded_queue import BoundedQueue
+from pi4.core.config import (
+    FRAME_JPEG_QUALITY,
+    INCIDENT_COOLDOWN_SEC,
+    INCIDENT_MIN_SEVERITY,
+    INCIDENT_RETENTION_MAX_BYTES,
+    INCIDENT_RING_FRAMES,
+    INCIDENT_THUMB_WIDTH,
+    INCIDENT_WINDOW_SEC,
+)
+from pi4.core.event_batch import SEVERITY_CODES
+from pi4.core.event_schema import Event
+from pi4.core.logger import get_logger
+from pi4.safety.vision.frame_persistence import RetentionManager
+
+try:
+    import cv2
+except ImportError:  # pragma: no cover - depends on the platform
+    cv2 = None
+
+LOGGER = get_logger("incident_recorder")
+
+# (thumbnails oldest first, their wall-clock stamps, triggering events)
+_Incident = Tuple[List[np.ndarray], List[float], List[Event]]
+
+
+class IncidentRecorder:
+    """Dashcam-style buffer of the last few seconds of frames.
+
+    ``record`` downscales each frame into a preallocated ring slot and
+    never touches the disk.  When ``note_events`` sees an event at
+    ``min_severity`` or above, the frames from the last ``window_sec`` are
+    copied out and a background thread writes them as an MJPEG clip
+    (concatenated JPEGs) with a JSON sidecar describing the events.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        slots: int = INCIDENT_RING_FRAMES,
+        window_sec: float = INCIDENT_WINDOW_SEC,
+        thumb_width: int = INCIDENT_THUMB_WIDTH,
+        min_severity: str = INCIDENT_MIN_SEVERITY,
+        cooldown_sec: float = INCIDENT_COOLDOWN_SEC,
+        jpeg_quality: int = FRAME_JPEG_QUALITY,
+        retention_max_bytes: int = INCIDENT_RETENTION_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if slots < 1:
+            raise ValueError("IncidentRecorder needs at least one slot")
+        self.directory = Path(directory)
+        self.window_sec = window_sec
+        self.thumb_width = thumb_width
+        self.min_severity = SEVERITY_CODES[min_severity]
+        self.cooldown_sec = cooldown_sec
+        self.jpeg_quality = jpeg_quality
+        self.retention_max_bytes = retention_max_bytes
+        self.clips = 0
+        self.failed = 0
+        self.last_clip: Optional[Path] = None
+        self._clock = clock
+        self._slots = slots
+        self._ring: Optional[np.ndarray] = None
+        self._stamps = np.zeros(slots)
+        self._count = 0  # frames recorded so far; next slot is _count % slots
+        self._lock = threading.Lock()
+        self._last_trigger = float("-inf")
+        self._retention: Optional[RetentionManager] = None
+        self._queue = BoundedQueue(2, "drop_newest")
+        self._unfinished = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return min(self._count, self._slots)
+
+    def record(self, frame: "np.ndarray", timestamp: float | None = None) -> None:
+        """Downscale ``frame`` into the next ring slot."""
+        if cv2 is None or frame is None or getattr(frame, "ndim", 0) != 3:
+            return
+        height, width = frame.shape[:2]
+        scale = min(self.thumb_width / width, 1.0)
+        size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+        with self._lock:
+            if self._ring is None or self._ring.shape[1:3] != (size[1], size[0]):
+                # (Re)allocate once; the camera resolution does not change at runtime.
+                self._ring = np.empty((self._slots, size[1], size[0], 3), dtype=np.uint8)
+                self._count = 0
+            slot = self._count % self._slots
+            cv2.resize(frame, size, dst=self._ring[slot], interpolation=cv2.INTER_AREA)
+            self._stamps[slot] = self._clock() if timestamp is None else timestamp
+            self._count += 1
+
+    def note_events(self, events: Iterable[Event]) -> bool:
+        """Queue a clip if any event is severe enough; True if one was queued."""
+        triggering = [
+            event for event in events
+            if SEVERITY_CODES.get(event.severity, -1) >= self.min_severity
+        ]
+        if not triggering:
+            return False
+        now = self._clock()
+        with self._lock:
+            if now - self._last_trigger < self.cooldown_sec or self._ring is None:
+                return False
+            self._last_trigger = now
+            frames, stamps = self._snapshot(now)
+        if not frames:
+            return False
+        if self._thread is None:
+            self._start()
+        with self._idle:
+            self._unfinished += 1
+        if not self._queue.put((frames, stamps, triggering)):
+            self._finish()
+            return False
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self._queue.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _snapshot(self, now: float) -> Tuple[List[np.ndarray], List[float]]:
+        """Copies of the ring's frames within the window, oldest first."""
+        filled = len(self)
+        start = self._count - filled
+        frames: List[np.ndarray] = []
+        stamps: List[float] = []
+        for index in range(start, self._count):
+            slot = index % self._slots
+            stamp = float(self._stamps[slot])
+            if now - stamp <= self.window_sec:
+                frames.append(self._ring[slot].copy())
+                stamps.append(stamp)
+        return frames, stamps
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="IncidentRecorder", daemon=True
+                )
+                self._thread.start()
+
+    def _finish(self) -> None:
+        with self._idle:
+            self._unfinished -= 1
+            self._idle.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                incident = self._queue.get()
+            except queue.Empty:
+                return
+            try:
+                self._write(incident)
+            except OSError as error:
+                self.failed += 1
+                LOGGER.warning("Could not write incident clip: %s", error)
+            finally:
+                self._finish()
+
+    def _write(self, incident: _Incident) -> None:
+        frames, stamps, events = incident
+        self.directory.mkdir(parents=True, exist_ok=True)
+        moment = datetime.fromtimestamp(stamps[-1])
+        stem = moment.strftime("incident_%Y%m%d%H%M%S") + f"_{moment.microsecond // 1000:03d}"
+        clip = self.directory / f"{stem}.mjpeg"
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        temporary = clip.with_suffix(".tmp")
+        with open(temporary, "wb") as handle:
+            for frame in frames:
+                ok, encoded = cv2.imencode(".jpg", frame, params)
+                if ok:
+                    handle.write(encoded.tobytes())
+        os.replace(temporary, clip)
+        span = stamps[-1] - stamps[0]
+        sidecar = {
+            "clip": clip.name,
+            "format": "mjpeg",
+            "frames": len(frames),
+            "width": int(frames[0].shape[1]),
+            "height": int(frames[0].shape[0]),
+            "fps": round((len(frames) - 1) / span, 2) if span > 0 else None,
+            "frame_ts": [round(stamp, 3) for stamp in stamps],
+            "events": [event.to_dict() for event in events],
+        }
+        sidecar_path = self.directory / f"{stem}.json"
+        sidecar_path.write_text(json.dumps(sidecar, ensure_ascii=False), encoding="utf-8")
+        self.clips += 1
+        self.last_clip = clip
+        LOGGER.info("Wrote incident clip %s (%d frames, %.1fs)", clip.name, len(frames), span)
+        if self._retention is None:
+            self._retention = RetentionManager(
+                self.directory, self.retention_max_bytes, 0, pattern="incident_*"
+            )
+        else:
+            self._retention.add(clip, clip.stat().st_size)
+            self._retention.add(sidecar_path, sidecar_path.stat().st_size)
+        self._retention.prune()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+import cv2
+import numpy as np
+
+from pi4.core.config import (MOTION_GATE_ENABLED, MOTION_GATE_THRESHOLD,
+                             MOTION_GATE_TTL_SEC)
+
+T = TypeVar("T")
+
+
+class MotionGate(Generic[T]):
+    """Reuses the last detector result while the scene has not changed.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with
+    the thumbnail of the frame the detector last ran on.  The difference is
+    the largest mean absolute difference over a ``blocks`` grid, so an
+    object that changes only a small part of the frame still counts.  If it
+    is below ``threshold`` the cached result is reused, for at most
+    ``ttl_sec`` and less the closer the difference is to the threshold, so
+    slow drift still forces a fresh detection.  ``force=True`` always runs
+    the detector; ``last_hit`` tells whether the last result was reused.
+    """
+
+    def __init__(
+        self,
+        detector: Callable[[np.ndarray], T],
+        threshold: float = MOTION_GATE_THRESHOLD,
+        ttl_sec: float = MOTION_GATE_TTL_SEC,
+        size: Tuple[int, int] = (64, 48),
+        blocks: Tuple[int, int] = (8, 6),
+        enabled: bool = MOTION_GATE_ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.detector = detector
+        self.threshold = threshold
+        self.ttl_sec = ttl_sec
+        self.size = size
+        self.blocks = blocks
+        # A zero threshold reuses nothing, so treat it as switching the gate off.
+        self.enabled = enabled and threshold > 0
+        self._clock = clock
+        self._reference: Optional[np.ndarray] = None
+        self._cached: Optional[T] = None
+        self._cached_at = 0.0
+        self.last_diff: Optional[float] = None
+        self.last_hit = False
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, frame: np.ndarray, force: bool = False) -> T:
+        self.last_hit = False
+        if not self.enabled or not isinstance(frame, np.ndarray) or frame.ndim < 2:
+            return self.detector(frame)
+        thumbnail = self._thumbnail(frame)
+        now = self._clock()
+        if self._reference is not None and self._reference.shape == thumbnail.shape:
+            diff = self._block_diff(thumbnail)
+            self.last_diff = diff
+            ttl = self.ttl_sec * max(0.0, 1.0 - diff / self.threshold)
+            if not force and now - self._cached_at < ttl:
+                self.hits += 1
+                self.last_hit = True
+                return self._cached  # type: ignore[return-value]
+        self.misses += 1
+        result = self.detector(frame)
+        self._reference = thumbnail
+        self._cached = result
+        self._cached_at = now
+        return result
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def _block_diff(self, thumbnail: np.ndarray) -> float:
+        # INTER_AREA down to the grid averages each block in one call.
+        block_means = cv2.resize(
+            cv2.absdiff(thumbnail, self._reference), self.blocks, interpolation=cv2.INTER_AREA
+        )
+        return float(block_means.max())
+
+    def reset(self) -> None:
+        self._reference = None
+        self._cached = None
+        self.last_diff = None
+        self.last_hit = False
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": float(self.hits),
+            "misses": float(self.misses),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
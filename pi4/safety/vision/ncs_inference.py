@@ -1,22 +1,38 @@
 from __future__ import annotations
 
+import hashlib
+import re
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future
 from dataclasses import dataclass
-import logging
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
-from pi4.core.config import (OPENVINO_CONFIDENCE, OPENVINO_DEVICE,
-                             OPENVINO_ENABLED, OPENVINO_LABELS,
-                             OPENVINO_MODEL_BIN, OPENVINO_MODEL_XML)
+from pi4.core.config import (OPENVINO_ASYNC_JOBS, OPENVINO_CACHE_DIR,
+                             OPENVINO_CLASS_CONFIDENCE, OPENVINO_CONFIDENCE,
+                             OPENVINO_DEVICE, OPENVINO_ENABLED,
+                             OPENVINO_LABELS, OPENVINO_MODEL_BIN,
+                             OPENVINO_MODEL_XML, OPENVINO_NMS_IOU,
+                             OPENVINO_PREPROCESS, OPENVINO_WARMUP_RUNS)
 from pi4.core.logger import get_logger
+from pi4.core.tracing import TRACER, traced
 
 try:
-    from openvino.runtime import Core
+    from openvino.runtime import AsyncInferQueue, Core, Layout, Type, get_version
 except ImportError:  # pragma: no cover
+    AsyncInferQueue = None
     Core = None
 
+try:
+    from openvino.preprocess import PrePostProcessor, ResizeAlgorithm
+except ImportError:  # pragma: no cover
+    PrePostProcessor = None
+
 logger = get_logger("ncs_inference")
 
 
@@ -27,27 +43,215 @@ class DetectedObject:
     confidence: float
 
 
+DETECTION_DTYPE = np.dtype(
+    [("class_id", np.int32), ("confidence", np.float32), ("bbox", np.int32, (4,))]
+)
+
+
+class Detections(Sequence):
+    """Detections of one frame as a structured array (``DETECTION_DTYPE``).
+
+    Behaves like a list of ``DetectedObject``; items are only built when
+    indexed or iterated, while ``array`` / ``boxes`` / ``confidences``
+    expose the columns directly.
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = array
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(np.empty(0, dtype=DETECTION_DTYPE))
+
+    @property
+    def class_ids(self) -> np.ndarray:
+        return self.array["class_id"]
+
+    @property
+    def confidences(self) -> np.ndarray:
+        return self.array["confidence"]
+
+    @property
+    def boxes(self) -> np.ndarray:
+        return self.array["bbox"]
+
+    @property
+    def labels(self) -> List[str]:
+        return [_label_for_class(int(class_id)) for class_id in self.array["class_id"]]
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Detections(self.array[index])
+        row = self.array[index]
+        x1, y1, x2, y2 = (int(value) for value in row["bbox"])
+        return DetectedObject(
+            label=_label_for_class(int(row["class_id"])),
+            bbox=(x1, y1, x2, y2),
+            confidence=float(row["confidence"]),
+        )
+
+    def __iter__(self) -> Iterator[DetectedObject]:
+        columns = zip(
+            self.array["class_id"].tolist(),
+            self.array["bbox"].tolist(),
+            self.array["confidence"].tolist(),
+        )
+        for class_id, bbox, confidence in columns:
+            yield DetectedObject(_label_for_class(class_id), tuple(bbox), confidence)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Detections):
+            return bool(np.array_equal(self.array, other.array))
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Detections({list(self)!r})"
+
+
+def _embed_preprocessing(model):
+    """Compile resize and NHWC u8 -> NCHW conversion into the model graph.
+
+    The network already expects BGR like OpenCV frames, so no color step is
+    needed; frames of any size go in as ``frame[None]``.
+    """
+    ppp = PrePostProcessor(model)
+    ppp.input().tensor().set_element_type(Type.u8).set_layout(
+        Layout("NHWC")
+    ).set_spatial_dynamic_shape()
+    ppp.input().preprocess().resize(ResizeAlgorithm.RESIZE_LINEAR)
+    ppp.input().model().set_layout(Layout("NCHW"))
+    return ppp.build()
+
+
+def _model_cache_dir(preprocess: str) -> Optional[Path]:
+    """Blob cache directory keyed by model content, device, preprocessing and version."""
+    if OPENVINO_CACHE_DIR is None:
+        return None
+    digest = hashlib.sha1()
+    for path in (OPENVINO_MODEL_XML, OPENVINO_MODEL_BIN):
+        if path and Path(path).exists():
+            digest.update(Path(path).read_bytes())
+    version = re.sub(r"[^0-9A-Za-z.]+", "_", get_version())[:48]
+    key = f"{digest.hexdigest()[:16]}-{OPENVINO_DEVICE}-{preprocess}-{version}"
+    return OPENVINO_CACHE_DIR / key
+
+
 class _OpenVINOModel:
-    def __init__(self) -> None:
+    def __init__(self, preprocess: str | None = None) -> None:
         if not OPENVINO_ENABLED or Core is None or not OPENVINO_MODEL_XML:
             raise RuntimeError("OpenVINO not configured")
+        self.timings: Dict[str, float] = {}
+        start = time.perf_counter()
         core = Core()
         model = core.read_model(model=OPENVINO_MODEL_XML, weights=OPENVINO_MODEL_BIN)
+        self.timings["read_ms"] = (time.perf_counter() - start) * 1e3
+        input_shape = model.input(0).shape
+        self.input_size = (int(input_shape[2]), int(input_shape[3]))
+        self.preprocess = preprocess or OPENVINO_PREPROCESS
+        if self.preprocess == "graph":
+            if PrePostProcessor is None:
+                logger.warning("PrePostProcessor unavailable; preprocessing in Python")
+                self.preprocess = "python"
+            else:
+                model = _embed_preprocessing(model)
+        self.cache_dir = _model_cache_dir(self.preprocess)
+        self.cache_hit = False
+        if self.cache_dir is not None:
+            self.cache_hit = self.cache_dir.is_dir() and any(self.cache_dir.iterdir())
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            core.set_property({"CACHE_DIR": str(self.cache_dir)})
+        start = time.perf_counter()
         self.compiled = core.compile_model(model, device_name=OPENVINO_DEVICE)
+        self.timings["compile_ms"] = (time.perf_counter() - start) * 1e3
         self.input_tensor = self.compiled.input(0)
         self.output_tensor = self.compiled.output(0)
 
-    def infer(self, frame: "np.ndarray") -> np.ndarray:
-        h, w = self.input_tensor.shape[2], self.input_tensor.shape[3]
+    def prepare(self, frame: "np.ndarray") -> np.ndarray:
+        if self.preprocess == "graph":
+            # A view for contiguous frames; the graph resizes and transposes.
+            return np.ascontiguousarray(frame)[None, ...]
+        h, w = self.input_size
         resized = cv2.resize(frame, (w, h))
-        blob = resized.transpose(2, 0, 1)[None, ...]
-        results = self.compiled([blob])[self.output_tensor]
-        if results.ndim == 4:
-            return results[0][0]
-        return results.reshape(-1, 7)
+        return resized.transpose(2, 0, 1)[None, ...]
+
+    def infer(self, frame: "np.ndarray") -> np.ndarray:
+        results = self.compiled([self.prepare(frame)])[self.output_tensor]
+        return _detection_rows(results)
+
+
+def _detection_rows(results: np.ndarray) -> np.ndarray:
+    if results.ndim == 4:
+        return results[0][0]
+    return results.reshape(-1, 7)
+
+
+DetectionCallback = Callable[["Detections"], None]
+
+
+class AsyncDetector:
+    """Keeps up to ``jobs`` frames in flight on an OpenVINO ``AsyncInferQueue``.
+
+    ``submit`` returns a ``Future`` resolved with the frame's detections on
+    OpenVINO's callback thread; an optional per-frame callback receives the
+    same list first.  ``submit`` blocks only while every request is busy.
+    """
+
+    def __init__(self, model: _OpenVINOModel, jobs: int = OPENVINO_ASYNC_JOBS) -> None:
+        if AsyncInferQueue is None:
+            raise RuntimeError("OpenVINO AsyncInferQueue not available")
+        self.model = model
+        self.jobs = max(jobs, 1)
+        self._queue = AsyncInferQueue(model.compiled, self.jobs)
+        self._queue.set_callback(self._on_done)
+        self._lock = threading.Lock()
+
+    def submit(
+        self, frame: "np.ndarray", callback: DetectionCallback | None = None
+    ) -> "Future[Detections]":
+        future: "Future[Detections]" = Future()
+        future.set_running_or_notify_cancel()
+        height, width = frame.shape[:2]
+        userdata = (
+            future, width, height, callback, TRACER.current_trace_id(), time.monotonic_ns()
+        )
+        blob = self.model.prepare(frame)
+        with self._lock:
+            self._queue.start_async({0: blob}, userdata)
+        return future
+
+    def wait_all(self) -> None:
+        self._queue.wait_all()
+
+    def _on_done(self, request, userdata) -> None:
+        future, width, height, callback, trace_id, start_ns = userdata
+        try:
+            # Parse now: the request's output buffer is reused by the next job.
+            raw = _detection_rows(request.get_output_tensor(0).data)
+            detections = _parse_detections(raw, width, height)
+        except Exception as exc:
+            future.set_exception(exc)
+            return
+        TRACER.record("ncs.detect_async", start_ns, time.monotonic_ns(), trace_id)
+        if callback is not None:
+            try:
+                callback(detections)
+            except Exception:
+                logger.exception("Detection callback failed")
+        future.set_result(detections)
 
 
 _ov_model: Optional[_OpenVINOModel] = None
+_async_detector: Optional[AsyncDetector] = None
+_async_lock = threading.Lock()
 
 
 def _get_model() -> Optional[_OpenVINOModel]:
@@ -61,32 +265,128 @@ def _get_model() -> Optional[_OpenVINOModel]:
     return _ov_model
 
 
+def _get_async_detector() -> Optional[AsyncDetector]:
+    global _async_detector
+    with _async_lock:
+        if _async_detector is None:
+            model = _get_model()
+            if model is None:
+                return None
+            try:
+                _async_detector = AsyncDetector(model)
+            except RuntimeError as exc:
+                logger.warning("Async inference not available: %s", exc)
+                return None
+        return _async_detector
+
+
+def warm_up(runs: int = OPENVINO_WARMUP_RUNS) -> Dict[str, float]:
+    """Load and compile the detector and run dummy inferences before the first trigger.
+
+    Returns a timing report in milliseconds (empty if OpenVINO is unavailable).
+    """
+    start = time.perf_counter()
+    model = _get_model()
+    if model is None:
+        return {}
+    report = dict(model.timings)
+    report["load_ms"] = (time.perf_counter() - start) * 1e3
+    dummy = np.zeros((480, 640, 3), dtype=np.uint8)
+    for run in range(max(runs, 1)):
+        start = time.perf_counter()
+        model.infer(dummy)
+        elapsed = (time.perf_counter() - start) * 1e3
+        report["first_infer_ms" if run == 0 else "steady_infer_ms"] = elapsed
+    logger.info(
+        "Detector warm-up (%s cache %s): %s",
+        OPENVINO_DEVICE,
+        "hit" if model.cache_hit else "miss",
+        ", ".join(f"{name}={value:.1f}" for name, value in report.items()),
+    )
+    report["cache_hit"] = float(model.cache_hit)
+    return report
+
+
 def _label_for_class(class_id: int) -> str:
     return OPENVINO_LABELS.get(class_id, f"class_{class_id}")
 
 
-def detect_objects(frame: "np.ndarray") -> List[DetectedObject]:
-    """Return list of detected objects using OpenVINO model."""
+def _parse_detections(
+    raw: np.ndarray, width: int, height: int, min_confidence: float | None = None
+) -> "Detections":
+    """Turn SSD ``[N, 7]`` rows into pixel-space detections above the threshold.
+
+    ``min_confidence`` replaces the configured (per-class) thresholds with
+    one threshold for every class.
+    """
+    raw = np.asarray(raw, dtype=np.float32).reshape(-1, 7)
+    class_ids = raw[:, 1].astype(np.int32)
+    scores = raw[:, 2]
+    if min_confidence is None:
+        thresholds = np.full(len(raw), OPENVINO_CONFIDENCE, dtype=np.float32)
+        for class_id, threshold in OPENVINO_CLASS_CONFIDENCE.items():
+            thresholds[class_ids == class_id] = threshold
+    else:
+        thresholds = np.float32(min_confidence)
+    # Rows after the last real detection carry image_id -1.
+    keep = np.flatnonzero((scores >= thresholds) & (raw[:, 0] >= 0))
+    if not len(keep):
+        return Detections.empty()
+    scale = np.array([width, height, width, height], dtype=np.float32)
+    limit = np.array([width, height, width, height], dtype=np.float32)
+    boxes = np.clip(raw[keep, 3:7] * scale, 0, limit).astype(np.int32)
+    if OPENVINO_NMS_IOU is not None and len(keep) > 1:
+        selected = _nms(boxes, scores[keep], class_ids[keep], OPENVINO_NMS_IOU)
+        keep, boxes = keep[selected], boxes[selected]
+    result = np.empty(len(keep), dtype=DETECTION_DTYPE)
+    result["class_id"] = class_ids[keep]
+    result["confidence"] = scores[keep]
+    result["bbox"] = boxes
+    return Detections(result)
+
+
+def _nms(
+    boxes: np.ndarray, scores: np.ndarray, class_ids: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """Greedy per-class NMS; returns kept indices in their original order."""
+    boxes = boxes.astype(np.float32)
+    x1, y1, x2, y2 = boxes.T
+    areas = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+    inter_w = np.clip(np.minimum(x2[:, None], x2) - np.maximum(x1[:, None], x1), 0, None)
+    inter_h = np.clip(np.minimum(y2[:, None], y2) - np.maximum(y1[:, None], y1), 0, None)
+    inter = inter_w * inter_h
+    union = areas[:, None] + areas - inter
+    iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    overlaps = (iou > iou_threshold) & (class_ids[:, None] == class_ids)
+    suppressed = np.zeros(len(boxes), dtype=bool)
+    for index in np.argsort(-scores, kind="stable"):
+        if suppressed[index]:
+            continue
+        suppressed |= overlaps[index]
+        suppressed[index] = False
+    return np.flatnonzero(~suppressed)
+
+
+@traced("ncs.detect_objects")
+def detect_objects(frame: "np.ndarray") -> Detections:
+    """Return detected objects (a list-like ``Detections``) using OpenVINO model."""
     model = _get_model()
     if model is None:
-        return []
-    detections = []
-    raw = model.infer(frame)
+        return Detections.empty()
     height, width = frame.shape[:2]
-    for det in raw:
-        score = float(det[2])
-        if score < OPENVINO_CONFIDENCE:
-            continue
-        class_id = int(det[1])
-        x1 = int(max(0, det[3] * width))
-        y1 = int(max(0, det[4] * height))
-        x2 = int(min(width, det[5] * width))
-        y2 = int(min(height, det[6] * height))
-        detections.append(
-            DetectedObject(
-                label=_label_for_class(class_id),
-                bbox=(x1, y1, x2, y2),
-                confidence=score,
-            )
-        )
-    return detections
+    return _parse_detections(model.infer(frame), width, height)
+
+
+def detect_objects_async(
+    frame: "np.ndarray", callback: DetectionCallback | None = None
+) -> "Future[Detections]":
+    """Queue ``frame`` for asynchronous inference; resolves to its detections."""
+    detector = _get_async_detector()
+    if detector is None:
+        future: "Future[Detections]" = Future()
+        empty = Detections.empty()
+        future.set_result(empty)
+        if callback is not None:
+            callback(empty)
+        return future
+    return detector.submit(frame, callback)
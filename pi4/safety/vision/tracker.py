@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from pi4.core.config import (TRACKER_IOU_THRESHOLD, TRACKER_MAX_AGE_SEC,
+                             TRACKER_MIN_HITS)
+
+# State axes: box center x/y, width, height (pixels) and distance (metres).
+_AXES = 5
+_DISTANCE = 4
+# Per-axis process noise (acceleration spectral density) and measurement noise.
+_PROCESS_NOISE = np.array([400.0, 400.0, 100.0, 100.0, 1.0])
+_MEASUREMENT_NOISE = np.array([25.0, 25.0, 25.0, 25.0, 0.09])
+_INITIAL_VELOCITY_VAR = np.array([1e4, 1e4, 1e4, 1e4, 25.0])
+
+
+@dataclass
+class TrackedObject:
+    track_id: int
+    label: str
+    bbox: Tuple[int, int, int, int]
+    distance_m: float
+    closing_speed_mps: float
+    hits: int
+
+    @property
+    def confirmed(self) -> bool:
+        return self.hits >= TRACKER_MIN_HITS
+
+
+def _to_state(boxes: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    x1, y1, x2, y2 = boxes.T
+    return np.stack(
+        [(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1, distances], axis=1
+    ).astype(np.float64)
+
+
+def _to_boxes(state: np.ndarray) -> np.ndarray:
+    cx, cy, w, h = state[:, 0], state[:, 1], state[:, 2], state[:, 3]
+    return np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between ``[N, 4]`` and ``[M, 4]`` x1/y1/x2/y2 boxes."""
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    inter_w = np.clip(np.minimum(a[:, None, 2], b[:, 2]) - np.maximum(a[:, None, 0], b[:, 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[:, None, 3], b[:, 3]) - np.maximum(a[:, None, 1], b[:, 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = np.maximum(a[:, 2] - a[:, 0], 0) * np.maximum(a[:, 3] - a[:, 1], 0)
+    area_b = np.maximum(b[:, 2] - b[:, 0], 0) * np.maximum(b[:, 3] - b[:, 1], 0)
+    union = area_a[:, None] + area_b - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+class MultiObjectTracker:
+    """IoU-associated tracks, each with a constant-velocity Kalman filter.
+
+    All tracks live in parallel NumPy arrays.  Every state axis (box center,
+    size and distance) is filtered independently, so predict and update are
+    a handful of element-wise operations over all tracks at once; the
+    distance velocity gives the closing speed.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = TRACKER_IOU_THRESHOLD,
+        max_age_sec: float = TRACKER_MAX_AGE_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.iou_threshold = iou_threshold
+        self.max_age_sec = max_age_sec
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._label_codes: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self.reset()
+
+    def reset(self) -> None:
+        self.track_ids = np.zeros(0, dtype=np.int64)
+        self.label_codes = np.zeros(0, dtype=np.int32)
+        self.pos = np.zeros((0, _AXES))
+        self.vel = np.zeros((0, _AXES))
+        # Per-axis 2x2 covariance stored as (p_pos, p_cross, p_vel).
+        self.cov = np.zeros((0, _AXES, 3))
+        self.hits = np.zeros(0, dtype=np.int32)
+        self.last_seen = np.zeros(0)
+        self._last_time: float | None = None
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def update(
+        self,
+        boxes: np.ndarray,
+        labels: Sequence[str],
+        distances: np.ndarray,
+        timestamp: float | None = None,
+    ) -> List[TrackedObject]:
+        """Feed one frame of detections; returns one track per detection, in order."""
+        now = self._clock() if timestamp is None else timestamp
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        distances = np.asarray(distances, dtype=np.float64).reshape(-1)
+        codes = np.array([self._code(label) for label in labels], dtype=np.int32)
+        self._expire(now)
+        if self._last_time is not None and len(self):
+            self._predict(max(now - self._last_time, 0.0))
+        self._last_time = now
+
+        measured = _to_state(boxes, distances)
+        track_for_detection = self._associate(boxes, codes)
+        matched = track_for_detection >= 0
+        if matched.any():
+            self._correct(track_for_detection[matched], measured[matched], now)
+        new = np.flatnonzero(~matched)
+        if len(new):
+            track_for_detection[new] = self._spawn(measured[new], codes[new], now)
+
+        results: List[TrackedObject] = []
+        for det_index, track in enumerate(track_for_detection):
+            x1, y1, x2, y2 = boxes[det_index].astype(int)
+            results.append(
+                TrackedObject(
+                    track_id=int(self.track_ids[track]),
+                    label=labels[det_index],
+                    bbox=(int(x1), int(y1), int(x2), int(y2)),
+                    distance_m=float(self.pos[track, _DISTANCE]),
+                    closing_speed_mps=float(-self.vel[track, _DISTANCE]),
+                    hits=int(self.hits[track]),
+                )
+            )
+        return results
+
+    def has_confirmed(self, label: str, now: float | None = None) -> bool:
+        """Whether a live track of ``label`` has reached ``TRACKER_MIN_HITS``."""
+        code = self._label_codes.get(label)
+        if code is None or not len(self):
+            return False
+        now = self._clock() if now is None else now
+        live = (self.label_codes == code) & (now - self.last_seen <= self.max_age_sec)
+        return bool((self.hits[live] >= TRACKER_MIN_HITS).any())
+
+    # -- internals ----------------------------------------------------------
+
+    def _code(self, label: str) -> int:
+        code = self._label_codes.get(label)
+        if code is None:
+            code = len(self._labels)
+            self._label_codes[label] = code
+            self._labels.append(label)
+        return code
+
+    def _expire(self, now: float) -> None:
+        alive = now - self.last_seen <= self.max_age_sec
+        if alive.all():
+            return
+        self.track_ids = self.track_ids[alive]
+        self.label_codes = self.label_codes[alive]
+        self.pos = self.pos[alive]
+        self.vel = self.vel[alive]
+        self.cov = self.cov[alive]
+        self.hits = self.hits[alive]
+        self.last_seen = self.last_seen[alive]
+
+    def _predict(self, dt: float) -> None:
+        q = _PROCESS_NOISE
+        p_pos, p_cross, p_vel = self.cov[..., 0], self.cov[..., 1], self.cov[..., 2]
+        self.pos += self.vel * dt
+        self.cov[..., 0] = p_pos + 2 * dt * p_cross + dt * dt * p_vel + q * dt ** 3 / 3
+        self.cov[..., 1] = p_cross + dt * p_vel + q * dt ** 2 / 2
+        self.cov[..., 2] = p_vel + q * dt
+
+    def _associate(self, boxes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Greedy highest-IoU matching between same-label tracks and detections."""
+        assignment = np.full(len(boxes), -1, dtype=np.int64)
+        if not len(self) or not len(boxes):
+            return assignment
+        iou = iou_matrix(_to_boxes(self.pos), boxes)
+        iou[self.label_codes[:, None] != codes[None, :]] = 0.0
+        tracks, detections = np.nonzero(iou >= self.iou_threshold)
+        order = np.argsort(-iou[tracks, detections], kind="stable")
+        used_tracks = set()
+        for track, detection in zip(tracks[order].tolist(), detections[order].tolist()):
+            if track in used_tracks or assignment[detection] >= 0:
+                continue
+            used_tracks.add(track)
+            assignment[detection] = track
+        return assignment
+
+    def _correct(self, tracks: np.ndarray, measured: np.ndarray, now: float) -> None:
+        p_pos = self.cov[tracks, :, 0]
+        p_cross = self.cov[tracks, :, 1]
+        p_vel = self.cov[tracks, :, 2]
+        innovation = measured - self.pos[tracks]
+        gain_pos = p_pos / (p_pos + _MEASUREMENT_NOISE)
+        gain_vel = p_cross / (p_pos + _MEASUREMENT_NOISE)
+        self.pos[tracks] += gain_pos * innovation
+        self.vel[tracks] += gain_vel * innovation
+        self.cov[tracks, :, 0] = (1 - gain_pos) * p_pos
+        self.cov[tracks, :, 1] = (1 - gain_pos) * p_cross
+        self.cov[tracks, :, 2] = p_vel - gain_vel * p_cross
+        self.hits[tracks] += 1
+        self.last_seen[tracks] = now
+
+    def _spawn(self, measured: np.ndarray, codes: np.ndarray, now: float) -> np.ndarray:
+        count = len(measured)
+        start = len(self)
+        cov = np.zeros((count, _AXES, 3))
+        cov[..., 0] = _MEASUREMENT_NOISE
+        cov[..., 2] = _INITIAL_VELOCITY_VAR
+        self.track_ids = np.concatenate(
+            [self.track_ids, np.array([next(self._ids) for _ in range(count)], dtype=np.int64)]
+        )
+        self.label_codes = np.concatenate([self.label_codes, codes])
+        self.pos = np.concatenate([self.pos, measured])
+        self.vel = np.concatenate([self.vel, np.zeros((count, _AXES))])
+        self.cov = np.concatenate([self.cov, cov])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int32)])
+        self.last_seen = np.concatenate([self.last_seen, np.full(count, now)])
+        return np.arange(start, start + count)
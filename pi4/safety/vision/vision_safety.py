@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-import uuid
 from typing import Iterable
 
+import numpy as np
+
 from pi4.core.config import (CAR_APPROACHING_MIN_DISTANCE_M,
+                             CAR_APPROACHING_SPEED_THRESHOLD,
                              CAR_ACTUAL_HEIGHT_M,
                              DISTANCE_VOICE_BIAS_M,
                              PERSON_ACTUAL_HEIGHT_M,
@@ -12,6 +13,14 @@ from pi4.core.config import (CAR_APPROACHING_MIN_DISTANCE_M,
                              VISION_FOCAL_LENGTH)
 from pi4.core.event_schema import Event
 from pi4.safety.vision import ncs_inference
+from pi4.safety.vision.motion_gate import MotionGate
+from pi4.safety.vision.tracker import MultiObjectTracker, TrackedObject
+
+_tracker = MultiObjectTracker()
+# Looks up detect_objects per call so it can still be patched.
+_motion_gate = MotionGate(lambda frame: ncs_inference.detect_objects(frame))
+# Tracks for the detections the gate has cached; reused as-is on a gate hit.
+_last_tracks: list[TrackedObject] = []
 
 
 def _actual_height_for_label(label: str) -> float:
@@ -42,9 +51,23 @@ def _direction_from_bbox(bbox: Iterable[int], frame_width: int) -> str:
     return "center"
 
 
-def _determine_severity(obj: "ncs_inference.DetectedObject", distance: float) -> str:
+def _is_approaching(track: TrackedObject | None) -> bool:
+    return (
+        track is not None
+        and track.confirmed
+        and track.closing_speed_mps >= CAR_APPROACHING_SPEED_THRESHOLD
+    )
+
+
+def _determine_severity(
+    obj: "ncs_inference.DetectedObject",
+    distance: float,
+    track: TrackedObject | None = None,
+) -> str:
     if obj.label == "car" and distance <= CAR_APPROACHING_MIN_DISTANCE_M:
         return "critical"
+    if obj.label == "car" and _is_approaching(track):
+        return "high"
     if obj.label == "car":
         return "mid"
     if obj.label == "person" and distance <= PERSON_NEAR_DISTANCE_M:
@@ -52,26 +75,61 @@ def _determine_severity(obj: "ncs_inference.DetectedObject", distance: float) ->
     return "low"
 
 
-def process_frame(frame) -> list[Event]:
-    """Call `detect_objects` and translate detections into events."""
+def reset_tracking() -> None:
+    """Forget all tracks and cached detections (e.g. after the camera was idle)."""
+    _tracker.reset()
+    _motion_gate.reset()
+    _last_tracks.clear()
+
+
+def motion_gate_stats() -> dict:
+    """Detector calls skipped (hits) vs. run (misses) by the motion gate."""
+    return _motion_gate.stats()
+
+
+def process_frame(frame, timestamp: float | None = None) -> list[Event]:
+    """Call `detect_objects` (unless the motion gate reuses the last result),
+    track detections across frames and emit events.
+
+    Reused detections are not fed to the tracker, which would read them as
+    a stationary object; their tracks are reused instead.  The gate is
+    bypassed while a car track is confirmed so its closing speed stays live.
+
+    ``timestamp`` is the capture time in seconds on the monotonic clock;
+    it defaults to now.
+    """
     camera_events: list[Event] = []
     frame_shape = getattr(frame, "shape", None)
     frame_height = frame_shape[0] if frame_shape else 480
     frame_width = frame_shape[1] if frame_shape else 640
-    detections = ncs_inference.detect_objects(frame)
-    for detection in detections:
-        distance = _estimate_distance(detection.bbox, detection.label)
+    detections = list(_motion_gate(frame, force=_tracker.has_confirmed("car", timestamp)))
+    distances = [_estimate_distance(d.bbox, d.label) for d in detections]
+    if _motion_gate.last_hit and len(_last_tracks) == len(detections):
+        tracks = list(_last_tracks)
+    else:
+        tracks = _tracker.update(
+            np.array([d.bbox for d in detections], dtype=np.float64).reshape(-1, 4),
+            [d.label for d in detections],
+            np.array(distances, dtype=np.float64),
+            timestamp,
+        )
+        _last_tracks[:] = tracks
+    for detection, distance, track in zip(detections, distances, tracks):
         direction = _direction_from_bbox(detection.bbox, frame_width)
-        severity = _determine_severity(detection, distance)
-        event = Event(
-            event_id=str(uuid.uuid4()),
-            ts=datetime.now(timezone.utc),
+        severity = _determine_severity(detection, distance, track)
+        extra = {
+            "confidence": detection.confidence,
+            "track_id": track.track_id,
+        }
+        if track.confirmed:
+            extra["closing_speed_mps"] = round(track.closing_speed_mps, 2)
+        event = Event.new(
             type=f"vision.{detection.label}",
             source="camera",
             severity=severity,
             distance_m=distance,
             direction=direction,
-            extra={"confidence": detection.confidence},
+            extra=extra,
         )
         camera_events.append(event)
     return camera_events
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import heapq
+import os
+import subprocess
 import threading
 import time
 try:
@@ -11,6 +14,7 @@ except ImportError:
 import pyttsx3
 
 from pi4.core.logger import get_logger
+from pi4.core.tracing import TRACER
 
 PriorityLevels = Literal["high", "mid", "low"]
 
@@ -25,7 +29,7 @@ LOGGER = get_logger("voice_output")
 
 class VoiceOutput:
     def __init__(self) -> None:
-        self._queue: list[tuple[int, int, str, str | None]] = []
+        self._queue: list[tuple[int, int, str, str | None, str | None]] = []
         self._counter = 0
         self._lock = threading.Lock()
         self._busy = False
@@ -50,7 +54,8 @@ class VoiceOutput:
             return
         self._counter += 1
         level = _PRIORITY_MAP.get(priority, 1)
-        heapq.heappush(self._queue, (level, self._counter, text, source))
+        trace_id = TRACER.current_trace_id()
+        heapq.heappush(self._queue, (level, self._counter, text, source, trace_id))
         LOGGER.info(
             "Queued voice [%s]%s: %s",
             priority,
@@ -64,40 +69,11 @@ class VoiceOutput:
             self._busy = True
             try:
                 while self._queue:
-                    priority, _, text, source = heapq.heappop(self._queue)
+                    priority, _, text, source, trace_id = heapq.heappop(self._queue)
                     
                     try:
-                        import os
-                        import subprocess
-                        if os.name == 'nt':
-                            # Use PowerShell for reliable blocking TTS on Windows
-                            # Escape single quotes in text
-                            safe_text = text.replace("'", "''")
-                            cmd = f"Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak('{safe_text}')"
-                            subprocess.run(["powershell", "-c", cmd], check=True)
-                        else:
-                            # Upgrade to Edge-TTS for natural human voice (requires internet)
-                            # Command: edge-tts --text "Hello" --write-media /tmp/tts.mp3 --voice zh-TW-HsiaoChenNeural
-                            # Then play with mpg123
-                            try:
-                                # Check if edge-tts is available (user setup required)
-                                tmp_audio = "/tmp/smart_cane_tts.mp3"
-                                # Use python3 -m edge_tts to avoid PATH issues (since it installed into .local/bin)
-                                cmd_gen = [
-                                    "python3", "-m", "edge_tts",
-                                    "--text", text,
-                                    "--write-media", tmp_audio,
-                                    "--voice", "zh-TW-HsiaoChenNeural"
-                                ]
-                                subprocess.run(cmd_gen, check=True, capture_output=True)
-                                
-                                cmd_play = ["mpg123", tmp_audio]
-                                subprocess.run(cmd_play, check=True, capture_output=True)
-                            except (FileNotFoundError, subprocess.CalledProcessError) as e:
-                                # Fallback to robotic espeak if edge-tts fails or offline
-                                LOGGER.warning("Edge-TTS failed: %s, falling back to espeak", e)
-                                cmd = ["espeak", "-v", "zh", "-s", "150", text] 
-                                subprocess.run(cmd, check=False)
+                        with TRACER.activate(trace_id), TRACER.span("voice.speak"):
+                            _speak_text(text)
                         
                         LOGGER.info(
                             "Spoke voice [%s]%s: %s",
@@ -115,6 +91,34 @@ class VoiceOutput:
             finally:
                 self._busy = False
 
+    async def speak_async(
+        self, text: str, priority: PriorityLevels = "mid", source: str | None = None
+    ) -> None:
+        """Speak text via awaitable TTS subprocesses (for the asyncio runtime)."""
+        if not text:
+            return
+        with self._lock:
+            self._busy = True
+        try:
+            with TRACER.span("voice.speak"):
+                await _speak_text_async(text)
+            LOGGER.info(
+                "Spoke voice [%s]%s: %s",
+                priority,
+                _format_source_tag(source),
+                text,
+            )
+        except Exception:
+            LOGGER.exception(
+                "Voice output failed [%s]%s: %s",
+                priority,
+                _format_source_tag(source),
+                text,
+            )
+        finally:
+            with self._lock:
+                self._busy = False
+
     def is_busy(self) -> bool:
         with self._lock:
             return self._busy
@@ -129,5 +133,76 @@ class VoiceOutput:
             time.sleep(0.01)
 
 
+_TMP_AUDIO_PATH = "/tmp/smart_cane_tts.mp3"
+
+
+def _powershell_command(text: str) -> list[str]:
+    # Use PowerShell for reliable blocking TTS on Windows
+    # Escape single quotes in text
+    safe_text = text.replace("'", "''")
+    cmd = f"Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak('{safe_text}')"
+    return ["powershell", "-c", cmd]
+
+
+def _edge_tts_commands(text: str) -> tuple[list[str], list[str]]:
+    # Upgrade to Edge-TTS for natural human voice (requires internet)
+    # Command: edge-tts --text "Hello" --write-media /tmp/tts.mp3 --voice zh-TW-HsiaoChenNeural
+    # Then play with mpg123
+    # Use python3 -m edge_tts to avoid PATH issues (since it installed into .local/bin)
+    cmd_gen = [
+        "python3", "-m", "edge_tts",
+        "--text", text,
+        "--write-media", _TMP_AUDIO_PATH,
+        "--voice", "zh-TW-HsiaoChenNeural"
+    ]
+    cmd_play = ["mpg123", _TMP_AUDIO_PATH]
+    return cmd_gen, cmd_play
+
+
+def _espeak_command(text: str) -> list[str]:
+    return ["espeak", "-v", "zh", "-s", "150", text]
+
+
+def _speak_text(text: str) -> None:
+    """Speak text with the platform TTS, blocking until playback ends."""
+    if os.name == 'nt':
+        subprocess.run(_powershell_command(text), check=True)
+        return
+    try:
+        # Check if edge-tts is available (user setup required)
+        cmd_gen, cmd_play = _edge_tts_commands(text)
+        subprocess.run(cmd_gen, check=True, capture_output=True)
+        subprocess.run(cmd_play, check=True, capture_output=True)
+    except (FileNotFoundError, subprocess.CalledProcessError) as e:
+        # Fallback to robotic espeak if edge-tts fails or offline
+        LOGGER.warning("Edge-TTS failed: %s, falling back to espeak", e)
+        subprocess.run(_espeak_command(text), check=False)
+
+
+async def _run_async(cmd: list[str], check: bool = True) -> None:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    returncode = await proc.wait()
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+async def _speak_text_async(text: str) -> None:
+    """Awaitable counterpart of `_speak_text`; the event loop stays free."""
+    if os.name == 'nt':
+        await _run_async(_powershell_command(text))
+        return
+    try:
+        cmd_gen, cmd_play = _edge_tts_commands(text)
+        await _run_async(cmd_gen)
+        await _run_async(cmd_play)
+    except (FileNotFoundError, subprocess.CalledProcessError) as e:
+        LOGGER.warning("Edge-TTS failed: %s, falling back to espeak", e)
+        await _run_async(_espeak_command(text), check=False)
+
+
 def _format_source_tag(source: str | None) -> str:
     return f" [{source}]" if source else ""
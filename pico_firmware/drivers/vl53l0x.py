@@ -1,16 +1,45 @@
-
 # Minimal VL53L0X MicroPython driver (I2C)
+# Single-shot, back-to-back and timed continuous ranging; register sequences
+# follow ST's API as used by the Pololu VL53L0X library.
 import time
 _VL53_ADDR = 0x29
 
 SYSRANGE_START       = 0x00
+RESULT_INTERRUPT_STATUS = 0x13
 RESULT_RANGE_STATUS  = 0x14
 SYSTEM_SEQUENCE_CONFIG = 0x01
 SYSTEM_INTERRUPT_CLEAR = 0x0B
 FINAL_RANGE_CONFIG_MIN_COUNT_RATE_RTN_LIMIT = 0x44
+MSRC_CONFIG_TIMEOUT_MACROP = 0x46
+PRE_RANGE_CONFIG_VCSEL_PERIOD = 0x50
+PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI = 0x51
 MSRC_CONFIG_CONTROL  = 0x60
+FINAL_RANGE_CONFIG_VCSEL_PERIOD = 0x70
+FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI = 0x71
 SYSTEM_INTERMEASUREMENT_PERIOD = 0x04
 GLOBAL_CONFIG_REF_EN_START_SELECT = 0xB6
+OSC_CALIBRATE_VAL    = 0xF8
+
+# SYSRANGE_START modes
+_MODE_SINGLESHOT = 0x01
+_MODE_BACK_TO_BACK = 0x02
+_MODE_TIMED = 0x04
+
+MIN_TIMING_BUDGET_US = 20000
+
+try:
+    _sleep_ms = time.sleep_ms
+    _ticks_ms = time.ticks_ms
+    _ticks_diff = time.ticks_diff
+except AttributeError:  # CPython (host-side tests)
+    def _sleep_ms(ms):
+        time.sleep(ms / 1000)
+
+    def _ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def _ticks_diff(a, b):
+        return a - b
 
 def _i2c_write8(i2c, reg, val):
     i2c.writeto_mem(_VL53_ADDR, reg, bytes([val & 0xFF]))
@@ -18,6 +47,10 @@ def _i2c_write8(i2c, reg, val):
 def _i2c_write16(i2c, reg, val):
     i2c.writeto_mem(_VL53_ADDR, reg, bytes([(val >> 8) & 0xFF, val & 0xFF]))
 
+def _i2c_write32(i2c, reg, val):
+    i2c.writeto_mem(_VL53_ADDR, reg, bytes([(val >> 24) & 0xFF, (val >> 16) & 0xFF,
+                                            (val >> 8) & 0xFF, val & 0xFF]))
+
 def _i2c_read8(i2c, reg):
     return i2c.readfrom_mem(_VL53_ADDR, reg, 1)[0]
 
@@ -25,15 +58,45 @@ def _i2c_read16(i2c, reg):
     b = i2c.readfrom_mem(_VL53_ADDR, reg, 2)
     return (b[0] << 8) | b[1]
 
+def _decode_vcsel_period(reg):
+    return (reg + 1) << 1
+
+def _macro_period_ns(vcsel_period_pclks):
+    return ((2304 * vcsel_period_pclks * 1655) + 500) // 1000
+
+def _mclks_to_us(mclks, vcsel_period_pclks):
+    macro_ns = _macro_period_ns(vcsel_period_pclks)
+    return ((mclks * macro_ns) + (macro_ns // 2)) // 1000
+
+def _us_to_mclks(us, vcsel_period_pclks):
+    macro_ns = _macro_period_ns(vcsel_period_pclks)
+    return ((us * 1000) + (macro_ns // 2)) // macro_ns
+
+def _decode_timeout(reg):
+    return ((reg & 0xFF) << (reg >> 8)) + 1
+
+def _encode_timeout(mclks):
+    if mclks <= 0:
+        return 0
+    ls = mclks - 1
+    ms = 0
+    while ls > 0xFF:
+        ls >>= 1
+        ms += 1
+    return (ms << 8) | (ls & 0xFF)
+
 class VL53L0X:
-    def __init__(self, i2c, address=_VL53_ADDR):
+    def __init__(self, i2c, address=_VL53_ADDR, timing_budget_us=None):
         self.i2c = i2c
         self.addr = address
+        self.continuous = False
         try:
             _ = _i2c_read8(self.i2c, 0xC0)
         except OSError:
             raise OSError("VL53L0X not found at 0x%02X" % self.addr)
         self._init_sensor()
+        if timing_budget_us:
+            self.set_timing_budget(timing_budget_us)
 
     def _init_sensor(self):
         _i2c_write8(self.i2c, 0x88, 0x00)
@@ -58,9 +121,9 @@ class VL53L0X:
         _i2c_write8(self.i2c, SYSTEM_INTERRUPT_CLEAR, 0x01)
 
         self._stop_variable = stop_variable
-        self.stop()
+        _i2c_write8(self.i2c, SYSRANGE_START, 0x00)
 
-    def start(self, period_ms=0):
+    def _load_stop_variable(self):
         _i2c_write8(self.i2c, 0x80, 0x01)
         _i2c_write8(self.i2c, 0xFF, 0x01)
         _i2c_write8(self.i2c, 0x00, 0x00)
@@ -68,23 +131,127 @@ class VL53L0X:
         _i2c_write8(self.i2c, 0x00, 0x01)
         _i2c_write8(self.i2c, 0xFF, 0x00)
         _i2c_write8(self.i2c, 0x80, 0x00)
+
+    # ---- timing budget ----
+
+    def _sequence_steps(self):
+        config = _i2c_read8(self.i2c, SYSTEM_SEQUENCE_CONFIG)
+        enables = {
+            "tcc": (config >> 4) & 1,
+            "dss": (config >> 3) & 1,
+            "msrc": (config >> 2) & 1,
+            "pre_range": (config >> 6) & 1,
+            "final_range": (config >> 7) & 1,
+        }
+        pre_vcsel = _decode_vcsel_period(_i2c_read8(self.i2c, PRE_RANGE_CONFIG_VCSEL_PERIOD))
+        msrc_mclks = _i2c_read8(self.i2c, MSRC_CONFIG_TIMEOUT_MACROP) + 1
+        pre_mclks = _decode_timeout(_i2c_read16(self.i2c, PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI))
+        final_vcsel = _decode_vcsel_period(_i2c_read8(self.i2c, FINAL_RANGE_CONFIG_VCSEL_PERIOD))
+        final_mclks = _decode_timeout(_i2c_read16(self.i2c, FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI))
+        if enables["pre_range"]:
+            final_mclks -= pre_mclks
+        timeouts = {
+            "msrc_dss_tcc_us": _mclks_to_us(msrc_mclks, pre_vcsel),
+            "pre_range_mclks": pre_mclks,
+            "pre_range_us": _mclks_to_us(pre_mclks, pre_vcsel),
+            "final_range_vcsel": final_vcsel,
+            "final_range_us": _mclks_to_us(final_mclks, final_vcsel),
+        }
+        return enables, timeouts
+
+    def _overhead_us(self, enables, timeouts):
+        used = 1910 + 960  # start + end overhead
+        if enables["tcc"]:
+            used += timeouts["msrc_dss_tcc_us"] + 590
+        if enables["dss"]:
+            used += 2 * (timeouts["msrc_dss_tcc_us"] + 690)
+        elif enables["msrc"]:
+            used += timeouts["msrc_dss_tcc_us"] + 660
+        if enables["pre_range"]:
+            used += timeouts["pre_range_us"] + 660
+        return used
+
+    def timing_budget(self):
+        """Current measurement timing budget in microseconds."""
+        enables, timeouts = self._sequence_steps()
+        budget = self._overhead_us(enables, timeouts)
+        if enables["final_range"]:
+            budget += timeouts["final_range_us"] + 550
+        return budget
+
+    def set_timing_budget(self, budget_us):
+        """Time allowed for one measurement; longer is more accurate, shorter is faster.
+
+        Returns False if the budget is below what the enabled steps need.
+        """
+        if budget_us < MIN_TIMING_BUDGET_US:
+            return False
+        enables, timeouts = self._sequence_steps()
+        if not enables["final_range"]:
+            return True
+        used = self._overhead_us(enables, timeouts) + 550
+        if used > budget_us:
+            return False
+        final_mclks = _us_to_mclks(budget_us - used, timeouts["final_range_vcsel"])
+        if enables["pre_range"]:
+            final_mclks += timeouts["pre_range_mclks"]
+        _i2c_write16(self.i2c, FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, _encode_timeout(final_mclks))
+        return True
+
+    # ---- ranging ----
+
+    def start(self, period_ms=0):
+        """Start continuous ranging: back-to-back (0) or one measurement every ``period_ms``."""
+        self._load_stop_variable()
         if period_ms and period_ms > 0:
-            _i2c_write16(self.i2c, SYSTEM_INTERMEASUREMENT_PERIOD, period_ms)
-        _i2c_write8(self.i2c, SYSRANGE_START, 0x02)
+            osc_calibrate = _i2c_read16(self.i2c, OSC_CALIBRATE_VAL)
+            if osc_calibrate:
+                period_ms *= osc_calibrate
+            _i2c_write32(self.i2c, SYSTEM_INTERMEASUREMENT_PERIOD, period_ms)
+            _i2c_write8(self.i2c, SYSRANGE_START, _MODE_TIMED)
+        else:
+            _i2c_write8(self.i2c, SYSRANGE_START, _MODE_BACK_TO_BACK)
+        self.continuous = True
 
     def stop(self):
-        _i2c_write8(self.i2c, SYSRANGE_START, 0x00)
+        _i2c_write8(self.i2c, SYSRANGE_START, _MODE_SINGLESHOT)
+        _i2c_write8(self.i2c, 0xFF, 0x01)
+        _i2c_write8(self.i2c, 0x00, 0x00)
+        _i2c_write8(self.i2c, 0x91, 0x00)
+        _i2c_write8(self.i2c, 0x00, 0x01)
+        _i2c_write8(self.i2c, 0xFF, 0x00)
+        self.continuous = False
+
+    def data_ready(self):
+        return (_i2c_read8(self.i2c, RESULT_INTERRUPT_STATUS) & 0x07) != 0
 
-    def _read_blocking_range(self):
-        for _ in range(100):
-            if _i2c_read8(self.i2c, RESULT_RANGE_STATUS) & 0x01:
-                break
-            time.sleep_ms(10)
+    def read_if_ready(self):
+        """Distance in mm if a new measurement is waiting, else None (never blocks)."""
+        if not self.data_ready():
+            return None
         dist = _i2c_read16(self.i2c, RESULT_RANGE_STATUS + 10)
         _i2c_write8(self.i2c, SYSTEM_INTERRUPT_CLEAR, 0x01)
         return dist
 
-    def read(self):
-        if _i2c_read8(self.i2c, SYSRANGE_START) == 0x00:
-            _i2c_write8(self.i2c, SYSRANGE_START, 0x01)
-        return self._read_blocking_range()
+    def _wait_range(self, timeout_ms):
+        start = _ticks_ms()
+        while True:
+            dist = self.read_if_ready()
+            if dist is not None:
+                return dist
+            if _ticks_diff(_ticks_ms(), start) > timeout_ms:
+                raise OSError("VL53L0X range timeout")
+            _sleep_ms(1)
+
+    def read(self, timeout_ms=500):
+        """Blocking read: the next continuous measurement, or a single shot."""
+        if self.continuous:
+            return self._wait_range(timeout_ms)
+        self._load_stop_variable()
+        _i2c_write8(self.i2c, SYSRANGE_START, _MODE_SINGLESHOT)
+        start = _ticks_ms()
+        while _i2c_read8(self.i2c, SYSRANGE_START) & 0x01:
+            if _ticks_diff(_ticks_ms(), start) > timeout_ms:
+                raise OSError("VL53L0X start timeout")
+            _sleep_ms(1)
+        return self._wait_range(timeout_ms)
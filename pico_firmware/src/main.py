@@ -1,6 +1,7 @@
-# main.py (robust, no flush) — VL53L0X JSON streamer with boot-time retry
+# main.py (robust, no flush) — VL53L0X JSON / binary streamer with boot-time retry
 from machine import Pin, I2C
-import sys, ujson, utime
+import sys, ujson, utime, select
+from tof_frame import FrameWriter, KIND_TOF, KIND_TRIGGER
 
 LED = None
 try:
@@ -36,6 +37,45 @@ def send(obj):
         except Exception:
             pass
 
+# ---- Reading format, negotiated by the Pi ----
+# Boots as JSON lines; the Pi may send {"cmd":"proto","mode":"bin1"} to switch
+# readings to 14-byte frames (tof_frame.py). Status messages stay JSON.
+PROTO = "json"
+frames = FrameWriter(getattr(sys.stdout, "buffer", sys.stdout))
+_poller = select.poll()
+_poller.register(sys.stdin, select.POLLIN)
+_cmd = ""
+
+def poll_commands():
+    global _cmd, PROTO
+    while _poller.poll(0):
+        ch = sys.stdin.read(1)
+        if ch in ("\n", "\r"):
+            line, _cmd = _cmd, ""
+            if not line:
+                continue
+            try:
+                msg = ujson.loads(line)
+            except ValueError:
+                continue
+            if msg.get("cmd") == "proto" and msg.get("mode") in ("json", "bin1"):
+                PROTO = msg["mode"]
+                send({"src":"pico","event":"proto","mode":PROTO})
+        elif len(_cmd) < 64:
+            _cmd += ch
+
+def send_reading(kind, d, now):
+    if PROTO == "bin1":
+        try:
+            frames.write(kind, now, d)
+            _flush()
+        except Exception:
+            pass
+    elif kind == KIND_TRIGGER:
+        send({"src":"pico", "event":"trigger", "d_mm": d, "ts": now})
+    else:
+        send({"src":"pico", "type":"tof", "d_mm": d, "ts": now})
+
 # ---- Wake sensor on XSHUT if available ----
 try:
     xshut = Pin(2, Pin.OUT, value=1)   # drive high
@@ -70,9 +110,20 @@ if not ready:
 else:
     send({"src":"pico","event":"boot","msg":"VL53L0X detected"})
 
+# ---- Ranging ----
+# Continuous ranging: the sensor measures on its own and the loop picks each
+# result up as soon as it is ready. RANGING_PERIOD_MS = 0 is back-to-back
+# (one result per timing budget, ~30 Hz at 33 ms); > 0 is timed mode.
+TIMING_BUDGET_US = 33000
+RANGING_PERIOD_MS = 0
+IDLE_SLEEP_MS = 1
+READING_TIMEOUT_MS = 500
+
 def make_sensor():
     from vl53l0x import VL53L0X
-    return VL53L0X(i2c)
+    s = VL53L0X(i2c, timing_budget_us=TIMING_BUDGET_US)
+    s.start(RANGING_PERIOD_MS)
+    return s
 
 sensor = None
 while sensor is None:
@@ -86,34 +137,34 @@ while sensor is None:
 TRIGGER_DIST_MM = 1200
 TRIGGER_COOLDOWN_MS = 2000
 last_trigger_time = 0
+last_reading_time = utime.ticks_ms()
 
 while True:
     try:
-        d = int(sensor.read())
-        led(toggle=True)
-        
+        poll_commands()
+        d = sensor.read_if_ready()
         now = utime.ticks_ms()
-        # Always send raw data for debugging/logging (optional, or reduce frequency)
-        # For event-triggered system, we might still want a heartbeat or periodic update
-        # But let's stick to the plan: send trigger when close.
-        
+        if d is None:
+            # Nothing new yet; a measurement takes a whole timing budget.
+            if utime.ticks_diff(now, last_reading_time) > READING_TIMEOUT_MS:
+                raise OSError("VL53L0X stopped ranging")
+            utime.sleep_ms(IDLE_SLEEP_MS)
+            continue
+        last_reading_time = now
+        d = int(d)
+        led(toggle=True)
+
         # Check trigger
         if d > 0 and d < TRIGGER_DIST_MM:
             if utime.ticks_diff(now, last_trigger_time) > TRIGGER_COOLDOWN_MS:
-                send({"src":"pico", "event":"trigger", "d_mm": d, "ts": now})
+                send_reading(KIND_TRIGGER, d, now)
                 last_trigger_time = now
-                # Blink fast to indicate trigger
-                for _ in range(3):
-                    led(toggle=True)
-                    utime.sleep_ms(50)
-        
-        # Send heartbeat/status every 1s so Pi knows we are alive
-        if utime.ticks_diff(now, last_trigger_time) > 5000: # If no trigger for 5s, send a keepalive
-             # We can just send the distance as a regular update
-             send({"src":"pico", "type":"tof", "d_mm": d, "ts": now})
-        
-        utime.sleep_ms(100) # 10Hz sampling
-        
+                led(on=True)  # stays lit until the next reading toggles it
+
+        # If no trigger for 5s, stream the distance as a regular update / keepalive
+        if utime.ticks_diff(now, last_trigger_time) > 5000:
+            send_reading(KIND_TOF, d, now)
+
     except KeyboardInterrupt:
         send({"src":"pico","event":"stopped"})
         led(on=False)
@@ -125,3 +176,4 @@ while True:
             sensor = make_sensor()
         except Exception:
             pass
+        last_reading_time = utime.ticks_ms()
@@ -0,0 +1,50 @@
+# tof_frame.py — binary reading frames for the Pi (MicroPython)
+# Layout must match pi4/safety/cane_client/tof_protocol.py:
+#   A5 5A | kind u8 | flags u8 | seq u16 | ts u32 | d_mm u16 | crc16 u16   (little-endian)
+# CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over kind..d_mm.
+import struct
+
+KIND_TOF = 0
+KIND_TRIGGER = 1
+
+_FRAME = "<BBBBHIHH"
+FRAME_SIZE = 14
+
+
+def _make_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_TABLE = _make_table()
+
+
+def crc16(buf, start=0, end=None):
+    if end is None:
+        end = len(buf)
+    crc = 0xFFFF
+    for i in range(start, end):
+        crc = ((crc << 8) & 0xFFFF) ^ _TABLE[((crc >> 8) ^ buf[i]) & 0xFF]
+    return crc
+
+
+class FrameWriter:
+    """Packs readings into one reused buffer and writes them to a byte stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.seq = 0
+        self._buf = bytearray(FRAME_SIZE)
+
+    def write(self, kind, ts_ms, d_mm):
+        buf = self._buf
+        struct.pack_into(_FRAME, buf, 0, 0xA5, 0x5A, kind, 0, self.seq,
+                         ts_ms & 0xFFFFFFFF, max(0, min(d_mm, 0xFFFF)), 0)
+        struct.pack_into("<H", buf, 12, crc16(buf, 2, 12))
+        self.stream.write(buf)
+        self.seq = (self.seq + 1) & 0xFFFF
@@ -15,6 +15,26 @@ TEST_MODULES = [
     "tests.test_cane_safety",
     "tests.test_llm_clients",
     "tests.test_voice_control",
+    "tests.test_pipeline",
+    "tests.test_async_runtime",
+    "tests.test_tracing",
+    "tests.test_event_history",
+    "tests.test_event_bus",
+    "tests.test_event_batch",
+    "tests.test_analysis_store",
+    "tests.test_logger",
+    "tests.test_camera_grabber",
+    "tests.test_ncs_inference",
+    "tests.test_tracker",
+    "tests.test_motion_gate",
+    "tests.test_camera_sim",
+    "tests.test_frame_persistence",
+    "tests.test_incident_recorder",
+    "tests.test_tof_reader",
+    "tests.test_tof_protocol",
+    "tests.test_vl53l0x_driver",
+    "tests.test_detect_batch",
+    "tests.test_calibrate_detection",
 ]
 
 
@@ -4,9 +4,10 @@ import math
 import sys
 import time
 
-from pi4.core.config import PLATFORM
+from pi4.core.config import ASYNC_RUNTIME_ENABLED, PLATFORM
 from pi4.core.logger import get_logger
 from pi4.core.orchestrator import Orchestrator
+from pi4.safety.vision import ncs_inference
 
 # Import Voice Service if needed for future
 # from pi4.core.voice_service import VoiceControlService
@@ -15,9 +16,19 @@ logger = get_logger("run_service")
 
 def main() -> None:
     logger.info(f"Starting Smart Cane Service on {PLATFORM}...")
+    started = time.perf_counter()
     
     # Initialize Orchestrator
     orchestrator = Orchestrator()
+
+    # Compile the detector now so the first trigger does not pay for it
+    detector_report = ncs_inference.warm_up()
+    logger.info(
+        "Startup took %.0f ms (detector load %.0f ms, first inference %.0f ms)",
+        (time.perf_counter() - started) * 1e3,
+        detector_report.get("load_ms", 0.0),
+        detector_report.get("first_infer_ms", 0.0),
+    )
     
     # In the future, if we want Voice Launcher, we would initialization VoiceService here.
     # For now, we just run the safety loop indefinitely.
@@ -29,7 +40,13 @@ def main() -> None:
         # test_llm_connectivity.run_ollama_smoke_test()
 
         # Pass infinity for duration
-        orchestrator.main_loop(duration_sec=float("inf"))
+        if ASYNC_RUNTIME_ENABLED:
+            from pi4.core.async_runtime import AsyncOrchestratorRuntime
+
+            logger.info("Using asyncio runtime.")
+            AsyncOrchestratorRuntime(orchestrator).run_blocking(duration_sec=float("inf"))
+        else:
+            orchestrator.main_loop(duration_sec=float("inf"))
         
     except KeyboardInterrupt:
         logger.info("Service stopped by user (KeyboardInterrupt).")
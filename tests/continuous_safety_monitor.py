@@ -78,8 +78,9 @@ class ContinuousSafetyMonitor:
         return True
 
     def _process_once(self) -> None:
-        frame = camera_capture.get_frame()
-        events = vision_safety.process_frame(frame)
+        captured = camera_capture.capture()
+        events = vision_safety.process_frame(captured.image, captured.timestamp)
+        camera_capture.report_events(events, captured)
         if not events:
             print("沒有偵測到任何事件。")
             return
@@ -105,7 +106,12 @@ class ContinuousSafetyMonitor:
             # fallback if signal handler not triggered
             LOGGER.info("KeyboardInterrupt received, stopping monitor")
         finally:
-            LOGGER.info("Continuous safety monitor end")
+            stats = vision_safety.motion_gate_stats()
+            LOGGER.info(
+                "Continuous safety monitor end (detector skipped %d / ran %d frames)",
+                stats["hits"],
+                stats["misses"],
+            )
 
 
 def main() -> None:
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from pi4.core.analysis_store import AnalysisStore, import_legacy_txt
+from pi4.core.analysis_writer import AnalysisWriter
+
+SECOND = 1_000_000_000
+
+
+def test_rotation_and_range_reads(tmp_path) -> None:
+    store = AnalysisStore(tmp_path, segment_max_bytes=200, index_interval_bytes=60)
+    for index in range(20):
+        store.append({"n": index, "text": "前方有行人"}, ts_ns=(1000 + index) * SECOND)
+    assert len(store.segments()) > 2
+    assert [record.payload["n"] for record in store] == list(range(20))
+    window = [record.payload["n"] for record in store.read(1005.0, 1009.0)]
+    assert window == [5, 6, 7, 8, 9]
+    assert [record.payload["n"] for record in store.read(start=1018.0)] == [18, 19]
+    store.close()
+
+
+def test_reopen_truncates_torn_tail_and_keeps_time_order(tmp_path) -> None:
+    with AnalysisStore(tmp_path) as store:
+        store.append({"n": 0}, ts_ns=10 * SECOND)
+        store.append({"n": 1}, ts_ns=20 * SECOND)
+    segment = store.segments()[-1]
+    with open(segment, "ab") as handle:
+        handle.write(b"\x05\x00")
+    with AnalysisStore(tmp_path) as store:
+        # Earlier stamps are clamped so the log stays sorted.
+        store.append({"n": 2}, ts_ns=15 * SECOND)
+        records = list(store)
+    assert [record.payload["n"] for record in records] == [0, 1, 2]
+    assert records[-1].ts_ns == 20 * SECOND
+
+
+def test_import_legacy_txt(tmp_path) -> None:
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    for index, ts in enumerate(["2024-05-01T08:00:02", "2024-05-01T08:00:01"]):
+        payload = {"photo": None, "description": f"d{index}", "ts": ts, "tags": []}
+        (legacy / f"img_{index}.txt").write_text(json.dumps(payload), encoding="utf-8")
+    with AnalysisStore(tmp_path / "store") as store:
+        assert import_legacy_txt(store, legacy, remove=True) == 2
+        assert [record.payload["description"] for record in store] == ["d1", "d0"]
+    assert not list(legacy.glob("*.txt"))
+
+
+def test_import_legacy_txt_into_store_with_later_records(tmp_path) -> None:
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    for index, ts in enumerate(["2024-05-01T08:00:01", "2024-05-01T08:00:02"]):
+        payload = {"photo": None, "description": f"d{index}", "ts": ts, "tags": []}
+        (legacy / f"img_{index}.txt").write_text(json.dumps(payload), encoding="utf-8")
+    root = tmp_path / "store"
+    later_ns = 2_000_000_000 * SECOND
+    with AnalysisStore(root, segment_max_bytes=120, index_interval_bytes=40) as store:
+        store.append({"description": "live"}, ts_ns=later_ns)
+        assert import_legacy_txt(store, legacy) == 2
+        records = list(store)
+        # Legacy records keep their own time instead of the live record's.
+        assert [record.payload["description"] for record in records] == ["d0", "d1", "live"]
+        expected = datetime.fromisoformat("2024-05-01T08:00:01").timestamp()
+        assert records[0].ts_ns == int(expected * 1e9)
+        assert records[-1].ts_ns == later_ns
+        window = store.read(records[1].ts_ns / 1e9, records[1].ts_ns / 1e9)
+        assert [record.payload["description"] for record in window] == ["d1"]
+        store.append({"description": "next"}, ts_ns=later_ns + SECOND)
+    with AnalysisStore(root) as store:
+        assert [record.payload["description"] for record in store][-2:] == ["live", "next"]
+    assert not list(root.glob(".rebuild-*"))
+
+
+def test_writer_group_commits_and_flushes_on_close(tmp_path) -> None:
+    store = AnalysisStore(tmp_path)
+    writer = AnalysisWriter(store, maxsize=64, batch_size=4, flush_interval_sec=0.05)
+    for index in range(10):
+        assert writer.submit({"n": index}, ts_ns=(100 + index) * SECOND)
+    assert writer.flush(timeout=2.0)
+    assert writer.written == 10
+    writer.submit({"n": 10})
+    writer.close()
+    assert [record.payload["n"] for record in AnalysisStore(tmp_path)] == list(range(11))
+
+
+def test_writer_drops_when_queue_full(tmp_path) -> None:
+    class SlowStore(AnalysisStore):
+        def append_many(self, records):
+            gate.wait(2.0)
+            return super().append_many(records)
+
+    gate = threading.Event()
+    writer = AnalysisWriter(SlowStore(tmp_path), maxsize=2, batch_size=1, flush_interval_sec=0.01)
+    results = [writer.submit({"n": index}) for index in range(6)]
+    gate.set()
+    writer.close()
+    assert results.count(False) == writer.dropped > 0
+    assert writer.written + writer.dropped == 6
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
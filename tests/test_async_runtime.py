@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from pi4.core import async_runtime
+from pi4.core.event_schema import Event
+from pi4.core.orchestrator import VoiceAlert
+
+
+class FakeVoice:
+    def __init__(self, runtime_ref: list) -> None:
+        self.spoken: list[str] = []
+        self._runtime_ref = runtime_ref
+
+    async def speak_async(self, text, priority="mid", source=None) -> None:
+        self.spoken.append(text)
+        if len(self.spoken) == 2:
+            self._runtime_ref[0].stop()
+
+
+class FakeOrchestrator:
+    def __init__(self, runtime_ref: list) -> None:
+        self._triggers = [0.3, 0.15]
+        self.voice = FakeVoice(runtime_ref)
+        self.logged: list[VoiceAlert] = []
+
+    def _read_trigger(self):
+        return self._triggers.pop(0) if self._triggers else None
+
+    def _capture_frame(self, distance):
+        return "frame"
+
+    def _detect_events(self, distance, frame):
+        return [
+            Event(
+                event_id=f"evt-{distance}",
+                ts=datetime.now(timezone.utc),
+                type="tof.drop",
+                source="tof",
+                severity="high",
+                distance_m=distance,
+            )
+        ]
+
+    def _compose_alert(self, event):
+        text = f"drop {event.distance_m}"
+        return VoiceAlert(event=event, voice_text=text, rewritten=text, source_tag="NAN")
+
+    def _log_alert(self, alert) -> None:
+        self.logged.append(alert)
+
+    def _should_notify_caregiver(self, event) -> bool:
+        return False
+
+    def _summarize_danger_events(self) -> None:
+        return None
+
+
+def test_async_runtime_speaks_each_trigger(monkeypatch) -> None:
+    monkeypatch.setattr(async_runtime.tof_receiver, "serial_fileno", lambda: None)
+    runtime_ref: list = []
+    orch = FakeOrchestrator(runtime_ref)
+    runtime = async_runtime.AsyncOrchestratorRuntime(orch, poll_interval=0.001)
+    runtime_ref.append(runtime)
+
+    runtime.run_blocking(duration_sec=2.0)
+
+    assert orch.voice.spoken == ["drop 0.3", "drop 0.15"]
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pi4.safety.vision import ncs_inference
+from tools import calibrate_detection as calib
+
+WIDTH, HEIGHT = 640, 480
+THRESHOLDS = [0.2, 0.35, 0.5, 0.65, 0.8]
+
+
+def _random_rows(rng: np.random.Generator, count: int) -> np.ndarray:
+    """SSD rows with clustered (overlapping) boxes so NMS has work to do."""
+    centers = rng.uniform(0.2, 0.8, size=(3, 2))
+    picked = centers[rng.integers(0, 3, size=count)] + rng.normal(0, 0.03, size=(count, 2))
+    half = rng.uniform(0.05, 0.15, size=(count, 2))
+    rows = np.zeros((count + 1, 7), dtype=np.float32)
+    rows[:count, 1] = rng.integers(1, 3, size=count)
+    rows[:count, 2] = rng.uniform(0.1, 1.0, size=count)
+    rows[:count, 3:5] = picked - half
+    rows[:count, 5:7] = picked + half
+    rows[count] = [-1, 0, 0, 0, 0, 0, 0]
+    return rows
+
+
+class FakeModel:
+    """Returns a fixed SSD output per frame; frames carry their index in pixel (0, 0)."""
+
+    def __init__(self, outputs: list) -> None:
+        self.outputs = outputs
+
+    def infer(self, frame: np.ndarray) -> np.ndarray:
+        return self.outputs[int(frame[0, 0, 0])]
+
+
+def _frames(count: int) -> list:
+    frames = []
+    for index in range(count):
+        frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        frame[0, 0, 0] = index
+        frames.append(frame)
+    return frames
+
+
+def test_single_pass_sweep_equals_inference_per_threshold(monkeypatch) -> None:
+    monkeypatch.setattr(ncs_inference, "OPENVINO_NMS_IOU", 0.4)
+    rng = np.random.default_rng(7)
+    outputs = [_random_rows(rng, int(rng.integers(0, 12))) for _ in range(20)]
+    monkeypatch.setattr(ncs_inference, "_get_model", lambda: FakeModel(outputs))
+
+    candidates = calib.collect_candidates(_frames(len(outputs)), min(THRESHOLDS))
+    above_floor = sum(int(((raw[:, 2] >= min(THRESHOLDS)) & (raw[:, 0] >= 0)).sum()) for raw in outputs)
+    assert len(candidates.scores) < above_floor  # NMS suppressed some boxes
+    results = calib.sweep_thresholds(candidates, THRESHOLDS)
+    for threshold, result in zip(THRESHOLDS, results):
+        kept = candidates.scores >= np.float32(threshold)
+        per_frame = [
+            ncs_inference._parse_detections(raw, WIDTH, HEIGHT, min_confidence=threshold)
+            for raw in outputs
+        ]
+        for index, expected in enumerate(per_frame):
+            mine = kept & (candidates.frame_index == index)
+            assert candidates.class_ids[mine].tolist() == expected.class_ids.tolist()
+            assert candidates.scores[mine].tolist() == expected.confidences.tolist()
+            assert candidates.boxes[mine].tolist() == expected.boxes.astype(np.float32).tolist()
+        counts = [len(detections) for detections in per_frame]
+        assert result["ratio"] == pytest.approx(np.mean([count > 0 for count in counts]))
+        assert result["avg_detections"] == pytest.approx(np.mean(counts))
+        scores = np.concatenate([detections.confidences for detections in per_frame])
+        assert result["avg_confidence"] == pytest.approx(scores.mean() if len(scores) else 0.0)
+
+
+def test_precision_recall_on_hand_labelled_frames() -> None:
+    # Frame 0: person box matched by the 0.9 detection; the 0.6 duplicate is a false positive.
+    # Frame 1: a car detected at 0.4 and a missed person.
+    candidates = calib.Candidates(
+        frame_index=np.array([0, 0, 1, 1], dtype=np.int32),
+        class_ids=np.array([1, 1, 2, 1], dtype=np.int32),
+        scores=np.array([0.9, 0.6, 0.4, 0.3], dtype=np.float32),
+        boxes=np.array(
+            [[10, 10, 110, 210], [12, 12, 108, 205], [300, 200, 400, 260], [0, 0, 20, 20]],
+            dtype=np.float32,
+        ),
+        frame_count=2,
+    )
+    truth = {
+        0: (np.array([1]), np.array([[10, 10, 110, 210]], dtype=np.float32)),
+        1: (np.array([2, 1]), np.array([[300, 200, 400, 260], [500, 100, 600, 300]], dtype=np.float32)),
+    }
+    true_positive = calib.match_ground_truth(candidates, truth, iou_threshold=0.5)
+    assert true_positive.tolist() == [True, False, True, False]
+
+    curves = calib.precision_recall(candidates, true_positive, truth, [0.25, 0.5, 0.95])
+    person = [(point["precision"], point["recall"]) for point in curves["person"]]
+    assert person[0] == pytest.approx((1 / 3, 1 / 2))
+    assert person[1] == pytest.approx((1 / 2, 1 / 2))
+    assert np.isnan(person[2][0]) and person[2][1] == 0.0
+    car = [(point["precision"], point["recall"]) for point in curves["car"]]
+    assert car[0] == pytest.approx((1.0, 1.0))
+    assert np.isnan(car[1][0]) and car[1][1] == 0.0
+    assert curves["person"][0]["ground_truth"] == 2
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from pi4.safety.vision.camera_capture_sim import SimulatedVideoSource
+
+FPS = 20.0
+FRAMES = 20
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (64, 48))
+    if not writer.isOpened():
+        pytest.skip("no MJPG encoder available")
+    for index in range(FRAMES):
+        writer.write(np.full((48, 64, 3), index * 12, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def _index(frame: np.ndarray) -> int:
+    return int(round(float(frame.mean()) / 12))
+
+
+def test_fast_pacing_yields_every_frame_and_loops(video) -> None:
+    source = SimulatedVideoSource(video, pacing="fast", prefetch=4)
+    try:
+        seen = [_index(source.get_frame()) for _ in range(FRAMES + 5)]
+    finally:
+        source.stop()
+    assert seen == list(range(FRAMES)) + list(range(5))
+    assert source.loops >= 1
+
+
+def test_seek_discards_prefetched_frames(video) -> None:
+    source = SimulatedVideoSource(video, pacing="fast", prefetch=4)
+    try:
+        source.get_frame()
+        source.seek(0.5)
+        frame, position = source.read()
+    finally:
+        source.stop()
+    assert _index(frame) == 10
+    assert position == pytest.approx(0.5, abs=0.01)
+
+
+def test_realtime_pacing_skips_to_newest_frame(video) -> None:
+    source = SimulatedVideoSource(video, pacing="realtime", loop=False)
+    try:
+        first = _index(source.get_frame())
+        time.sleep(0.3)
+        later = _index(source.get_frame())
+    finally:
+        source.stop()
+    # About 6 frames were due while the caller slept; only the newest is returned.
+    assert 4 <= later - first <= 9
+
+
+def test_stops_at_end_without_loop(video) -> None:
+    source = SimulatedVideoSource(video, pacing="fast", loop=False)
+    try:
+        frames = [source.get_frame() for _ in range(FRAMES)]
+        with pytest.raises(RuntimeError):
+            source.read(timeout=0.5)
+    finally:
+        source.stop()
+    assert len(frames) == FRAMES
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -6,6 +6,7 @@ from uuid import uuid4
 import pytest
 
 from pi4.core.event_schema import Event
+from pi4.safety.vision.camera_capture import CapturedFrame
 from tests.continuous_safety_monitor import ContinuousSafetyMonitor
 
 
@@ -37,10 +38,12 @@ def test_alert_triggered_within_limit(monkeypatch, capsys) -> None:
         voice_output=DummyVoiceOutput(),
     )
     monkeypatch.setattr(
-        "pi4.safety.vision.camera_capture.get_frame", lambda: "frame"
+        "pi4.safety.vision.camera_capture.capture",
+        lambda: CapturedFrame("frame", 0.0, 0.0),
     )
     monkeypatch.setattr(
-        "pi4.safety.vision.vision_safety.process_frame", lambda frame: events
+        "pi4.safety.vision.vision_safety.process_frame",
+        lambda frame, timestamp=None: events,
     )
 
     monitor._process_once()
@@ -59,10 +62,12 @@ def test_no_alert_above_limit(monkeypatch) -> None:
         voice_output=voice,
     )
     monkeypatch.setattr(
-        "pi4.safety.vision.camera_capture.get_frame", lambda: "frame"
+        "pi4.safety.vision.camera_capture.capture",
+        lambda: CapturedFrame("frame", 0.0, 0.0),
     )
     monkeypatch.setattr(
-        "pi4.safety.vision.vision_safety.process_frame", lambda frame: events
+        "pi4.safety.vision.vision_safety.process_frame",
+        lambda frame, timestamp=None: events,
     )
 
     monitor._process_once()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+from pi4.safety.vision import ncs_inference
+from tools import detect_from_latest_image as batch
+
+
+@pytest.fixture
+def stub_detector(monkeypatch):
+    calls = []
+
+    def detect(frame):
+        calls.append(frame.shape)
+        array = np.array([(2, 0.8, (10, 20, 30, 40))], dtype=ncs_inference.DETECTION_DTYPE)
+        return ncs_inference.Detections(array)
+
+    monkeypatch.setattr(ncs_inference, "warm_up", lambda runs=1: {})
+    monkeypatch.setattr(ncs_inference, "detect_objects", detect)
+    return calls
+
+
+def _records(output):
+    lines = output.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_run_batch_skips_done_and_duplicates_and_retries_failures(tmp_path, stub_detector) -> None:
+    images = tmp_path / "images"
+    images.mkdir()
+    frame = np.full((48, 64, 3), 128, dtype=np.uint8)
+    cv2.imwrite(str(images / "img_20250101120000_000.jpg"), frame)
+    (images / "img_20250101120001_000.jpg").write_bytes(b"not a jpeg")
+    output = tmp_path / "out" / "detections.jsonl"
+
+    summary = batch.run_batch(batch._iter_images(images, None, None), output, workers=1)
+    assert (summary["processed"], summary["failed"], summary["skipped"]) == (1, 1, 0)
+    good, bad = sorted(_records(output), key=lambda record: record["path"])
+    assert good["detections"] == [[2, 0.8, 10, 20, 30, 40]]
+    assert good["shape"] == [64, 48]
+    assert bad["error"] == "decode failed"
+
+    # Same content under a new name, plus a torn line from an interrupted run.
+    shutil.copy(images / "img_20250101120000_000.jpg", images / "img_20250101120002_000.jpg")
+    with output.open("a", encoding="utf-8") as handle:
+        handle.write('{"path": "torn')
+    hashes, stats = batch._load_results(output)
+    assert hashes == {good["sha1"]} and len(stats) == 1
+
+    summary = batch.run_batch(batch._iter_images(images, None, None), output, workers=1)
+    # The decoded image is skipped by stat, the copy by hash; the bad file is retried.
+    assert (summary["processed"], summary["failed"], summary["skipped"]) == (0, 1, 2)
+    assert len(stub_detector) == 1
+    # Records appended after the torn line are intact.
+    hashes, stats = batch._load_results(output)
+    assert hashes == {good["sha1"]} and len(stats) == 2
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from pi4.core.event_batch import EventBatch
+from pi4.core.event_schema import Event
+
+
+def _event(index: int, severity: str, distance: float | None, ts: float) -> Event:
+    return Event(
+        event_id=f"evt-{index}",
+        ts=datetime.fromtimestamp(ts, tz=timezone.utc),
+        type="vision.car" if index % 2 else "vision.person",
+        source="camera",
+        severity=severity,
+        distance_m=distance,
+        direction="left",
+        extra={"confidence": 0.5},
+    )
+
+
+def _sample() -> list[Event]:
+    return [
+        _event(0, "low", 1.0, 1000.0),
+        _event(1, "critical", 1.5, 1001.0),
+        _event(2, "high", 3.0, 1004.0),
+        _event(3, "high", None, 1005.0),
+        _event(4, "high", 0.8, 1006.0),
+    ]
+
+
+def test_roundtrip_preserves_events() -> None:
+    events = _sample()
+    batch = EventBatch.from_events(events)
+    assert len(batch) == 5
+    assert np.isnan(batch.distance_m[3])
+    restored = batch.to_events()
+    assert [event.to_dict() for event in restored] == [event.to_dict() for event in events]
+
+
+def test_filter_severity_distance_and_window() -> None:
+    batch = EventBatch.from_events(_sample())
+    hits = batch.filter(min_severity="high", max_distance_m=2.0, within_sec=5.0, now=1006.0)
+    assert hits.event_ids == ["evt-1", "evt-4"]
+    assert batch.filter(types=["vision.car"]).event_ids == ["evt-1", "evt-3"]
+    assert batch.most_urgent(2).event_ids == ["evt-1", "evt-4"]
+    assert batch.sort_by("distance_m").event_ids[:2] == ["evt-4", "evt-0"]
+
+
+def test_count_by_groups_and_aggregates() -> None:
+    batch = EventBatch.from_events(_sample())
+    counts = batch.count_by("type", "severity")
+    assert counts[0] == (("vision.person", "high"), 2)
+    assert sum(count for _, count in counts) == 5
+    assert batch.max_severity() == "critical"
+    assert batch.min_distance() == pytest.approx(0.8)
+    assert EventBatch.empty().count_by("type") == []
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pi4.core.event_bus import EventBus
+
+
+def test_sync_wildcard_subscription() -> None:
+    bus = EventBus(default_mode="sync")
+    received: list[tuple[str, int]] = []
+    bus.subscribe("*.events", lambda topic, payload: received.append((topic, payload)))
+    bus.publish("camera.events", 1)
+    bus.publish("cane.events", 2)
+    bus.publish("voice.command", 3)
+    assert received == [("camera.events", 1), ("cane.events", 2)]
+
+
+def test_threaded_subscriber_does_not_block_publisher() -> None:
+    bus = EventBus()
+    started = threading.Event()
+    release = threading.Event()
+    received: list[int] = []
+
+    def slow(topic: str, payload: int) -> None:
+        started.set()
+        release.wait(timeout=2.0)
+        received.append(payload)
+
+    sub = bus.subscribe("camera.events", slow, mode="thread", policy="drop_newest", maxsize=1)
+    bus.publish("camera.events", 0)
+    assert started.wait(timeout=2.0)
+    start = time.monotonic()
+    for value in range(1, 5):
+        bus.publish("camera.events", value)
+    assert time.monotonic() - start < 0.5
+    release.set()
+    bus.close()
+    # Worker holds item 0, queue keeps item 1, the rest are dropped.
+    assert received == [0, 1]
+    assert sub.dropped == 3
+
+
+def test_default_policy_never_stalls_publisher() -> None:
+    bus = EventBus()
+    release = threading.Event()
+    received: list[int] = []
+
+    def slow(topic: str, payload: int) -> None:
+        release.wait(timeout=2.0)
+        received.append(payload)
+
+    sub = bus.subscribe("danger.events", slow, mode="thread", maxsize=2, workers=2)
+    start = time.monotonic()
+    for value in range(10):
+        bus.publish("danger.events", value)
+    assert time.monotonic() - start < 0.5
+    release.set()
+    bus.close()
+    assert sub.dropped > 0
+    assert sub.delivered == len(received)
+    assert 9 in received  # the newest event survives
+
+
+def test_async_subscriber_receives_from_other_thread() -> None:
+    async def scenario() -> list[int]:
+        bus = EventBus()
+        received: list[int] = []
+        done = asyncio.Event()
+
+        async def handler(topic: str, payload: int) -> None:
+            received.append(payload)
+            if len(received) == 3:
+                done.set()
+
+        bus.subscribe("danger.events", handler, mode="async", policy="block", maxsize=1)
+        publisher = threading.Thread(
+            target=lambda: [bus.publish("danger.events", value) for value in range(3)]
+        )
+        publisher.start()
+        await asyncio.wait_for(done.wait(), timeout=2.0)
+        publisher.join()
+        bus.close()
+        return received
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import pytest
+
+from pi4.core.event_history import EventHistory
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_capacity_overwrites_oldest() -> None:
+    history = EventHistory(3, clock=FakeClock())
+    history.extend(["a", "b", "c", "d"])
+    assert history.snapshot() == ["b", "c", "d"]
+    assert history.latest(2) == ["c", "d"]
+
+
+def test_age_eviction_and_since_query() -> None:
+    clock = FakeClock()
+    history = EventHistory(4, max_age_sec=10.0, clock=clock)
+    for item in ("a", "b", "c", "d", "e"):
+        history.append(item)
+        clock.now += 3.0
+    # now = 115: "a" was overwritten, "b" (103) is older than 10 s
+    assert history.since(4.0) == ["e"]
+    assert history.since(7.0) == ["d", "e"]
+    clock.now = 118.5
+    assert history.snapshot() == ["d", "e"]
+    assert len(history) == 2
+
+
+def test_drain_empties_history() -> None:
+    history = EventHistory(2, clock=FakeClock())
+    history.append("a")
+    assert history.drain() == ["a"]
+    assert not history
+    assert list(history) == []
+
+
+def test_drain_within_keeps_burst_around_newest_item() -> None:
+    clock = FakeClock()
+    history = EventHistory(8, clock=clock)
+    for item, stamp in (("old", 100.0), ("a", 110.0), ("b", 111.5)):
+        history.append(item, stamp)
+    clock.now = 130.0  # e.g. after a long alert was spoken
+    assert history.drain(within_sec=2.0) == ["a", "b"]
+    assert len(history) == 0
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -52,5 +52,16 @@ def test_invalid_severity_raises() -> None:
         )
 
 
+def test_new_event_has_sortable_id_and_lazy_ts() -> None:
+    first = Event.new(type="tof.drop", source="tof", severity="high", distance_m=0.3)
+    second = Event.new(type="tof.drop", source="tof", severity="high", distance_m=0.3)
+    assert first.event_id < second.event_id
+    assert first.extra == {}
+    assert first.ts.tzinfo is timezone.utc
+    assert abs(first.ts.timestamp() - first.timestamp()) < 1e-3
+    restored = Event.from_dict(first.to_dict())
+    assert restored == first
+
+
 def run_tests_unit() -> bool:
     return pytest.main([__file__]) == 0
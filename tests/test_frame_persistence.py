@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from pi4.core.event_schema import Event
+from pi4.safety.vision.frame_persistence import FramePersistence, RetentionManager
+
+
+def _frame(value: int = 0) -> np.ndarray:
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def _event(severity: str) -> Event:
+    return Event.new(type="vision.object", source="camera", severity=severity)
+
+
+def test_burst_names_are_unique_and_written(tmp_path) -> None:
+    persistence = FramePersistence(tmp_path, policy="always", queue_size=16)
+    stamp = time.time()
+    names = [persistence.offer(_frame(index), timestamp=stamp) for index in range(5)]
+    assert persistence.flush(timeout=5.0)
+    persistence.close()
+    assert len(set(names)) == 5
+    assert sorted(path.name for path in tmp_path.glob("*.jpg")) == sorted(names)
+    assert persistence.latest_name == names[-1]
+
+
+def test_every_n_and_never_policies(tmp_path) -> None:
+    every = FramePersistence(tmp_path / "every", policy="every_n", every_n=3)
+    saved = [every.offer(_frame(), timestamp=1000.0 + index) for index in range(7)]
+    every.close()
+    assert [name is not None for name in saved] == [True, False, False, True, False, False, True]
+    never = FramePersistence(tmp_path / "never", policy="never")
+    assert never.offer(_frame()) is None
+    never.close()
+    assert not list((tmp_path / "never").iterdir())
+
+
+def test_severity_policy_saves_the_reported_frame_only_for_severe_events(tmp_path) -> None:
+    persistence = FramePersistence(tmp_path, policy="severity", min_severity="mid")
+    detected = _frame(40)
+    assert persistence.offer(detected, timestamp=1000.0) is None
+    assert persistence.note_events([_event("low")], detected, 1000.0) is None
+    # A newer frame is offered before the events of the first one come back.
+    assert persistence.offer(_frame(200), timestamp=1001.0) is None
+    name = persistence.note_events([_event("low"), _event("high")], detected, 1000.0)
+    assert name is not None
+    assert persistence.flush(timeout=5.0)
+    persistence.close()
+    assert [path.name for path in tmp_path.glob("*.jpg")] == [name]
+    saved = cv2.imread(str(tmp_path / name))
+    assert abs(float(saved.mean()) - 40) < 2
+
+
+def test_retention_prunes_oldest_first(tmp_path) -> None:
+    for index in range(4):
+        path = tmp_path / f"old_{index}.jpg"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000.0 + index, 1000.0 + index))
+    retention = RetentionManager(tmp_path, max_bytes=250, max_age_sec=0)
+    assert retention.prune() == 2
+    assert sorted(path.name for path in tmp_path.glob("*.jpg")) == ["old_2.jpg", "old_3.jpg"]
+    retention.max_age_sec = 10.0
+    assert retention.prune(now=1012.5) == 1
+    assert [path.name for path in tmp_path.glob("*.jpg")] == ["old_3.jpg"]
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
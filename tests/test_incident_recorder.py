@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from pi4.core.event_schema import Event
+from pi4.safety.vision.incident_recorder import IncidentRecorder
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _event(severity: str) -> Event:
+    return Event.new(type="vision.object", source="camera", severity=severity, distance_m=1.0)
+
+
+def _split_jpegs(data: bytes) -> list:
+    return data.split(b"\xff\xd8")[1:]
+
+
+def test_ring_keeps_only_recent_frames_in_memory(tmp_path) -> None:
+    clock = FakeClock()
+    recorder = IncidentRecorder(tmp_path, slots=4, window_sec=10.0, thumb_width=32, clock=clock)
+    for index in range(6):
+        clock.now += 1.0
+        recorder.record(np.full((48, 64, 3), index * 40, dtype=np.uint8))
+    assert len(recorder) == 4
+    assert recorder.note_events([_event("high")]) is False
+    assert not list(tmp_path.iterdir())
+
+
+def test_severe_event_writes_clip_and_sidecar(tmp_path) -> None:
+    clock = FakeClock()
+    recorder = IncidentRecorder(
+        tmp_path, slots=4, window_sec=2.5, thumb_width=32, min_severity="critical",
+        cooldown_sec=5.0, clock=clock,
+    )
+    for index in range(6):
+        clock.now += 1.0
+        recorder.record(np.full((48, 64, 3), index * 40, dtype=np.uint8))
+    assert recorder.note_events([_event("low"), _event("critical")]) is True
+    # Within the cooldown a second alert does not write another clip.
+    assert recorder.note_events([_event("critical")]) is False
+    assert recorder.flush(timeout=5.0)
+    recorder.close()
+
+    clips = list(tmp_path.glob("*.mjpeg"))
+    assert len(clips) == 1
+    sidecar = json.loads(clips[0].with_suffix(".json").read_text(encoding="utf-8"))
+    # Only the frames inside the 2.5 s window, downscaled to 32 px wide.
+    assert sidecar["frames"] == 3
+    assert (sidecar["width"], sidecar["height"]) == (32, 24)
+    assert sidecar["fps"] == pytest.approx(1.0)
+    assert [event["severity"] for event in sidecar["events"]] == ["critical"]
+    frames = [
+        cv2.imdecode(np.frombuffer(b"\xff\xd8" + part, np.uint8), cv2.IMREAD_COLOR)
+        for part in _split_jpegs(clips[0].read_bytes())
+    ]
+    assert [int(round(frame.mean() / 40)) for frame in frames] == [3, 4, 5]
+
+
+def test_grabber_fills_ring_before_any_trigger(tmp_path, monkeypatch) -> None:
+    from pi4.safety.vision import camera_capture_pi, frame_storage
+
+    class ColourCapture:
+        def read(self, image=None):
+            time.sleep(0.002)
+            return True, np.full((48, 64, 3), 90, dtype=np.uint8)
+
+        def grab(self) -> bool:
+            return True
+
+    recorder = IncidentRecorder(tmp_path, slots=16, window_sec=10.0, thumb_width=32)
+    monkeypatch.setattr(frame_storage, "get_incident_recorder", lambda: recorder)
+    grabber = camera_capture_pi.FrameGrabber(
+        ColourCapture(), slots=4, on_frame=camera_capture_pi._record_incident_frame
+    )
+    grabber.start()
+    try:
+        time.sleep(0.1)
+    finally:
+        grabber.stop()
+    # Nothing called save_frame / get_frame, yet the pre-trigger ring is full.
+    assert len(recorder) == 16
+    assert recorder.note_events([_event("critical")]) is True
+    assert recorder.flush(timeout=5.0)
+    recorder.close()
+    (clip,) = tmp_path.glob("*.mjpeg")
+    assert json.loads(clip.with_suffix(".json").read_text(encoding="utf-8"))["frames"] == 16
+
+
+def test_sim_camera_without_grabber_still_writes_clip(tmp_path, monkeypatch) -> None:
+    from pi4.safety.vision import camera_capture, camera_capture_sim, frame_storage
+    from pi4.safety.vision.frame_persistence import FramePersistence
+
+    recorder = IncidentRecorder(tmp_path, slots=8, window_sec=60.0, thumb_width=32, cooldown_sec=0.0)
+    persistence = FramePersistence(tmp_path / "img", policy="never")
+    monkeypatch.setattr(frame_storage, "get_incident_recorder", lambda: recorder)
+    monkeypatch.setattr(frame_storage, "get_persistence", lambda: persistence)
+    monkeypatch.setattr(camera_capture, "USE_SIMULATED_SENSORS", True)
+    monkeypatch.setattr(
+        camera_capture_sim, "get_frame", lambda: np.full((48, 64, 3), 120, dtype=np.uint8)
+    )
+    captures = [camera_capture.capture() for _ in range(3)]
+    assert len(recorder) == 3
+    camera_capture.report_events([_event("critical")], captures[-1])
+    assert recorder.flush(timeout=5.0)
+    recorder.close()
+    (clip,) = tmp_path.glob("*.mjpeg")
+    assert json.loads(clip.with_suffix(".json").read_text(encoding="utf-8"))["frames"] == 3
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import logging
+import queue
+
+import pytest
+
+from pi4.core.logger import NonBlockingQueueHandler, RateLimitFilter
+
+
+def _record(
+    created: float, lineno: int = 10, msg: str = "ToF reading", level: int = logging.INFO
+) -> logging.LogRecord:
+    record = logging.LogRecord("tof", level, "tof.py", lineno, msg, None, None)
+    record.created = created
+    return record
+
+
+def test_rate_limit_collapses_hot_call_site() -> None:
+    limiter = RateLimitFilter(interval_sec=1.0, burst=2)
+    passed = [limiter.filter(_record(100.0 + i * 0.1)) for i in range(8)]
+    assert passed == [True, True, False, False, False, False, False, False]
+    # Another call site has its own budget.
+    assert limiter.filter(_record(100.5, lineno=20))
+    summary = _record(101.2)
+    assert limiter.filter(summary)
+    assert summary.getMessage() == "ToF reading (6 similar suppressed)"
+
+
+def test_rate_limit_passes_warnings_and_flushes_quiet_sites() -> None:
+    limiter = RateLimitFilter(interval_sec=1.0, burst=1)
+    assert all(
+        limiter.filter(_record(100.0, msg=f"error {i}", level=logging.ERROR)) for i in range(5)
+    )
+    assert [limiter.filter(_record(100.0 + i * 0.1, msg=f"tick {i}")) for i in range(4)] == [
+        True, False, False, False,
+    ]
+    assert limiter.flush(now=100.5) == []  # window still open
+    (summary,) = limiter.flush(now=101.5)
+    assert summary.getMessage() == "tick 3 (3 similar suppressed)"
+    assert summary.levelno == logging.INFO and summary.lineno == 10
+    assert limiter.flush(now=103.0) == []
+
+
+def test_queue_handler_drops_instead_of_blocking() -> None:
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    for index in range(5):
+        handler.handle(_record(100.0, msg=f"msg {index}"))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
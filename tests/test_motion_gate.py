@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pi4.safety.vision.motion_gate import MotionGate
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_gate_reuses_result_for_static_scene_until_ttl() -> None:
+    calls = []
+    clock = FakeClock()
+    gate = MotionGate(lambda frame: calls.append(1) or len(calls), threshold=6.0, ttl_sec=1.0, clock=clock)
+    frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+    assert gate(frame) == 1
+    clock.now = 0.5
+    assert gate(frame.copy()) == 1
+    clock.now = 1.2
+    assert gate(frame) == 2
+    assert gate.stats()["hits"] == 1 and gate.stats()["misses"] == 2
+
+
+def test_gate_runs_detector_on_scene_change_and_bypasses_non_frames() -> None:
+    calls = []
+    clock = FakeClock()
+    gate = MotionGate(lambda frame: calls.append(1) or len(calls), clock=clock)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    gate(frame)
+    moved = frame.copy()
+    moved[100:400, 200:500] = 255
+    clock.now = 0.1
+    assert gate(moved) == 2
+    assert gate.last_diff > 6.0
+    # Small drift near the threshold shortens the reuse window.
+    drift = np.minimum(moved.astype(np.int16) + 3, 255).astype(np.uint8)
+    clock.now = 0.3
+    assert gate(drift) == 2
+    clock.now = 0.6
+    assert gate(drift) == 3
+    assert gate(object()) == 4
+
+
+def test_gate_sees_small_local_change() -> None:
+    calls = []
+    clock = FakeClock()
+    gate = MotionGate(lambda frame: calls.append(1) or len(calls), clock=clock)
+    frame = np.full((480, 640, 3), 60, dtype=np.uint8)
+    gate(frame)
+    # A car far away: about 1.5% of the frame.
+    car = frame.copy()
+    car[180:220, 300:360] = 200
+    clock.now = 0.1
+    assert gate(car) == 2
+    assert gate.last_diff > 6.0 and not gate.last_hit
+    clock.now = 0.2
+    assert gate(car) == 2 and gate.last_hit
+    clock.now = 0.3
+    assert gate(car, force=True) == 3 and not gate.last_hit
+
+
+def test_zero_threshold_disables_gate() -> None:
+    calls = []
+    gate = MotionGate(lambda frame: calls.append(1) or len(calls), threshold=0.0, clock=FakeClock())
+    frame = np.full((480, 640, 3), 100, dtype=np.uint8)
+    assert [gate(frame) for _ in range(3)] == [1, 2, 3]
+    assert not gate.enabled
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
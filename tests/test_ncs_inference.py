@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from pi4.safety.vision import ncs_inference
+
+
+def _raw_rows() -> np.ndarray:
+    return np.array(
+        [
+            [0, 1, 0.9, 0.1, 0.2, 0.5, 1.2],
+            [0, 2, 0.3, 0.0, 0.0, 0.1, 0.1],
+            [0, 2, 0.7, -0.1, 0.5, 0.4, 0.9],
+        ],
+        dtype=np.float32,
+    )
+
+
+def test_parse_detections_scales_and_filters() -> None:
+    detections = ncs_inference._parse_detections(_raw_rows(), 640, 480)
+    assert [d.label for d in detections] == ["person", "car"]
+    assert detections[0].bbox == (64, 96, 320, 480)
+    assert detections[1].bbox == (0, 240, 256, 432)
+
+
+def test_per_class_threshold_and_nms(monkeypatch) -> None:
+    monkeypatch.setattr(ncs_inference, "OPENVINO_CLASS_CONFIDENCE", {2: 0.25})
+    monkeypatch.setattr(ncs_inference, "OPENVINO_NMS_IOU", 0.5)
+    raw = np.vstack(
+        [
+            _raw_rows(),
+            [0, 1, 0.8, 0.11, 0.21, 0.5, 1.0],  # overlaps the first person box
+            [-1, 0, 0.0, 0, 0, 0, 0],
+        ]
+    ).astype(np.float32)
+    detections = ncs_inference._parse_detections(raw, 640, 480)
+    assert detections.labels == ["person", "car", "car"]
+    assert detections.confidences.tolist() == pytest.approx([0.9, 0.3, 0.7])
+    assert detections[1:].boxes.shape == (2, 4)
+    assert detections[0] == ncs_inference.DetectedObject("person", (64, 96, 320, 480), pytest.approx(0.9))
+
+
+def test_min_confidence_overrides_class_thresholds(monkeypatch) -> None:
+    monkeypatch.setattr(ncs_inference, "OPENVINO_CLASS_CONFIDENCE", {2: 0.8})
+    detections = ncs_inference._parse_detections(_raw_rows(), 640, 480, min_confidence=0.25)
+    assert detections.confidences.tolist() == pytest.approx([0.9, 0.3, 0.7])
+
+
+def _real_model_or_skip(monkeypatch, tmp_path) -> "ncs_inference._OpenVINOModel":
+    if ncs_inference.Core is None or not Path(ncs_inference.OPENVINO_MODEL_XML or "").exists():
+        pytest.skip("OpenVINO model not available")
+    # Compile into a throwaway cache instead of the repo's data/ov_cache.
+    monkeypatch.setattr(ncs_inference, "OPENVINO_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(ncs_inference, "_ov_model", None)
+    model = ncs_inference._get_model()
+    if model is None:
+        pytest.skip("OpenVINO model failed to load")
+    return model
+
+
+def test_async_matches_sync_detections(monkeypatch, tmp_path) -> None:
+    model = _real_model_or_skip(monkeypatch, tmp_path)
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(4)]
+    detector = ncs_inference.AsyncDetector(model, jobs=2)
+    seen = []
+    futures = [detector.submit(frame, callback=seen.append) for frame in frames]
+    results = [future.result(timeout=30) for future in futures]
+    assert len(seen) == len(frames)
+    for frame, detections in zip(frames, results):
+        assert detections == ncs_inference.detect_objects(frame)
+
+
+def test_graph_preprocessing_matches_python_path(monkeypatch, tmp_path) -> None:
+    _real_model_or_skip(monkeypatch, tmp_path)
+    frame = np.random.default_rng(1).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    graph = ncs_inference._OpenVINOModel(preprocess="graph")
+    python = ncs_inference._OpenVINOModel(preprocess="python")
+    blob = graph.prepare(frame)
+    assert np.shares_memory(blob, frame)
+    np.testing.assert_allclose(graph.infer(frame)[:, 2], python.infer(frame)[:, 2], atol=0.02)
+
+
+def test_cache_dir_key_tracks_device_and_version(monkeypatch, tmp_path) -> None:
+    if ncs_inference.Core is None:
+        pytest.skip("OpenVINO not installed")
+    monkeypatch.setattr(ncs_inference, "OPENVINO_CACHE_DIR", tmp_path)
+    cpu = ncs_inference._model_cache_dir("python")
+    monkeypatch.setattr(ncs_inference, "OPENVINO_DEVICE", "MYRIAD")
+    myriad = ncs_inference._model_cache_dir("python")
+    assert cpu.parent == myriad.parent == tmp_path
+    assert cpu != myriad and "MYRIAD" in myriad.name
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pi4.core import orchestrator as orchestrator_module
+from pi4.core.bounded_queue import BoundedQueue
+from pi4.core.event_schema import Event
+from pi4.core.pipeline import SafetyPipeline
+from pi4.safety.vision.camera_capture import CapturedFrame
+
+
+def test_bounded_queue_drop_oldest_keeps_latest() -> None:
+    q = BoundedQueue(2, policy="drop_oldest")
+    for item in (1, 2, 3):
+        q.put(item)
+    assert q.get(timeout=0) == 2
+    assert q.get(timeout=0) == 3
+    assert q.dropped == 1
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0)
+
+
+def test_bounded_queue_drop_newest_rejects_incoming() -> None:
+    q = BoundedQueue(1, policy="drop_newest")
+    assert q.put("a") is True
+    assert q.put("b") is False
+    assert q.get(timeout=0) == "a"
+
+
+def test_bounded_queue_drop_lowest_keeps_most_important() -> None:
+    q = BoundedQueue(2, policy="drop_lowest", priority=lambda item: item[0])
+    assert q.put((3, "critical"))
+    assert q.put((1, "mid"))
+    assert q.put((1, "newer mid"))  # evicts the older equal-rank item
+    assert q.put((0, "low")) is False
+    assert [q.get(timeout=0) for _ in range(2)] == [(3, "critical"), (1, "newer mid")]
+    assert q.dropped == 2
+
+
+def test_audio_queue_never_evicts_critical_for_newer_mid() -> None:
+    pipeline = SafetyPipeline(FakeOrchestrator([]), queue_size=1)
+    audio = pipeline.queues["audio"]
+    critical = SimpleNamespace(event=SimpleNamespace(severity="critical"))
+    mid = SimpleNamespace(event=SimpleNamespace(severity="mid"))
+    audio.put(("t1", critical))
+    assert audio.put(("t2", mid)) is False
+    assert audio.get(timeout=0) == ("t1", critical)
+
+
+class FakeOrchestrator:
+    """Orchestrator stand-in whose audio stage blocks until released."""
+
+    def __init__(self, triggers: list[float]) -> None:
+        self._triggers = list(triggers)
+        self.release_audio = threading.Event()
+        self.composed: list[float] = []
+        self.delivered: list[float] = []
+
+    def _read_trigger(self):
+        return self._triggers.pop(0) if self._triggers else None
+
+    def _capture_frame(self, distance):
+        return "frame"
+
+    def _detect_events(self, distance, frame):
+        return [distance]
+
+    def _compose_alert(self, event):
+        self.composed.append(event)
+        return event
+
+    def _deliver_alert(self, alert):
+        self.release_audio.wait(timeout=2.0)
+        self.delivered.append(alert)
+
+
+def test_pipeline_processes_new_trigger_while_speaking() -> None:
+    orch = FakeOrchestrator([1.0, 0.5])
+    pipeline = SafetyPipeline(orch, queue_size=2, poll_interval=0.001)
+    pipeline.start()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(orch.composed) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        # Second hazard composed although the first one is still "playing".
+        assert orch.composed == [1.0, 0.5]
+        assert orch.delivered == []
+        orch.release_audio.set()
+        while len(orch.delivered) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert orch.delivered == [1.0, 0.5]
+    finally:
+        orch.release_audio.set()
+        pipeline.stop()
+    assert not pipeline.is_running
+
+
+def _patch_camera(monkeypatch, frames: list, events: list) -> list:
+    """Capture ``frames`` in turn; every frame is saved as ``img_<pixel value>.jpg``."""
+    seen = []
+    stamps = iter(range(100, 200))
+
+    def capture():
+        stamp = float(next(stamps))
+        return CapturedFrame(frames.pop(0), stamp, stamp)
+
+    monkeypatch.setattr(orchestrator_module.camera_capture, "capture", capture)
+    monkeypatch.setattr(
+        orchestrator_module.camera_capture,
+        "note_events",
+        lambda found, frame, timestamp=None: f"img_{int(frame[0, 0, 0])}.jpg",
+    )
+    monkeypatch.setattr(
+        orchestrator_module.vision_safety,
+        "process_frame",
+        lambda image, timestamp=None: seen.append((image, timestamp)) or list(events),
+    )
+    monkeypatch.setattr(orchestrator_module.cane_safety, "eval_distance", lambda distance: [])
+    monkeypatch.setattr(orchestrator_module, "USE_UNDERSTANDING_LAYER", False)
+    return seen
+
+
+def test_detection_uses_capture_time_not_processing_time(monkeypatch) -> None:
+    frame = np.full((48, 64, 3), 200, dtype=np.uint8)
+    seen = _patch_camera(monkeypatch, [frame], [])
+    orch = orchestrator_module.Orchestrator()
+    captured = orch._capture_frame(2.0)
+    time.sleep(0.01)  # e.g. queued behind the previous trigger
+    orch._detect_events(2.0, captured)
+    assert seen == [(frame, 100.0)]
+
+
+def test_alert_is_logged_with_its_own_frame(monkeypatch) -> None:
+    event = Event.new(type="vision.car", source="camera", severity="high", distance_m=3.0)
+    frames = [np.full((48, 64, 3), value, dtype=np.uint8) for value in (50, 60)]
+    _patch_camera(monkeypatch, frames, [event])
+    logged = []
+    monkeypatch.setattr(
+        orchestrator_module, "log_analysis", lambda photo, *args, **kwargs: logged.append(photo)
+    )
+    orch = orchestrator_module.Orchestrator()
+    first = orch._capture_frame(2.0)
+    orch._capture_frame(1.0)  # the pipeline captures the next trigger meanwhile
+    (detected,) = orch._detect_events(2.0, first)
+    orch._log_alert(orch._compose_alert(detected))
+    assert logged == ["img_50.jpg"]
+
+
+def test_summary_covers_danger_window_before_newest_event(monkeypatch) -> None:
+    summarized = []
+    monkeypatch.setattr(orchestrator_module, "USE_UNDERSTANDING_LAYER", True)
+    monkeypatch.setattr(orchestrator_module, "DANGER_EVENT_WINDOW_SEC", 2.0)
+    monkeypatch.setattr(
+        orchestrator_module.understanding_ollama_client,
+        "summarize_events",
+        lambda batch: summarized.append(list(batch.event_ids)) or "",
+    )
+    orch = orchestrator_module.Orchestrator()
+    for name, stamp in (("stale", 10.0), ("first", 20.0), ("second", 21.0)):
+        event = Event.new(type="vision.car", source="camera", severity="high")
+        event.event_id = name
+        orch.recent_danger_events.append(event, stamp)
+    # Summarised long after the alert (speech) finished; the window still applies.
+    orch._summarize_danger_events()
+    assert summarized == [["first", "second"]]
+    assert not orch.recent_danger_events
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from pi4.safety.cane_client.tof_protocol import (FRAME_SIZE, KIND_TOF,
+                                                 KIND_TRIGGER, MODE_BINARY,
+                                                 StreamDecoder, crc16,
+                                                 encode_frame, mode_command)
+
+
+def test_frame_layout_and_crc() -> None:
+    frame = encode_frame(KIND_TRIGGER, seq=7, ts_ms=123456, d_mm=850)
+    assert len(frame) == FRAME_SIZE == 14
+    assert frame[:2] == b"\xa5\x5a"
+    # CRC-16/CCITT-FALSE check value
+    assert crc16(b"123456789") == 0x29B1
+    assert StreamDecoder().feed(frame) == [(123456, 850, KIND_TRIGGER)]
+
+
+def test_mixed_stream_decodes_across_any_chunking() -> None:
+    stream = (
+        b'{"src":"pico","event":"boot","msg":"VL53L0X detected"}\n'
+        + b'{"src":"pico","type":"tof","d_mm":3000,"ts":1}\n'
+        + json.dumps({"src": "pico", "event": "proto", "mode": MODE_BINARY}).encode() + b"\n"
+        + b"".join(encode_frame(KIND_TOF, seq, 100 + seq, 2000 + seq) for seq in range(5))
+        + b'{"src":"pico","event":"error","detail":"i2c"}\n'
+        + encode_frame(KIND_TRIGGER, 5, 105, 900)
+    )
+    expected = [(1, 3000, KIND_TOF)] + [(100 + seq, 2000 + seq, KIND_TOF) for seq in range(5)]
+    expected.append((105, 900, KIND_TRIGGER))
+    for step in (1, 3, 13, len(stream)):
+        decoder = StreamDecoder()
+        readings = []
+        for start in range(0, len(stream), step):
+            readings.extend(decoder.feed(stream[start : start + step]))
+        assert readings == expected
+        assert decoder.mode == MODE_BINARY
+        assert (decoder.frames, decoder.crc_errors, decoder.lost_frames) == (6, 0, 0)
+
+
+def test_corrupt_frame_is_skipped_and_gap_counted() -> None:
+    corrupt = bytearray(encode_frame(KIND_TOF, 1, 11, 1500))
+    corrupt[10] ^= 0xFF
+    stream = encode_frame(KIND_TOF, 0, 10, 1400) + bytes(corrupt) + encode_frame(KIND_TOF, 2, 12, 1600)
+    decoder = StreamDecoder()
+    assert decoder.feed(stream) == [(10, 1400, KIND_TOF), (12, 1600, KIND_TOF)]
+    assert decoder.crc_errors >= 1
+    assert decoder.lost_frames == 1
+
+
+def test_readings_with_bad_values_are_counted_not_raised() -> None:
+    decoder = StreamDecoder()
+    stream = (
+        b'{"type":"tof","d_mm":"abc","ts":1}\n'
+        b'{"event":"trigger","d_mm":900,"ts":null}\n'
+        b'{"type":"tof","d_mm":1.5e400,"ts":3}\n'
+        b'{"type":"tof","d_mm":1500,"ts":4}\n'
+    )
+    assert decoder.feed(stream) == [(4, 1500, KIND_TOF)]
+    assert decoder.bad_lines == 3
+
+
+def test_mode_command_is_one_json_line() -> None:
+    line = mode_command(MODE_BINARY)
+    assert line.endswith(b"\n")
+    assert json.loads(line) == {"cmd": "proto", "mode": "bin1"}
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import select
+import threading
+import time
+
+import pytest
+import serial
+
+from pi4.safety.cane_client.tof_reader import KIND_TOF, KIND_TRIGGER, TofReader
+
+
+class FakeSerial:
+    """Serves queued chunks, then fails once the script says the cable was pulled."""
+
+    def __init__(self, script: list) -> None:
+        self.script = script
+        self.closed = False
+        self.written = b""
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.script[0]) if self.script and isinstance(self.script[0], bytes) else 0
+
+    def reset_input_buffer(self) -> None:
+        pass
+
+    def write(self, data: bytes) -> int:
+        self.written += data
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self.script:
+            time.sleep(0.01)
+            return b""
+        item = self.script.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_feed_keeps_split_lines_and_wraps_ring() -> None:
+    reader = TofReader(capacity=4, opener=lambda *a, **k: None)
+    assert reader.feed(b'{"type":"tof","d_mm":3000,"ts":1}\n{"type":"to', host_ns=10) == 1
+    assert reader.feed(b'f","d_mm":3100,"ts":2}\nnot json\n', host_ns=20) == 1
+    for index in range(4):
+        reader.feed(b'{"type":"tof","d_mm":%d,"ts":%d}\n' % (4000 + index, 3 + index), host_ns=30 + index)
+    assert reader.bad_lines == 1
+    window = reader.window()
+    assert window["pico_ts"].tolist() == [3, 4, 5, 6]
+    assert reader.window(since_ns=32)["d_mm"].tolist() == [4002, 4003]
+
+
+def test_take_trigger_returns_each_trigger_once() -> None:
+    reader = TofReader(opener=lambda *a, **k: None)
+    reader.feed(b'{"type":"tof","d_mm":3000,"ts":1}\n', host_ns=10)
+    assert reader.take_trigger() is None
+    reader.feed(b'{"event":"trigger","d_mm":900,"ts":2}\n{"type":"tof","d_mm":800,"ts":3}\n', host_ns=20)
+    fd = reader.notify_fileno()
+    if fd is not None:
+        assert select.select([fd], [], [], 0)[0]
+    record = reader.take_trigger()
+    # Both lines qualify; the later one wins.
+    assert (record.d_mm, record.kind) == (800, KIND_TOF)
+    assert reader.take_trigger() is None
+    assert reader.latest_trigger().host_ns == 20
+    if fd is not None:
+        assert not select.select([fd], [], [], 0)[0]
+
+
+def test_reconnects_with_backoff_after_unplug() -> None:
+    opened = []
+    first = FakeSerial([b'{"event":"trigger","d_mm":700,"ts":1}\n', serial.SerialException("unplugged")])
+    ports = [
+        serial.SerialException("no device"),
+        first,
+        serial.SerialException("no device"),
+        FakeSerial([b'{"event":"trigger","d_mm":600,"ts":2}\n']),
+    ]
+    lock = threading.Lock()
+
+    def opener(*args, **kwargs):
+        with lock:
+            opened.append(time.monotonic())
+            item = ports.pop(0) if ports else serial.SerialException("gone")
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    reader = TofReader(
+        opener=opener, backoff_min_sec=0.01, backoff_max_sec=0.05, protocol="binary"
+    )
+    reader.start()
+    try:
+        assert _wait_for(lambda: len(reader) == 2)
+    finally:
+        reader.stop()
+    assert reader.reconnects == 1
+    assert first.written == b'{"cmd": "proto", "mode": "bin1"}\n'
+    assert [record["d_mm"] for record in reader.window()] == [700, 600]
+    assert reader.window()["kind"].tolist() == [KIND_TRIGGER, KIND_TRIGGER]
+
+
+def test_unexpected_error_reconnects_instead_of_ending_reader() -> None:
+    ports = [
+        FakeSerial([b'{"type":"tof","d_mm":"abc","ts":1}\n', RuntimeError("driver bug")]),
+        FakeSerial([b'{"event":"trigger","d_mm":600,"ts":2}\n']),
+    ]
+    def opener(*args, **kwargs):
+        if not ports:
+            raise serial.SerialException("gone")
+        return ports.pop(0)
+
+    reader = TofReader(opener=opener, backoff_min_sec=0.01, backoff_max_sec=0.05)
+    reader.start()
+    try:
+        assert _wait_for(lambda: len(reader) == 1)
+        assert reader.running
+    finally:
+        reader.stop()
+    assert reader.reconnects == 1
+    assert reader.bad_lines == 1
+    assert reader.take_trigger().d_mm == 600
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from pi4.core.tracing import (SPEECH_SPAN, TRIGGER_TO_SPEECH, Tracer,
+                              load_jsonl)
+
+
+def test_spans_grouped_by_trace_and_percentiles(tmp_path) -> None:
+    sink = tmp_path / "trace.jsonl"
+    tracer = Tracer(capacity=16, sink_path=sink, enabled=True)
+    trace_id = tracer.start_trace()
+    tracer.record("tof.serial", 0, 1_000_000)
+    tracer.record("ncs.detect_objects", 1_000_000, 41_000_000)
+    tracer.record(SPEECH_SPAN, 50_000_000, 900_000_000)
+    tracer.close()
+
+    assert [span.trace_id for span in tracer.spans()] == [trace_id] * 3
+    stats = tracer.stage_stats()
+    assert stats["ncs.detect_objects"]["p50"] == pytest.approx(40.0)
+    assert stats[TRIGGER_TO_SPEECH]["p99"] == pytest.approx(50.0)
+    assert len(load_jsonl(sink)) == 3
+
+
+def test_span_without_trace_is_ignored() -> None:
+    tracer = Tracer(capacity=4, sink_path=None, enabled=True)
+    result: list = []
+
+    def worker() -> None:
+        # New threads start without a current trace.
+        with tracer.span("camera.get_frame"):
+            result.append(tracer.current_trace_id())
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert result == [None]
+    assert tracer.spans() == []
+
+
+def test_activate_carries_trace_across_threads() -> None:
+    tracer = Tracer(capacity=4, sink_path=None, enabled=True)
+    trace_id = tracer.start_trace()
+
+    def worker() -> None:
+        with tracer.activate(trace_id), tracer.span(SPEECH_SPAN):
+            pass
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert [span.trace_id for span in tracer.spans()] == [trace_id]
+
+
+def test_trace_block_ends_the_trigger_trace() -> None:
+    tracer = Tracer(capacity=4, sink_path=None, enabled=True)
+    started: list = []
+
+    def worker() -> None:
+        with tracer.trace():
+            started.append(tracer.start_trace())
+            with tracer.span("camera.get_frame"):
+                pass
+        started.append(tracer.current_trace_id())
+        # Work after the trigger (e.g. a conversation reply) is not charged to it.
+        with tracer.span(SPEECH_SPAN):
+            pass
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert started[1] is None
+    assert [span.trace_id for span in tracer.spans()] == [started[0]]
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
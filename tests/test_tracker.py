@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pi4.safety.vision import ncs_inference, vision_safety
+from pi4.safety.vision.tracker import MultiObjectTracker
+
+
+def test_tracks_keep_ids_and_estimate_closing_speed() -> None:
+    tracker = MultiObjectTracker(iou_threshold=0.3, max_age_sec=1.0)
+    for step in range(15):
+        t = step * 0.1
+        distance = 10.0 - 2.0 * t  # closing at 2 m/s
+        boxes = np.array([[100 + step, 100, 200 + step, 300], [400, 50, 450, 150]])
+        tracks = tracker.update(boxes, ["car", "person"], [distance, 5.0], timestamp=t)
+    car, person = tracks
+    assert (car.track_id, person.track_id) == (1, 2)
+    assert car.confirmed
+    assert car.closing_speed_mps == pytest.approx(2.0, abs=0.3)
+    assert abs(person.closing_speed_mps) < 0.2
+
+
+def test_stale_tracks_expire_and_labels_do_not_mix() -> None:
+    tracker = MultiObjectTracker(max_age_sec=0.5)
+    box = np.array([[0, 0, 100, 100]])
+    first = tracker.update(box, ["car"], [5.0], timestamp=0.0)[0]
+    other_label = tracker.update(box, ["person"], [5.0], timestamp=0.1)[0]
+    assert other_label.track_id != first.track_id
+    later = tracker.update(box, ["car"], [5.0], timestamp=2.0)[0]
+    assert later.track_id not in (first.track_id, other_label.track_id)
+    assert len(tracker) == 1
+
+
+def test_process_frame_flags_approaching_car(monkeypatch) -> None:
+    vision_safety.reset_tracking()
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    height = {"px": 40}
+
+    def fake_detect(_frame):
+        top = 200 - height["px"] // 2
+        return [ncs_inference.DetectedObject("car", (300, top, 360, top + height["px"]), 0.9)]
+
+    monkeypatch.setattr(ncs_inference, "detect_objects", fake_detect)
+    # The frame never changes; only the fake detections move.
+    monkeypatch.setattr(vision_safety._motion_gate, "enabled", False)
+    severities = []
+    for step in range(8):
+        height["px"] = 40 + 3 * step  # about 7.5 m -> 4.9 m
+        events = vision_safety.process_frame(frame, timestamp=step * 0.2)
+        severities.append(events[0].severity)
+    assert severities[0] == "mid"
+    assert severities[-1] == "high"
+    assert events[0].extra["closing_speed_mps"] > 1.0
+    vision_safety.reset_tracking()
+
+
+def test_motion_gate_does_not_stall_closing_speed(monkeypatch) -> None:
+    """Gate on, real frames: a small approaching car must be tracked every frame."""
+    vision_safety.reset_tracking()
+    monkeypatch.setattr(vision_safety._motion_gate, "enabled", True)
+
+    def detect_bright(frame):
+        ys, xs = np.nonzero(frame[..., 0] > 150)
+        if not len(ys):
+            return []
+        box = (int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1)
+        return [ncs_inference.DetectedObject("car", box, 0.9)]
+
+    monkeypatch.setattr(ncs_inference, "detect_objects", detect_bright)
+    severities, speeds = [], []
+    for step in range(8):
+        frame = np.full((480, 640, 3), 60, dtype=np.uint8)
+        height = 40 + 3 * step  # about 7.5 m -> 4.9 m at 5 fps
+        top = 200 - height // 2
+        frame[top : top + height, 300 : 300 + int(height * 1.5)] = 200
+        events = vision_safety.process_frame(frame, timestamp=step * 0.2)
+        severities.append(events[0].severity)
+        speeds.append(events[0].extra.get("closing_speed_mps"))
+    assert severities[0] == "mid"
+    assert severities[-1] == "high"
+    # Once confirmed, every frame reports the car as closing.
+    assert all(speed > 0.5 for speed in speeds if speed is not None)
+    vision_safety.reset_tracking()
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
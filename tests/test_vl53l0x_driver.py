@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_DRIVER = Path(__file__).resolve().parents[1] / "pico_firmware" / "drivers" / "vl53l0x.py"
+_spec = importlib.util.spec_from_file_location("vl53l0x", _DRIVER)
+vl53l0x = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(vl53l0x)
+
+
+class FakeI2C:
+    """VL53L0X register map behind the MicroPython ``writeto_mem``/``readfrom_mem`` API.
+
+    Writes to 0xFF select a register page, as on the chip, so the
+    stop-variable sequences do not clobber SYSRANGE_START.
+    """
+
+    def __init__(self) -> None:
+        self.regs = {}
+        self.page = 0
+        self.auto_range = None  # distance a single-shot start produces
+        # Power-on timing registers: pre-range VCSEL 14 pclks, final-range 10 pclks.
+        self.set(vl53l0x.PRE_RANGE_CONFIG_VCSEL_PERIOD, [0x06])
+        self.set(vl53l0x.FINAL_RANGE_CONFIG_VCSEL_PERIOD, [0x04])
+        self.set(vl53l0x.MSRC_CONFIG_TIMEOUT_MACROP, [0x0C])
+        self.set(vl53l0x.PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI, [0x01, 0x4F])
+        self.set(vl53l0x.FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, [0x02, 0x9E])
+
+    def set(self, reg: int, values) -> None:
+        for offset, value in enumerate(values):
+            self.regs[(0, reg + offset)] = value
+
+    def get(self, reg: int, size: int = 1) -> int:
+        value = 0
+        for offset in range(size):
+            value = (value << 8) | self.regs.get((0, reg + offset), 0)
+        return value
+
+    def measure(self, d_mm: int) -> None:
+        self.set(vl53l0x.RESULT_RANGE_STATUS + 10, [d_mm >> 8, d_mm & 0xFF])
+        self.set(vl53l0x.RESULT_INTERRUPT_STATUS, [0x04])
+
+    def writeto_mem(self, addr: int, reg: int, data: bytes) -> None:
+        assert addr == 0x29
+        if reg == 0xFF:
+            self.page = data[0]
+            return
+        for offset, value in enumerate(data):
+            self.regs[(self.page, reg + offset)] = value
+        if self.page:
+            return
+        if reg == vl53l0x.SYSTEM_INTERRUPT_CLEAR:
+            self.set(vl53l0x.RESULT_INTERRUPT_STATUS, [0x00])
+        elif reg == vl53l0x.SYSRANGE_START and data[0] == 0x01 and self.auto_range is not None:
+            self.set(vl53l0x.SYSRANGE_START, [0x00])
+            self.measure(self.auto_range)
+
+    def readfrom_mem(self, addr: int, reg: int, size: int) -> bytes:
+        assert addr == 0x29
+        page = 0 if reg == 0xFF else self.page
+        return bytes(self.regs.get((page, reg + offset), 0) for offset in range(size))
+
+
+@pytest.fixture
+def bus() -> FakeI2C:
+    return FakeI2C()
+
+
+def test_back_to_back_ranging_reads_only_new_results(bus: FakeI2C) -> None:
+    sensor = vl53l0x.VL53L0X(bus)
+    sensor.start()
+    assert bus.get(vl53l0x.SYSRANGE_START) == 0x02
+    assert sensor.read_if_ready() is None
+
+    bus.measure(850)
+    assert sensor.read_if_ready() == 850
+    assert sensor.read_if_ready() is None  # interrupt cleared
+    bus.measure(3000)
+    assert sensor.read() == 3000
+
+
+def test_timed_ranging_scales_period_by_oscillator(bus: FakeI2C) -> None:
+    bus.set(vl53l0x.OSC_CALIBRATE_VAL, [0x0B, 0xB8])
+    sensor = vl53l0x.VL53L0X(bus)
+    sensor.start(50)
+    assert bus.get(vl53l0x.SYSRANGE_START) == 0x04
+    assert bus.get(vl53l0x.SYSTEM_INTERMEASUREMENT_PERIOD, 4) == 50 * 0x0BB8
+
+    sensor.stop()
+    assert not sensor.continuous
+    assert bus.get(vl53l0x.SYSRANGE_START) == 0x01
+
+
+def test_timing_budget_round_trips(bus: FakeI2C) -> None:
+    sensor = vl53l0x.VL53L0X(bus, timing_budget_us=33000)
+    assert sensor.timing_budget() == pytest.approx(33000, abs=50)
+    slow = bus.get(vl53l0x.FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, 2)
+
+    assert sensor.set_timing_budget(20000)
+    assert sensor.timing_budget() == pytest.approx(20000, abs=50)
+    assert vl53l0x._decode_timeout(bus.get(vl53l0x.FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI, 2)) < (
+        vl53l0x._decode_timeout(slow)
+    )
+    assert not sensor.set_timing_budget(10000)
+
+
+def test_single_shot_read_and_timeout(bus: FakeI2C) -> None:
+    sensor = vl53l0x.VL53L0X(bus)
+    bus.auto_range = 1234
+    assert sensor.read() == 1234
+
+    bus.auto_range = None
+    with pytest.raises(OSError):
+        sensor.read(timeout_ms=5)
+
+
+def run_tests_unit() -> bool:
+    return pytest.main([__file__]) == 0
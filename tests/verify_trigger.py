@@ -17,7 +17,7 @@ class TestTriggerLogic(unittest.TestCase):
     def setUp(self):
         # Mock dependencies
         self.mock_tof = patch('pi4.safety.cane_client.tof_receiver.read_latest_distance').start()
-        self.mock_capture = patch('pi4.safety.vision.camera_capture.get_frame').start()
+        self.mock_capture = patch('pi4.safety.vision.camera_capture.capture').start()
         # Mock detect_objects to return empty list or specific detections
         self.mock_detect = patch('pi4.safety.vision.ncs_inference.detect_objects').start()
         self.mock_detect.return_value = []
@@ -57,7 +57,9 @@ class TestTriggerLogic(unittest.TestCase):
             self.mock_tof.return_value = 1.0
             # Mock a valid frame (not blank)
             import numpy as np
-            self.mock_capture.return_value = np.ones((100, 100, 3), dtype=np.uint8) * 255
+            self.mock_capture.return_value = camera_capture.CapturedFrame(
+                np.ones((100, 100, 3), dtype=np.uint8) * 255, 0.0, 0.0
+            )
             # Mock vision events (e.g., person detected)
             from datetime import datetime
             fake_event = Event(
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pi4.core.event_schema import VALID_SEVERITIES, Event
+
+
+@dataclass
+class _LegacyEvent:
+    """Copy of the previous dataclass-based Event, kept for comparison."""
+
+    event_id: str
+    ts: datetime
+    type: str
+    source: str
+    severity: str
+    distance_m: Optional[float] = None
+    direction: Optional[str] = None
+    object_label: Optional[str] = None
+    extra: dict = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.severity not in VALID_SEVERITIES:
+            raise ValueError(f"Invalid severity: {self.severity}")
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["ts"] = self.ts.isoformat()
+        return data
+
+
+def _make_legacy(index: int) -> _LegacyEvent:
+    return _LegacyEvent(
+        event_id=str(uuid.uuid4()),
+        ts=datetime.now(timezone.utc),
+        type="vision.person",
+        source="camera",
+        severity="high",
+        distance_m=1.0 + index % 7,
+        direction="center",
+        extra={"confidence": 0.9},
+    )
+
+
+def _make_slotted(index: int) -> Event:
+    return Event.new(
+        type="vision.person",
+        source="camera",
+        severity="high",
+        distance_m=1.0 + index % 7,
+        direction="center",
+        extra={"confidence": 0.9},
+    )
+
+
+def _bench(factory: Callable[[int], object], count: int) -> dict:
+    start = time.perf_counter()
+    events = [factory(index) for index in range(count)]
+    create_us = (time.perf_counter() - start) / count * 1e6
+
+    start = time.perf_counter()
+    for event in events:
+        event.to_dict()
+    to_dict_us = (time.perf_counter() - start) / count * 1e6
+    del events
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    held = [factory(index) for index in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    bytes_per_event = (current - baseline) / count
+    del held
+    return {"create_us": create_us, "to_dict_us": to_dict_us, "bytes": bytes_per_event}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare per-event time and memory of Event vs. the old dataclass."
+    )
+    parser.add_argument("--count", "-n", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{args.count} events per run")
+    print(f"{'class':<10} {'create us':>10} {'to_dict us':>11} {'bytes/event':>12}")
+    for name, factory in (("dataclass", _make_legacy), ("slotted", _make_slotted)):
+        result = _bench(factory, args.count)
+        print(
+            f"{name:<10} {result['create_us']:>10.2f} {result['to_dict_us']:>11.2f} "
+            f"{result['bytes']:>12.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pi4.safety.vision import ncs_inference
+
+
+def _bench(mode: str, frame: np.ndarray, count: int) -> dict:
+    model = ncs_inference._OpenVINOModel(preprocess=mode)
+    model.infer(frame)  # first request allocates the runtime buffers
+
+    start = time.perf_counter()
+    for _ in range(count):
+        model.prepare(frame)
+    prepare_us = (time.perf_counter() - start) / count * 1e6
+
+    tracemalloc.start()
+    for _ in range(count):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        blob = model.prepare(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        del blob
+    tracemalloc.stop()
+    prepare_bytes = peak - before
+
+    start = time.perf_counter()
+    for _ in range(count):
+        model.infer(frame)
+    infer_ms = (time.perf_counter() - start) / count * 1e3
+    return {"prepare_us": prepare_us, "prepare_bytes": prepare_bytes, "infer_ms": infer_ms}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare Python-side vs. in-graph preprocessing for the detector."
+    )
+    parser.add_argument("--count", "-n", type=int, default=100)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    if ncs_inference.Core is None:
+        print("OpenVINO is not installed.", file=sys.stderr)
+        return 1
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+
+    print(f"{args.width}x{args.height} BGR frame, {args.count} runs per mode")
+    print(f"{'mode':<8} {'prepare us':>11} {'py alloc B':>11} {'prepare+infer ms':>17}")
+    for mode in ("python", "graph"):
+        result = _bench(mode, frame, args.count)
+        print(
+            f"{mode:<8} {result['prepare_us']:>11.1f} {result['prepare_bytes']:>11d} "
+            f"{result['infer_ms']:>17.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
 import argparse
+import json
 import time
-from statistics import mean
-from typing import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from pi4.core.config import CAMERA_DEVICE_INDEX
+import cv2
+import numpy as np
+
+from pi4.core.config import CAMERA_DEVICE_INDEX, OPENVINO_LABELS
 from pi4.core.logger import get_logger
 from pi4.safety.vision import camera_capture, ncs_inference
+from pi4.safety.vision.tracker import iou_matrix
 
 LOGGER = get_logger("calibrate_detection")
 
+# Per frame: (class_ids [G], boxes [G, 4]).
+GroundTruth = Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+
+@dataclass
+class Candidates:
+    """Every frame's detections above the lowest swept threshold, flattened.
+
+    Greedy NMS and score-ordered ground-truth matching only look at
+    higher-scored boxes, so filtering these by a higher threshold gives
+    exactly what inference at that threshold would have returned.
+    """
+
+    frame_index: np.ndarray
+    class_ids: np.ndarray
+    scores: np.ndarray
+    boxes: np.ndarray
+    frame_count: int
+
 
 def _capture_frames(sample_count: int, interval: float) -> list:
     frames = []
@@ -22,34 +47,157 @@ def _capture_frames(sample_count: int, interval: float) -> list:
     return frames
 
 
+def _load_frames(image_dir: Path, names: Optional[Iterable[str]] = None) -> Tuple[list, List[str]]:
+    paths = (
+        [image_dir / name for name in names]
+        if names is not None
+        else sorted(image_dir.glob("*.jpg"))
+    )
+    frames, loaded = [], []
+    for path in paths:
+        frame = cv2.imread(str(path))
+        if frame is None:
+            LOGGER.warning("Skipping unreadable image %s", path)
+            continue
+        frames.append(frame)
+        loaded.append(path.name)
+    return frames, loaded
+
+
+def _load_labels(path: Path) -> Dict[str, list]:
+    """``{"img_x.jpg": [["person", x1, y1, x2, y2], ...], ...}``; [] means no objects."""
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _ground_truth(labels: Dict[str, list], names: List[str]) -> GroundTruth:
+    class_for_label = {label: class_id for class_id, label in OPENVINO_LABELS.items()}
+    truth: GroundTruth = {}
+    for index, name in enumerate(names):
+        objects = labels.get(name, [])
+        class_ids = np.array([class_for_label[obj[0]] for obj in objects], dtype=np.int32)
+        boxes = np.array([obj[1:5] for obj in objects], dtype=np.float32).reshape(-1, 4)
+        truth[index] = (class_ids, boxes)
+    return truth
+
+
+def collect_candidates(frames: Iterable, floor: float) -> Candidates:
+    """Run inference once per frame and keep detections scoring at least ``floor``."""
+    model = ncs_inference._get_model()
+    if model is None:
+        raise RuntimeError("OpenVINO detector is not available")
+    indices, arrays = [], []
+    count = 0
+    for count, frame in enumerate(frames, start=1):
+        height, width = frame.shape[:2]
+        detections = ncs_inference._parse_detections(
+            model.infer(frame), width, height, min_confidence=floor
+        )
+        indices.append(np.full(len(detections), count - 1, dtype=np.int32))
+        arrays.append(detections.array)
+    merged = np.concatenate(arrays) if arrays else ncs_inference.Detections.empty().array
+    return Candidates(
+        frame_index=np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+        class_ids=merged["class_id"],
+        scores=merged["confidence"],
+        boxes=merged["bbox"].astype(np.float32),
+        frame_count=count,
+    )
+
+
+def sweep_thresholds(candidates: Candidates, thresholds: Iterable[float]) -> list[dict]:
+    """Detection ratio, average confidence and detections per frame for every threshold."""
+    values = np.asarray(list(thresholds), dtype=np.float32)
+    kept = candidates.scores[None, :] >= values[:, None]  # [T, D]
+    counts = kept.sum(axis=1)
+    per_frame = np.zeros((len(values), max(candidates.frame_count, 1)), dtype=np.int64)
+    rows, cols = np.nonzero(kept)
+    np.add.at(per_frame, (rows, candidates.frame_index[cols]), 1)
+    ratios = (per_frame > 0).sum(axis=1) / max(candidates.frame_count, 1)
+    confidence_sums = kept.astype(np.float64) @ candidates.scores.astype(np.float64)
+    average_confidence = np.divide(
+        confidence_sums, counts, out=np.zeros(len(values)), where=counts > 0
+    )
+    average_detections = counts / max(candidates.frame_count, 1)
+    return [
+        {
+            "threshold": float(threshold),
+            "ratio": float(ratio),
+            "avg_confidence": float(confidence),
+            "avg_detections": float(detections),
+        }
+        for threshold, ratio, confidence, detections in zip(
+            values.tolist(), ratios, average_confidence, average_detections
+        )
+    ]
+
+
+def match_ground_truth(
+    candidates: Candidates, truth: GroundTruth, iou_threshold: float = 0.5
+) -> np.ndarray:
+    """Mark each candidate a true positive if it claims an unmatched same-class box.
+
+    Candidates are matched per frame and class in descending score order.
+    """
+    true_positive = np.zeros(len(candidates.scores), dtype=bool)
+    for frame in np.unique(candidates.frame_index).tolist():
+        in_frame = np.flatnonzero(candidates.frame_index == frame)
+        truth_classes, truth_boxes = truth.get(frame, (np.zeros(0), np.zeros((0, 4))))
+        for class_id in np.unique(candidates.class_ids[in_frame]).tolist():
+            targets = truth_boxes[truth_classes == class_id]
+            if not len(targets):
+                continue
+            detections = in_frame[candidates.class_ids[in_frame] == class_id]
+            detections = detections[np.argsort(-candidates.scores[detections], kind="stable")]
+            iou = iou_matrix(candidates.boxes[detections], targets)
+            used = np.zeros(len(targets), dtype=bool)
+            for row, detection in enumerate(detections.tolist()):
+                overlaps = np.where(used, -1.0, iou[row])
+                best = int(np.argmax(overlaps))
+                if overlaps[best] >= iou_threshold:
+                    used[best] = True
+                    true_positive[detection] = True
+    return true_positive
+
+
+def precision_recall(
+    candidates: Candidates,
+    true_positive: np.ndarray,
+    truth: GroundTruth,
+    thresholds: Iterable[float],
+) -> Dict[str, list[dict]]:
+    """Per-class precision/recall at every threshold (NaN where undefined)."""
+    values = np.asarray(list(thresholds), dtype=np.float32)
+    truth_counts: Dict[int, int] = {}
+    for class_ids, _ in truth.values():
+        for class_id in class_ids.tolist():
+            truth_counts[class_id] = truth_counts.get(class_id, 0) + 1
+    classes = sorted(set(truth_counts) | set(np.unique(candidates.class_ids).tolist()))
+    curves: Dict[str, list[dict]] = {}
+    for class_id in classes:
+        in_class = candidates.class_ids == class_id
+        kept = candidates.scores[in_class][None, :] >= values[:, None]
+        predicted = kept.sum(axis=1)
+        hits = (kept & true_positive[in_class][None, :]).sum(axis=1)
+        expected = truth_counts.get(class_id, 0)
+        precision = np.divide(
+            hits, predicted, out=np.full(len(values), np.nan), where=predicted > 0
+        )
+        recall = hits / expected if expected else np.full(len(values), np.nan)
+        curves[ncs_inference._label_for_class(class_id)] = [
+            {"threshold": float(t), "precision": float(p), "recall": float(r), "ground_truth": expected}
+            for t, p, r in zip(values.tolist(), precision, recall)
+        ]
+    return curves
+
+
 def _evaluate_threshold(frames: Iterable, thresholds: Iterable[float]) -> list[dict]:
-    results = []
-    for threshold in thresholds:
-        previous_confidence = ncs_inference.OPENVINO_CONFIDENCE
-        try:
-            ncs_inference.OPENVINO_CONFIDENCE = threshold
-            detection_flags = []
-            confidences: list[float] = []
-            total_detections = 0
-            for frame in frames:
-                detections = ncs_inference.detect_objects(frame)
-                detection_flags.append(bool(detections))
-                total_detections += len(detections)
-                confidences.extend(det.confidence for det in detections)
-            detection_ratio = sum(detection_flags) / len(detection_flags)
-            average_confidence = mean(confidences) if confidences else 0.0
-            average_detections = total_detections / len(frames)
-            results.append(
-                {
-                    "threshold": threshold,
-                    "ratio": detection_ratio,
-                    "avg_confidence": average_confidence,
-                    "avg_detections": average_detections,
-                }
-            )
-        finally:
-            ncs_inference.OPENVINO_CONFIDENCE = previous_confidence
-    return results
+    thresholds = list(thresholds)
+    return sweep_thresholds(collect_candidates(frames, min(thresholds)), thresholds)
+
+
+def _format(value: float, pattern: str) -> str:
+    return "n/a" if np.isnan(value) else format(value, pattern)
 
 
 def main() -> None:
@@ -78,12 +226,35 @@ def main() -> None:
         default=[0.4, 0.3, 0.25, 0.2],
         help="List of confidence thresholds to evaluate.",
     )
+    parser.add_argument(
+        "--images",
+        help="Evaluate the .jpg files in this directory instead of sampling the camera.",
+    )
+    parser.add_argument(
+        "--labels",
+        help='Ground-truth JSON {"img.jpg": [["person", x1, y1, x2, y2], ...]} for '
+        "per-class precision/recall; requires --images and evaluates only labelled images.",
+    )
+    parser.add_argument(
+        "--iou", type=float, default=0.5, help="IoU needed to match a ground-truth box."
+    )
     args = parser.parse_args()
+    if args.labels and not args.images:
+        parser.error("--labels requires --images")
 
-    print("Starting calibration for camera device", CAMERA_DEVICE_INDEX)
-    frames = _capture_frames(args.samples, args.interval)
+    labels = _load_labels(Path(args.labels)) if args.labels else None
+    if args.images:
+        frames, names = _load_frames(Path(args.images), labels.keys() if labels else None)
+        print(f"Loaded {len(frames)} images from {args.images}")
+    else:
+        print("Starting calibration for camera device", CAMERA_DEVICE_INDEX)
+        frames, names = _capture_frames(args.samples, args.interval), []
     print("Evaluating thresholds", args.thresholds)
-    results = _evaluate_threshold(frames, args.thresholds)
+    start = time.perf_counter()
+    candidates = collect_candidates(frames, min(args.thresholds))
+    inference_sec = time.perf_counter() - start
+    results = sweep_thresholds(candidates, args.thresholds)
+    print(f"{len(frames)} inferences in {inference_sec:.1f}s, one per frame for all thresholds")
     headers = "threshold | detection ratio | avg detections | avg confidence"
     print(headers)
     print("---")
@@ -91,6 +262,17 @@ def main() -> None:
         print(
             f"{entry['threshold']:.2f} | {entry['ratio']:.2%} | {entry['avg_detections']:.2f} | {entry['avg_confidence']:.2f}"
         )
+    if labels is not None:
+        truth = _ground_truth(labels, names)
+        true_positive = match_ground_truth(candidates, truth, args.iou)
+        for label, curve in precision_recall(candidates, true_positive, truth, args.thresholds).items():
+            print(f"\n{label} ({curve[0]['ground_truth']} ground-truth boxes)")
+            print("threshold | precision | recall")
+            print("---")
+            for point in curve:
+                print(
+                    f"{point['threshold']:.2f} | {_format(point['precision'], '.2%')} | {_format(point['recall'], '.2%')}"
+                )
     print("Calibration complete. Choose the threshold that keeps detection ratio >50% without too many false positives.")
 
 
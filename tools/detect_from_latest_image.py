@@ -1,23 +1,37 @@
 from __future__ import annotations
 
-import glob
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import cv2
+import numpy as np
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from pi4.core.config import IMG_DIR
 from pi4.safety.vision import ncs_inference
 
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+_NAME_FORMAT = "img_%Y%m%d%H%M%S"
 
-def main() -> int:
-    image_dir = Path("data/img")
+# Content hashes already in the results file; set per worker by _init_worker.
+_known_hashes: Set[str] = set()
+
+
+def _run_latest(image_dir: Path) -> int:
     files = sorted(image_dir.glob("*.jpg"))
     if not files:
-        print("No saved images found in data/img", file=sys.stderr)
+        print(f"No saved images found in {image_dir}", file=sys.stderr)
         return 1
     latest = files[-1]
     frame = cv2.imread(str(latest))
@@ -34,5 +48,196 @@ def main() -> int:
     return 0
 
 
+def _image_time(path: Path) -> datetime:
+    """Capture time from a ``img_YYYYmmddHHMMSS`` name, else the file's mtime."""
+    try:
+        return datetime.strptime(path.stem[: len("img_") + 14], _NAME_FORMAT)
+    except ValueError:
+        return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def _iter_images(
+    image_dir: Path, since: Optional[datetime], until: Optional[datetime]
+) -> Iterator[Path]:
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() not in _IMAGE_SUFFIXES or not path.is_file():
+            continue
+        taken = _image_time(path)
+        if (since is None or taken >= since) and (until is None or taken <= until):
+            yield path
+
+
+def _load_results(output: Path) -> Tuple[Set[str], Set[Tuple[str, int, int]]]:
+    """Hashes and (path, size, mtime_ns) keys of images already in ``output``.
+
+    Error records are left out, so images that failed are retried.
+    """
+    hashes: Set[str] = set()
+    stats: Set[Tuple[str, int, int]] = set()
+    if not output.exists():
+        return hashes, stats
+    with output.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line of an interrupted run
+            if "error" in record:
+                continue
+            hashes.add(record["sha1"])
+            stats.add((record["path"], record["size"], record["mtime_ns"]))
+    return hashes, stats
+
+
+def _ends_torn(output: Path) -> bool:
+    if not output.exists() or output.stat().st_size == 0:
+        return False
+    with output.open("rb") as handle:
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) != b"\n"
+
+
+def _init_worker(known_hashes: Set[str]) -> None:
+    """Compile this worker's own detector once, before the first image."""
+    global _known_hashes
+    _known_hashes = known_hashes
+    ncs_inference.warm_up(runs=1)
+
+
+def _process(path_str: str) -> dict:
+    """Detect on one image, or mark it a duplicate if its content was already processed."""
+    path = Path(path_str)
+    stat = path.stat()
+    data = path.read_bytes()
+    record = {
+        "path": path_str,
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if record["sha1"] in _known_hashes:
+        # Still written out so the next run skips this file without hashing it.
+        record["duplicate"] = True
+        return record
+    start = time.perf_counter()
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    decoded = time.perf_counter()
+    record["decode_ms"] = round((decoded - start) * 1e3, 2)
+    if frame is None:
+        record["error"] = "decode failed"
+        return record
+    detections = ncs_inference.detect_objects(frame)
+    record["infer_ms"] = round((time.perf_counter() - decoded) * 1e3, 2)
+    record["shape"] = [frame.shape[1], frame.shape[0]]
+    # [class_id, confidence, x1, y1, x2, y2] per detection
+    record["detections"] = [
+        [int(class_id), round(float(confidence), 4), *map(int, bbox)]
+        for class_id, confidence, bbox in zip(
+            detections.class_ids, detections.confidences, detections.boxes
+        )
+    ]
+    return record
+
+
+def _records(
+    pending: List[str], known_hashes: Set[str], workers: int, chunksize: int
+) -> Iterator[dict]:
+    if workers <= 1:
+        # One worker gains nothing from a pool; run in this process.
+        _init_worker(known_hashes)
+        for path in pending:
+            yield _process(path)
+        return
+    # spawn: every worker builds its OpenVINO core from scratch instead of inheriting threads.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, _init_worker, (known_hashes,)) as pool:
+        yield from pool.imap_unordered(_process, pending, chunksize)
+
+
+def run_batch(
+    paths: Iterable[Path],
+    output: Path,
+    workers: int,
+    chunksize: int = 4,
+) -> Dict[str, float]:
+    """Stream ``paths`` through a process pool and append results to ``output``."""
+    known_hashes, known_stats = _load_results(output)
+    pending: List[str] = []
+    skipped = 0
+    for path in paths:
+        stat = path.stat()
+        if (str(path), stat.st_size, stat.st_mtime_ns) in known_stats:
+            skipped += 1
+        else:
+            pending.append(str(path))
+
+    done = failed = 0
+    infer_ms: List[float] = []
+    start = time.perf_counter()
+    if pending:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("a", encoding="utf-8") as handle:
+            if _ends_torn(output):
+                handle.write("\n")  # keep the first new record off the torn line
+            for record in _records(pending, known_hashes, workers, chunksize):
+                handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+                handle.flush()
+                if record.get("duplicate"):
+                    skipped += 1
+                elif "error" in record:
+                    failed += 1
+                else:
+                    done += 1
+                    infer_ms.append(record["infer_ms"])
+    elapsed = time.perf_counter() - start
+    return {
+        "processed": done,
+        "failed": failed,
+        "skipped": skipped,
+        "elapsed_sec": elapsed,
+        "images_per_sec": done / elapsed if elapsed > 0 else 0.0,
+        "median_infer_ms": float(np.median(infer_ms)) if infer_ms else 0.0,
+    }
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the detector on the newest saved frame, or on a whole archive with --batch."
+    )
+    parser.add_argument("--dir", default=str(IMG_DIR), help="Image directory (searched recursively in batch mode).")
+    parser.add_argument("--batch", action="store_true", help="Process every image instead of the newest one.")
+    parser.add_argument("--since", help="ISO time; only images captured at or after it.")
+    parser.add_argument("--until", help="ISO time; only images captured at or before it.")
+    parser.add_argument(
+        "--output",
+        default="data/detections.jsonl",
+        help="JSON-lines results file; images already in it are skipped. "
+        "Use a new file per model/threshold configuration.",
+    )
+    parser.add_argument("--workers", type=int, default=max((os.cpu_count() or 2) - 1, 1))
+    parser.add_argument("--chunksize", type=int, default=4)
+    args = parser.parse_args()
+
+    image_dir = Path(args.dir)
+    if not args.batch:
+        return _run_latest(image_dir)
+    if ncs_inference.Core is None:
+        print("OpenVINO is not installed.", file=sys.stderr)
+        return 1
+    paths = _iter_images(image_dir, _parse_time(args.since), _parse_time(args.until))
+    summary = run_batch(paths, Path(args.output), args.workers, args.chunksize)
+    print(
+        f"{summary['processed']} processed, {summary['skipped']} skipped, "
+        f"{summary['failed']} failed in {summary['elapsed_sec']:.1f}s "
+        f"({summary['images_per_sec']:.1f} img/s, median inference {summary['median_infer_ms']:.1f} ms)"
+    )
+    print(f"Results in {args.output}")
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
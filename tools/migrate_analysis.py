@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pi4.core.analysis_store import AnalysisStore, import_legacy_txt
+from pi4.core.config import ANALYZE_DIR
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _migrate(args: argparse.Namespace) -> int:
+    source = Path(args.source)
+    with AnalysisStore(args.store) as store:
+        count = import_legacy_txt(store, source, remove=args.remove)
+    action = "moved" if args.remove else "copied"
+    print(f"{count} legacy records {action} from {source} into {args.store}")
+    return 0
+
+
+def _dump(args: argparse.Namespace) -> int:
+    with AnalysisStore(args.store) as store:
+        for record in store.read(_parse_time(args.start), _parse_time(args.end)):
+            if args.description and record.payload.get("description") != args.description:
+                continue
+            print(json.dumps(record.payload, ensure_ascii=False))
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Migrate legacy data/analyze/*.txt files and read the segmented analysis store."
+    )
+    parser.add_argument("--store", default=str(ANALYZE_DIR), help="Store directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser("migrate", help="Import legacy per-record .txt files (stop the service first).")
+    migrate.add_argument("--source", default=str(ANALYZE_DIR), help="Directory with .txt files.")
+    migrate.add_argument("--remove", action="store_true", help="Delete .txt files after import.")
+    migrate.set_defaults(handler=_migrate)
+
+    dump = commands.add_parser("dump", help="Print records as JSON lines.")
+    dump.add_argument("--start", help="ISO time, e.g. 2024-05-01T08:00:00")
+    dump.add_argument("--end", help="ISO time (inclusive).")
+    dump.add_argument("--description", help="Only records with this description.")
+    dump.set_defaults(handler=_dump)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from pi4.core.tracing import format_report, load_jsonl, stage_percentiles
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Print per-stage p50/p95/p99 latency from a trace JSONL file."
+    )
+    parser.add_argument(
+        "path",
+        help="JSONL file written when SMART_CANE_TRACE_JSONL is set.",
+    )
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not path.exists():
+        print(f"Trace file not found: {path}", file=sys.stderr)
+        return 1
+    spans = load_jsonl(path)
+    if not spans:
+        print("No spans recorded.")
+        return 0
+    traces = {span.trace_id for span in spans}
+    print(f"{len(spans)} spans across {len(traces)} triggers")
+    print(format_report(stage_percentiles(spans)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,7 @@ from pi4.core.event_schema import Event
 from pi4.llm import understanding_ollama_client
 # Now usage of orchestrator should be safe
 from pi4.core.orchestrator import Orchestrator
+from pi4.safety.vision.camera_capture import CapturedFrame
 
 def test_caregiver_rewrite():
     print(">>> Testing `rewrite_caregiver_text` logic...")
@@ -52,7 +53,7 @@ def test_orchestrator_integration():
         mock_tof.read_latest_distance.return_value = 0.5  # Trigger distance
         import numpy as np
         # Return a white frame so it's not "blank"
-        mock_cam.get_frame.return_value = np.ones((480, 640, 3), dtype=np.uint8) * 255
+        mock_cam.capture.return_value = CapturedFrame(np.ones((480, 640, 3), dtype=np.uint8) * 255, 0.0, 0.0)
         
         # Simulate a HIGH severity event
         test_event = Event(event_id="test2", ts=123.0, type="vision.person", source="vision", severity="high", distance_m=0.5)